@@ -1,13 +1,100 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
+from app.utils.metrics import timed
+
 ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow, so it runs on a dedicated executor instead of
+# the request thread pool. "process" sidesteps the GIL, "thread" keeps it in
+# this process, and "inline" hashes on the calling thread without any limit.
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "process")
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+# Hash jobs queued or running at once; beyond that requests get a 503
+PASSWORD_HASH_MAX_PENDING = int(
+    os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 4))
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+
+
+def _hash(plain_password: str) -> str:
+    return ctx.hash(plain_password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return ctx.verify(plain_password, hashed_password)
+
+
+def _get_executor():
+    """Create the hashing executor on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if PASSWORD_HASH_EXECUTOR == "process":
+                _executor = ProcessPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                _executor = ThreadPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash",
+                )
+        return _executor
+
+
+def _submit(fn, *args) -> Future:
+    """Queue a hashing job or raise 503 when too many are pending."""
+    if PASSWORD_HASH_EXECUTOR == "inline":
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+    if not _pending.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many password operations in progress, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = _get_executor().submit(fn, *args)
+    except BaseException:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    return future
+
 
 def get_password_hash(plain_password: str) -> str:
     """Hash plain text password with bcrypt."""
-    return ctx.hash(plain_password)
+    with timed("bcrypt"):
+        return _submit(_hash, plain_password).result()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Check if plain password matches the hash."""
-    return ctx.verify(plain_password, hashed_password)
+    with timed("bcrypt"):
+        return _submit(_verify, plain_password, hashed_password).result()
+
+
+async def get_password_hash_async(plain_password: str) -> str:
+    """Hash plain text password without blocking the event loop."""
+    with timed("bcrypt"):
+        return await asyncio.wrap_future(_submit(_hash, plain_password))
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Check a password against its hash without blocking the event loop."""
+    with timed("bcrypt"):
+        future = _submit(_verify, plain_password, hashed_password)
+        return await asyncio.wrap_future(future)
@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta, timezone
+import hashlib
+import hmac
 from typing import Optional
 
 from fastapi import HTTPException, Depends
@@ -7,10 +9,14 @@ from jose import jwt, JWTError, ExpiredSignatureError
 from dotenv import load_dotenv
 import os
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.auth.user_cache import cache_user, get_cached_user, user_generation
 from app.crud.user_crud import get_user_by_id
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
+from app.utils.cache import LRUCache
+from app.utils.metrics import timed
 
 load_dotenv()
 
@@ -18,6 +24,10 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
+# Claims of tokens that already passed signature verification, evicted at
+# their "exp" time
+token_cache = LRUCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "4096")))
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Generate JWT access token with expiration."""
@@ -32,49 +42,83 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def _token_cache_key(token: str) -> bytes:
+    """Digest of the token bound to the current signing key.
+
+    Keying on the secret means entries verified under a rotated key can
+    never be served again.
+    """
+    key = f"{ALGORITHM}:{SECRET_KEY}".encode()
+    return hmac.new(key, token.encode(), hashlib.sha256).digest()
+
+
 def decode_access_token(token: str) -> dict:
     """Decode and validate JWT access token."""
-    try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    except ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token is expired")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Token is invalid")
+    cache_key = _token_cache_key(token)
+    claims = token_cache.get(cache_key)
+    if claims is None:
+        try:
+            with timed("jwt"):
+                claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except ExpiredSignatureError:
+            raise HTTPException(status_code=401, detail="Token is expired")
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Token is invalid")
+        expires_at = claims.get("exp")
+        if isinstance(expires_at, (int, float)):
+            token_cache.set(cache_key, claims, expires_at=expires_at)
+    return dict(claims)
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 
+def _credentials_error(detail: str) -> HTTPException:
+    """Build the 401 returned for any authentication failure."""
+    return HTTPException(
+        status_code=401,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _user_id_from_token(token: str) -> int:
+    """Extract the user ID claim from a valid access token."""
+    user_id = decode_access_token(token).get("sub")
+    if user_id is None:
+        raise _credentials_error("Invalid token")
+    try:
+        return int(user_id)
+    except (TypeError, ValueError):
+        raise _credentials_error("Invalid token")
+
+
+def _load_user(db: Session, user_id: int):
+    """Fetch the user for a token, from the user cache when possible."""
+    user = get_cached_user(db, user_id)
+    if user is None:
+        generation = user_generation(user_id)
+        user = get_user_by_id(db, user_id)
+        if user is not None:
+            cache_user(user, generation)
+    return user
+
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
 ):
     """Retrieve current authenticated user from token."""
-    try:
-        payload = decode_access_token(token)
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid token",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        user = get_user_by_id(db, user_id)
-        if user is None:
-            raise HTTPException(
-                status_code=401,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return user
-    except ExpiredSignatureError:
-        raise HTTPException(
-            status_code=401,
-            detail="Token is expired",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    except JWTError:
-        raise HTTPException(
-            status_code=401,
-            detail="Token is invalid",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user = _load_user(db, _user_id_from_token(token))
+    if user is None:
+        raise _credentials_error("User not found")
+    return user
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+):
+    """Retrieve current authenticated user from token on the async stack."""
+    user = await db.run_sync(_load_user, _user_id_from_token(token))
+    if user is None:
+        raise _credentials_error("User not found")
+    return user
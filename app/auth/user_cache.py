@@ -0,0 +1,69 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models.models import User
+from app.utils.cache import LRUCache
+
+# Users authenticated recently, keyed by id. Entries are detached snapshots;
+# other workers may serve a changed user until the TTL runs out.
+user_cache = LRUCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "60")),
+)
+
+# Generation of each recently changed user, taken from one counter. Only the
+# user_cache.maxsize most recent are kept; any other user reads the counter's
+# value at the last eviction, which is newer than every evicted generation.
+_generations = OrderedDict()
+_last_generation = 0
+_evicted_generation = 0
+_generation_lock = threading.Lock()
+
+
+def user_generation(user_id: int) -> int:
+    """Generation of a user's record; read it before loading the user."""
+    with _generation_lock:
+        return _generations.get(user_id, _evicted_generation)
+
+
+def cache_user(user: User, generation: int):
+    """Store a detached snapshot of a user loaded at the given generation.
+
+    Nothing is stored if the user was invalidated since, so a read that
+    raced an update cannot put the old record back.
+    """
+    snapshot = User(
+        id=user.id,
+        email=user.email,
+        hashed_password=user.hashed_password,
+        created_at=user.created_at,
+    )
+    make_transient_to_detached(snapshot)
+    with _generation_lock:
+        if _generations.get(user.id, _evicted_generation) == generation:
+            user_cache.set(user.id, snapshot)
+
+
+def get_cached_user(db: Session, user_id: int) -> Optional[User]:
+    """Attach the cached user to the session without a SELECT, if cached."""
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        return None
+    return db.merge(snapshot, load=False)
+
+
+def invalidate_user(user_id: int):
+    """Forget a cached user after their record changes."""
+    global _last_generation, _evicted_generation
+    with _generation_lock:
+        _last_generation += 1
+        _generations[user_id] = _last_generation
+        _generations.move_to_end(user_id)
+        while len(_generations) > user_cache.maxsize:
+            _generations.popitem(last=False)
+            _evicted_generation = _last_generation
+        user_cache.invalidate(user_id)
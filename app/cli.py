@@ -0,0 +1,126 @@
+"""Maintenance commands, run as ``python -m app.cli <command>``."""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from app.crud.task_archive import archive_done_tasks, run_archive_worker
+from app.crud.task_import import detect_format, import_tasks
+from app.crud.task_reminders import load_sink, run_reminder_worker, scan_due_tasks
+from app.crud.task_stats import rebuild_task_stats
+from app.crud.task_sync import TASK_SYNC_RETENTION_DAYS, prune_task_deletions
+from app.db.database import SessionLocal, engine
+from app.models.models import User
+
+
+def import_tasks_command(args) -> int:
+    """Load tasks for a user from an NDJSON or CSV file."""
+    with SessionLocal() as db:
+        if db.get(User, args.user_id) is None:
+            print(f"User {args.user_id} does not exist", file=sys.stderr)
+            return 1
+    fmt = args.format or detect_format(args.path)
+    with open(args.path, encoding="utf-8-sig", newline="") as stream:
+        report = import_tasks(engine, args.user_id, stream, fmt)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def rebuild_stats_command(args) -> int:
+    """Recompute the task stats tables from tasks to repair drift."""
+    with SessionLocal() as db:
+        rebuild_task_stats(db, owner_id=args.user_id)
+    scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+    print(f"Rebuilt task stats for {scope}")
+    return 0
+
+
+def scan_reminders_command(args) -> int:
+    """Send reminders for open tasks that are overdue or due soon."""
+    logging.basicConfig(level=logging.INFO)
+    sink = load_sink(args.sink) if args.sink else load_sink()
+    if args.once:
+        sent = scan_due_tasks(engine, sink)
+        print(f"Sent {sent} task reminders")
+        return 0
+    try:
+        asyncio.run(run_reminder_worker(engine, sink))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def archive_tasks_command(args) -> int:
+    """Move tasks completed long ago into the archive table."""
+    logging.basicConfig(level=logging.INFO)
+    if args.once:
+        archived = archive_done_tasks(engine)
+        print(f"Archived {archived} completed tasks")
+        return 0
+    try:
+        asyncio.run(run_archive_worker(engine))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def prune_deletions_command(args) -> int:
+    """Drop task tombstones older than the sync token retention."""
+    pruned = prune_task_deletions(engine, args.days)
+    print(f"Pruned {pruned} task deletions")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import-tasks", help=import_tasks_command.__doc__)
+    importer.add_argument("path", help="NDJSON or CSV file, one task per row")
+    importer.add_argument("--user-id", type=int, required=True)
+    importer.add_argument(
+        "--format", choices=["ndjson", "csv"], help="defaults to the file extension"
+    )
+    importer.set_defaults(handler=import_tasks_command)
+
+    rebuild = commands.add_parser("rebuild-stats", help=rebuild_stats_command.__doc__)
+    rebuild.add_argument("--user-id", type=int, help="defaults to every user")
+    rebuild.set_defaults(handler=rebuild_stats_command)
+
+    reminders = commands.add_parser(
+        "scan-reminders", help=scan_reminders_command.__doc__
+    )
+    reminders.add_argument(
+        "--once", action="store_true", help="scan once instead of running forever"
+    )
+    reminders.add_argument(
+        "--sink", help='"module:callable" receiving reminders, see TASK_REMINDER_SINK'
+    )
+    reminders.set_defaults(handler=scan_reminders_command)
+
+    archiver = commands.add_parser("archive-tasks", help=archive_tasks_command.__doc__)
+    archiver.add_argument(
+        "--once", action="store_true", help="archive once instead of running forever"
+    )
+    archiver.set_defaults(handler=archive_tasks_command)
+
+    prune = commands.add_parser("prune-deletions", help=prune_deletions_command.__doc__)
+    prune.add_argument(
+        "--days",
+        type=int,
+        default=TASK_SYNC_RETENTION_DAYS,
+        help="keep this many days, see TASK_SYNC_RETENTION_DAYS",
+    )
+    prune.set_defaults(handler=prune_deletions_command)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
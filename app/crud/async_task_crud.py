@@ -0,0 +1,134 @@
+"""Async counterparts of app.crud.task_crud, task_search, task_bulk, task_stats
+and task_sync.
+
+Each function runs the sync implementation through AsyncSession.run_sync,
+which drives the ORM on the asyncpg connection from the event loop instead
+of a worker thread, so both stacks share one set of queries.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import task_bulk, task_crud, task_search, task_stats, task_sync
+from app.models.enums import TaskPriority, TaskStatus
+from app.models.models import Task
+from app.schemas.task import TaskCreate, TaskUpdate
+
+
+async def get_task_by_id(db: AsyncSession, task_id: int, owner_id: int) -> Task:
+    """Fetch a task of the user, from the archive if needed."""
+    return await db.run_sync(task_crud.get_task_by_id, task_id, owner_id)
+
+
+async def get_tasks_version(
+    db: AsyncSession, user_id: int, include_archive: bool = False
+) -> Tuple[int, Optional[datetime], Optional[int]]:
+    """Summarize a user's tasks cheaply; the result changes with any write."""
+    return await db.run_sync(task_crud.get_tasks_version, user_id, include_archive)
+
+
+async def get_tasks_by_user(
+    db: AsyncSession,
+    user_id: int,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    deadline_before: Optional[datetime] = None,
+    deadline_after: Optional[datetime] = None,
+    limit: int = 100,
+    offset: int = 0,
+    order_by: str = "created_at",
+    order_dir: str = "desc",
+    show_completed: bool = True,
+    cursor: Optional[str] = None,
+    columns: Optional[Sequence] = None,
+) -> List[Task]:
+    """Return all tasks for a specific user, with optional filters and sorting."""
+    return await db.run_sync(
+        task_crud.get_tasks_by_user,
+        user_id,
+        status=status,
+        priority=priority,
+        deadline_before=deadline_before,
+        deadline_after=deadline_after,
+        limit=limit,
+        offset=offset,
+        order_by=order_by,
+        order_dir=order_dir,
+        show_completed=show_completed,
+        cursor=cursor,
+        columns=columns,
+    )
+
+
+async def create_task(db: AsyncSession, task_data: TaskCreate, owner_id: int) -> Task:
+    """Create a new task for a user."""
+    return await db.run_sync(task_crud.create_task, task_data, owner_id)
+
+
+async def update_task(
+    db: AsyncSession, task_id: int, task_data: TaskUpdate, owner_id: int
+) -> Task:
+    """Update fields of a task owned by the user in a single statement."""
+    return await db.run_sync(task_crud.update_task, task_id, task_data, owner_id)
+
+
+async def delete_task(db: AsyncSession, task_id: int, owner_id: int):
+    """Delete a task owned by the user in a single statement."""
+    await db.run_sync(task_crud.delete_task, task_id, owner_id)
+
+
+async def search_tasks(
+    db: AsyncSession,
+    owner_id: int,
+    title: str = None,
+    description: str = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    columns: Optional[Sequence] = None,
+) -> Tuple[List[Task], Optional[str]]:
+    """Search for tasks by title and/or description, best matches first."""
+    return await db.run_sync(
+        task_search.search_tasks,
+        owner_id,
+        title=title,
+        description=description,
+        limit=limit,
+        cursor=cursor,
+        columns=columns,
+    )
+
+
+async def create_tasks_bulk(
+    db: AsyncSession, items: List[Any], owner_id: int
+) -> Tuple[List[Row], List[Dict[str, Any]]]:
+    """Insert every valid item with one multi-row INSERT ... RETURNING."""
+    return await db.run_sync(task_bulk.create_tasks_bulk, items, owner_id)
+
+
+async def update_tasks_bulk(
+    db: AsyncSession, items: List[Any], owner_id: int
+) -> Tuple[List[Row], List[Dict[str, Any]]]:
+    """Update every valid item, batching items that change the same columns."""
+    return await db.run_sync(task_bulk.update_tasks_bulk, items, owner_id)
+
+
+async def delete_tasks_bulk(
+    db: AsyncSession, task_ids: List[int], owner_id: int
+) -> Tuple[List[int], List[Dict[str, Any]]]:
+    """Delete the listed tasks owned by the user with one DELETE ... RETURNING."""
+    return await db.run_sync(task_bulk.delete_tasks_bulk, task_ids, owner_id)
+
+
+async def get_task_stats(db: AsyncSession, owner_id: int) -> Dict:
+    """Read a user's task counts from the summary tables."""
+    return await db.run_sync(task_stats.get_task_stats, owner_id)
+
+
+async def get_task_changes(
+    db: AsyncSession, owner_id: int, since: Optional[str] = None
+) -> Dict[str, Any]:
+    """Tasks changed and ids deleted since a sync token, plus the next token."""
+    return await db.run_sync(task_sync.get_task_changes, owner_id, since)
@@ -0,0 +1,46 @@
+"""Async counterparts of app.crud.user_crud.
+
+Queries run through AsyncSession.run_sync on the sync implementations.
+Password hashing is awaited on the dedicated hashing executor rather than
+run on the event loop.
+"""
+
+from fastapi import HTTPException
+from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.hash import get_password_hash_async, verify_password_async
+from app.crud import user_crud
+from app.models.models import User
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User:
+    """Fetch a user by email."""
+    return await db.run_sync(user_crud.get_user_by_email, email)
+
+
+async def get_user_by_id(db: AsyncSession, id: int) -> User | None:
+    """Fetch a user by ID."""
+    return await db.run_sync(user_crud.get_user_by_id, id)
+
+
+async def create_user(db: AsyncSession, email: str, plain_password: str) -> User:
+    """Create a new user with a hashed password."""
+    await db.run_sync(user_crud.ensure_email_available, email)
+    hashed_password = await get_password_hash_async(plain_password)
+    return await db.run_sync(user_crud.insert_user, email, hashed_password)
+
+
+async def update_user_email(db: AsyncSession, user: User, new_email: EmailStr) -> User:
+    """Update an existing user's email address."""
+    return await db.run_sync(user_crud.update_user_email, user, new_email)
+
+
+async def update_user_password(
+    db: AsyncSession, user: User, old_password: str, new_password: str
+) -> User:
+    """Update an existing user's password."""
+    if not await verify_password_async(old_password, user.hashed_password):
+        raise HTTPException(status_code=400, detail="Incorrect password")
+    hashed_password = await get_password_hash_async(new_password)
+    return await db.run_sync(user_crud.set_user_password_hash, user, hashed_password)
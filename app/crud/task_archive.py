@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from sqlalchemy import (
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.orm import Session, aliased
+
+from app.models.enums import TaskStatus
+from app.models.models import Task, TaskArchive
+from app.utils.env import env_flag
+
+logger = logging.getLogger(__name__)
+
+# Run the archiver inside the app process (see app.main)
+TASK_ARCHIVE_WORKER = env_flag("TASK_ARCHIVE_WORKER", "false")
+TASK_ARCHIVE_INTERVAL_SECONDS = float(
+    os.getenv("TASK_ARCHIVE_INTERVAL_SECONDS", "3600")
+)
+# Tasks that are DONE and unchanged for this long move to tasks_archive
+TASK_ARCHIVE_AFTER_DAYS = int(os.getenv("TASK_ARCHIVE_AFTER_DAYS", "90"))
+# Tasks moved per transaction, which bounds how long their rows stay locked
+TASK_ARCHIVE_BATCH_SIZE = int(os.getenv("TASK_ARCHIVE_BATCH_SIZE", "1000"))
+
+# Name of the tasks UNION ALL tasks_archive subquery in generated SQL
+ALL_TASKS = "all_tasks"
+
+# Columns shared by tasks and tasks_archive
+TASK_COLUMNS = tuple(column.key for column in Task.__table__.columns)
+
+archive_table = TaskArchive.__table__
+tasks_table = Task.__table__
+
+
+def reads_archive(status: Optional[TaskStatus], show_completed: bool) -> bool:
+    """Whether a task list with these filters can contain archived tasks."""
+    return show_completed and status in (None, TaskStatus.DONE)
+
+
+@lru_cache(maxsize=None)
+def task_source(include_archive: bool, search_vector: bool = False):
+    """Entity that task reads select from.
+
+    With include_archive it is Task mapped over tasks UNION ALL
+    tasks_archive. Postgres pushes the filters, ordering and limit into
+    both branches, so each is still read through its own indexes.
+    search_vector adds the Postgres-only full-text column to the union.
+    """
+    if not include_archive:
+        return Task
+    branches = []
+    for table in (tasks_table, archive_table):
+        columns = [table.c[name] for name in TASK_COLUMNS]
+        if search_vector:
+            columns.append(
+                literal_column(f"{table.name}.search_vector", TSVECTOR).label(
+                    "search_vector"
+                )
+            )
+        branches.append(select(*columns))
+    return aliased(Task, union_all(*branches).subquery(ALL_TASKS))
+
+
+def get_archived_task(
+    db: Session, task_id: int, owner_id: int
+) -> Optional[TaskArchive]:
+    """Fetch an archived task of the user by its ID, if there is one."""
+    task = db.get(TaskArchive, task_id)
+    return task if task is not None and task.owner_id == owner_id else None
+
+
+def restore_archived_tasks(
+    db: Session, owner_id: int, task_ids: Iterable[int]
+) -> List[int]:
+    """Move a user's archived tasks back into tasks in the caller's transaction.
+
+    Returns the ids that were restored.
+    """
+    restored = (
+        delete(archive_table)
+        .where(archive_table.c.owner_id == owner_id, archive_table.c.id.in_(task_ids))
+        .returning(*(archive_table.c[name] for name in TASK_COLUMNS))
+        .cte("restored")
+    )
+    statement = (
+        insert(tasks_table)
+        .from_select(TASK_COLUMNS, select(*restored.c))
+        .returning(tasks_table.c.id)
+    )
+    return list(db.scalars(statement))
+
+
+def delete_archived_tasks(
+    db: Session, owner_id: int, task_ids: Iterable[int]
+) -> List[Row]:
+    """Delete a user's archived tasks, returning their stats key columns."""
+    return db.execute(
+        delete(archive_table)
+        .where(archive_table.c.owner_id == owner_id, archive_table.c.id.in_(task_ids))
+        .returning(
+            archive_table.c.id,
+            archive_table.c.status,
+            archive_table.c.priority,
+            archive_table.c.deadline,
+        )
+    ).all()
+
+
+def archive_done_tasks(
+    bind: Engine,
+    now: Optional[datetime] = None,
+    after_days: int = TASK_ARCHIVE_AFTER_DAYS,
+    batch_size: int = TASK_ARCHIVE_BATCH_SIZE,
+) -> int:
+    """Move tasks that have been DONE for after_days into tasks_archive.
+
+    updated_at is the last change of a task, so a DONE task older than the
+    cutoff has been DONE at least that long. Each batch is one short
+    transaction over the oldest candidates; rows locked by a writer are
+    skipped and picked up by a later run. Task stats are unchanged, since
+    archived tasks still count.
+    """
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=after_days)
+    batch = (
+        select(tasks_table.c.id, tasks_table.c.owner_id)
+        .where(
+            tasks_table.c.status == TaskStatus.DONE,
+            tasks_table.c.updated_at < cutoff,
+        )
+        .order_by(tasks_table.c.updated_at, tasks_table.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(tasks_table)
+        .where(tuple_(tasks_table.c.id, tasks_table.c.owner_id).in_(batch))
+        .returning(*(tasks_table.c[name] for name in TASK_COLUMNS))
+        .cte("moved")
+    )
+    statement = insert(archive_table).from_select(
+        (*TASK_COLUMNS, "archived_at"), select(*moved.c, func.now())
+    )
+    archived = 0
+    while True:
+        with bind.begin() as connection:
+            count = connection.execute(statement).rowcount
+        archived += count
+        if count < batch_size:
+            return archived
+
+
+async def run_archive_worker(
+    bind: Engine, interval: float = TASK_ARCHIVE_INTERVAL_SECONDS
+):
+    """Archive completed tasks every interval seconds until cancelled."""
+    while True:
+        try:
+            archived = await asyncio.to_thread(archive_done_tasks, bind)
+            if archived:
+                logger.info("Archived %d completed tasks", archived)
+        except Exception:
+            logger.exception("Task archival failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,291 @@
+import os
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Integer, cast, column, delete, insert, select, update, values
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.crud.task_archive import (
+    delete_archived_tasks,
+    restore_archived_tasks,
+    task_source,
+)
+from app.crud.task_events import record_task_event
+from app.crud.task_list_cache import bump_task_lists
+from app.crud.task_stats import STATS_COLUMNS, record_task_changes
+from app.crud.task_sync import record_task_deletions
+from app.models.enums import TaskPriority, TaskStatus
+from app.models.models import Task
+from app.schemas.task import TaskBulkUpdate, TaskCreate
+
+# Upper bound on the items accepted by one bulk request
+TASK_BULK_MAX_ITEMS = int(os.getenv("TASK_BULK_MAX_ITEMS", "1000"))
+
+# Columns that reject NULL, with the value a new task gets instead
+_REQUIRED_DEFAULTS = {"status": TaskStatus.TODO, "priority": TaskPriority.NONE}
+
+tasks_table = Task.__table__
+
+
+def _check_bulk_size(items: list):
+    """Reject bulk requests above TASK_BULK_MAX_ITEMS."""
+    if len(items) > TASK_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {TASK_BULK_MAX_ITEMS} items are allowed per bulk request",
+        )
+
+
+def _item_error(index: int, status_code: int, detail: Any) -> Dict[str, Any]:
+    return {"index": index, "status_code": status_code, "detail": detail}
+
+
+def _validate_items(
+    items: List[Any], schema: type[BaseModel]
+) -> Tuple[List[Tuple[int, BaseModel]], List[Dict[str, Any]]]:
+    """Validate each raw item on its own so one bad item does not fail the batch."""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            errors.append(
+                _item_error(
+                    index, 422, e.errors(include_url=False, include_context=False)
+                )
+            )
+    return valid, errors
+
+
+def _missing_task_errors(
+    db: Session, missing: List[Tuple[int, int]], owner_id: int, action: str
+) -> List[Dict[str, Any]]:
+    """Tell apart tasks that do not exist from tasks owned by someone else."""
+    if not missing:
+        return []
+    source = task_source(True)
+    existing = set(
+        db.scalars(
+            select(source.id).where(source.id.in_({task_id for _, task_id in missing}))
+        )
+    )
+    errors = []
+    for index, task_id in missing:
+        if task_id in existing:
+            errors.append(_item_error(index, 403, f"Not allowed to {action} this task"))
+        else:
+            errors.append(_item_error(index, 404, "Task not found"))
+    return errors
+
+
+def _sorted_errors(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(errors, key=lambda error: error["index"])
+
+
+def create_tasks_bulk(
+    db: Session, items: List[Any], owner_id: int
+) -> Tuple[List[Row], List[Dict[str, Any]]]:
+    """Insert every valid item with one multi-row INSERT ... RETURNING."""
+    _check_bulk_size(items)
+    valid, errors = _validate_items(items, TaskCreate)
+    created = []
+    if valid:
+        rows = []
+        for _, task in valid:
+            row = task.model_dump()
+            for key, default in _REQUIRED_DEFAULTS.items():
+                if row[key] is None:
+                    row[key] = default
+            rows.append({**row, "owner_id": owner_id})
+        created = db.execute(
+            insert(tasks_table).returning(*tasks_table.c, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        record_task_changes(
+            db, owner_id, added=[(r.status, r.priority, r.deadline) for r in created]
+        )
+        for row in created:
+            record_task_event(db, owner_id, "created", row)
+        db.commit()
+        bump_task_lists(owner_id)
+    return created, _sorted_errors(errors)
+
+
+def _update_group(
+    db: Session, owner_id: int, fields: Tuple[str, ...], group: List[tuple]
+) -> List[Row]:
+    """Apply updates that touch the same columns with one UPDATE ... FROM VALUES."""
+    task_ids = [task_id for _, task_id, _ in group]
+    owned = (tasks_table.c.id.in_(task_ids), tasks_table.c.owner_id == owner_id)
+    if not fields:
+        return db.execute(select(*tasks_table.c).where(*owned)).all()
+
+    changes = values(
+        column("id", Integer),
+        *(column(field, tasks_table.c[field].type) for field in fields),
+        name="changes",
+    ).data([(task_id, *(data[f] for f in fields)) for _, task_id, data in group])
+    # Locked old values, to move the tasks between stats counters
+    old = (
+        select(
+            tasks_table.c.id,
+            tasks_table.c.status,
+            tasks_table.c.priority,
+            tasks_table.c.deadline,
+        )
+        .where(*owned)
+        .with_for_update()
+        .subquery("old")
+    )
+    statement = (
+        update(tasks_table)
+        .where(
+            tasks_table.c.id == changes.c.id,
+            tasks_table.c.id == old.c.id,
+            tasks_table.c.owner_id == owner_id,
+        )
+        .values(
+            {
+                field: cast(changes.c[field], tasks_table.c[field].type)
+                for field in fields
+            }
+        )
+        .returning(
+            *tasks_table.c,
+            old.c.status.label("old_status"),
+            old.c.priority.label("old_priority"),
+            old.c.deadline.label("old_deadline"),
+        )
+    )
+    rows = db.execute(statement).all()
+    if STATS_COLUMNS.intersection(fields):
+        record_task_changes(
+            db,
+            owner_id,
+            removed=[(r.old_status, r.old_priority, r.old_deadline) for r in rows],
+            added=[(r.status, r.priority, r.deadline) for r in rows],
+        )
+    return rows
+
+
+def update_tasks_bulk(
+    db: Session, items: List[Any], owner_id: int
+) -> Tuple[List[Row], List[Dict[str, Any]]]:
+    """Update every valid item, batching items that change the same columns.
+
+    Archived tasks are moved back into tasks and updated there.
+    """
+    _check_bulk_size(items)
+    valid, errors = _validate_items(items, TaskBulkUpdate)
+
+    seen = set()
+    groups = defaultdict(list)
+    for index, item in valid:
+        if item.id in seen:
+            errors.append(
+                _item_error(index, 409, "Task appears more than once in this request")
+            )
+            continue
+        seen.add(item.id)
+        data = item.model_dump(exclude_unset=True, exclude={"id"})
+        nulls = [
+            key
+            for key in ("title", *_REQUIRED_DEFAULTS)
+            if key in data and data[key] is None
+        ]
+        if nulls:
+            errors.append(
+                _item_error(index, 422, f"Fields cannot be null: {', '.join(nulls)}")
+            )
+            continue
+        groups[tuple(sorted(data))].append((index, item.id, data))
+
+    updated = {}
+    for fields, group in groups.items():
+        for row in _update_group(db, owner_id, fields, group):
+            updated[row.id] = row
+
+    pending = [entry for group in groups.values() for entry in group]
+    missing = [
+        (index, task_id) for index, task_id, _ in pending if task_id not in updated
+    ]
+    if missing:
+        restored = set(
+            restore_archived_tasks(db, owner_id, [task_id for _, task_id in missing])
+        )
+        for fields, group in groups.items():
+            retried = [entry for entry in group if entry[1] in restored]
+            if retried:
+                for row in _update_group(db, owner_id, fields, retried):
+                    updated[row.id] = row
+        missing = [entry for entry in missing if entry[1] not in updated]
+    errors.extend(_missing_task_errors(db, missing, owner_id, "update"))
+    for row in updated.values():
+        record_task_event(db, owner_id, "updated", row)
+    if pending:
+        db.commit()
+        bump_task_lists(owner_id)
+
+    pending.sort(key=lambda entry: entry[0])
+    rows = [updated[task_id] for _, task_id, _ in pending if task_id in updated]
+    return rows, _sorted_errors(errors)
+
+
+def delete_tasks_bulk(
+    db: Session, task_ids: List[int], owner_id: int
+) -> Tuple[List[int], List[Dict[str, Any]]]:
+    """Delete the listed tasks owned by the user with one DELETE ... RETURNING.
+
+    Tasks not found in tasks are looked for in the archive.
+    """
+    _check_bulk_size(task_ids)
+    errors = []
+    requested = []
+    seen = set()
+    for index, task_id in enumerate(task_ids):
+        if task_id in seen:
+            errors.append(
+                _item_error(index, 409, "Task appears more than once in this request")
+            )
+            continue
+        seen.add(task_id)
+        requested.append((index, task_id))
+
+    deleted = set()
+    if requested:
+        rows = db.execute(
+            delete(tasks_table)
+            .where(
+                tasks_table.c.id.in_([task_id for _, task_id in requested]),
+                tasks_table.c.owner_id == owner_id,
+            )
+            .returning(
+                tasks_table.c.id,
+                tasks_table.c.status,
+                tasks_table.c.priority,
+                tasks_table.c.deadline,
+            )
+        ).all()
+        deleted = {row.id for row in rows}
+        unmatched = [task_id for _, task_id in requested if task_id not in deleted]
+        if unmatched:
+            rows += delete_archived_tasks(db, owner_id, unmatched)
+            deleted = {row.id for row in rows}
+        record_task_changes(
+            db, owner_id, removed=[(r.status, r.priority, r.deadline) for r in rows]
+        )
+        missing = [
+            (index, task_id) for index, task_id in requested if task_id not in deleted
+        ]
+        errors.extend(_missing_task_errors(db, missing, owner_id, "delete"))
+        record_task_deletions(db, owner_id, [row.id for row in rows])
+        for row in rows:
+            record_task_event(db, owner_id, "deleted", id=row.id)
+        db.commit()
+        bump_task_lists(owner_id)
+
+    deleted_ids = [task_id for _, task_id in requested if task_id in deleted]
+    return deleted_ids, _sorted_errors(errors)
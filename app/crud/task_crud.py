@@ -1,22 +1,195 @@
 from datetime import datetime
 
 from fastapi import HTTPException
+from sqlalchemy import and_, delete, func, or_, select, tuple_, update
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 from app.models.enums import TaskPriority, TaskStatus
+from app.crud.task_archive import (
+    delete_archived_tasks,
+    get_archived_task,
+    reads_archive,
+    restore_archived_tasks,
+    task_source,
+)
+from app.crud.task_events import record_task_event
+from app.crud.task_list_cache import bump_task_lists
+from app.crud.task_stats import STATS_COLUMNS, record_task_changes
+from app.crud.task_sync import record_task_deletions
 from app.models.models import Task
 from app.schemas.task import TaskCreate, TaskUpdate
+from app.utils.cursor import decode_cursor, encode_cursor
 
+TASK_ORDER_COLUMNS = {"created_at", "deadline"}
 
-def get_task_by_id(db: Session, task_id: int) -> Task:
-    """Fetch a task by its ID or raise 404."""
-    task = db.query(Task).filter(Task.id == task_id).first()
+# TaskResponse fields, in its serialization order
+TASK_RESPONSE_COLUMNS = (
+    Task.title,
+    Task.description,
+    Task.deadline,
+    Task.status,
+    Task.priority,
+    Task.id,
+    Task.owner_id,
+    Task.created_at,
+    Task.updated_at,
+)
+TASK_FIELDS = tuple(column.key for column in TASK_RESPONSE_COLUMNS)
+
+
+def get_task_by_id(db: Session, task_id: int, owner_id: int) -> Task:
+    """Fetch a task of the user, from the archive if needed.
+
+    Raises 404 if it does not exist and 403 if someone else owns it.
+    """
+    task = db.query(Task).filter(Task.id == task_id, Task.owner_id == owner_id).first()
     if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
+        task = get_archived_task(db, task_id, owner_id)
+    if task is None:
+        _raise_missing_task(db, task_id, "access")
     return task
 
 
+def _normalize_order(order_by: str, order_dir: str) -> Tuple[str, str]:
+    """Fall back to the default ordering for unknown sort options."""
+    if order_by not in TASK_ORDER_COLUMNS:
+        order_by = "created_at"
+    return order_by, "desc" if order_dir == "desc" else "asc"
+
+
+def parse_task_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Validate a comma-separated fields= value; None selects every field."""
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(TASK_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown task fields: {', '.join(sorted(unknown))}",
+        )
+    if not requested:
+        raise HTTPException(status_code=400, detail="No task fields requested")
+    return tuple(name for name in TASK_FIELDS if name in requested)
+
+
+def task_field_columns(fields: Sequence[str], order_by: Optional[str] = None) -> tuple:
+    """Columns to select for a sparse fieldset.
+
+    The id and the sort column are loaded too, since cursors are built
+    from them; callers drop them from the response.
+    """
+    names = {*fields, "id"}
+    if order_by is not None:
+        names.add(_normalize_order(order_by, "asc")[0])
+    return tuple(column for column in TASK_RESPONSE_COLUMNS if column.key in names)
+
+
+def encode_task_cursor(task: Task, order_by: str, order_dir: str) -> str:
+    """Build the cursor pointing just past the given task."""
+    order_by, order_dir = _normalize_order(order_by, order_dir)
+    value = getattr(task, order_by)
+    return encode_cursor(
+        {
+            "o": order_by,
+            "d": order_dir,
+            "v": value.isoformat() if value is not None else None,
+            "id": task.id,
+        }
+    )
+
+
+def _decode_task_cursor(
+    cursor: str, order_by: str, order_dir: str
+) -> Tuple[Optional[datetime], int]:
+    """Return the (order value, id) position stored in a task cursor."""
+    payload = decode_cursor(cursor)
+    if payload.get("o") != order_by or payload.get("d") != order_dir:
+        raise HTTPException(
+            status_code=400, detail="Cursor does not match the requested ordering"
+        )
+    try:
+        value = payload["v"]
+        if value is not None:
+            value = datetime.fromisoformat(value)
+        last_id = int(payload["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, last_id
+
+
+def _keyset_filter(order_column, order_dir: str, value, last_id: int, source=Task):
+    """Rows strictly after (value, last_id) in (order_column, id) order.
+
+    Postgres sorts NULLs last ascending and first descending, so tasks
+    without a value form their own block at one end of the ordering.
+    """
+    if value is None:
+        if order_dir == "desc":
+            return or_(
+                and_(order_column.is_(None), source.id < last_id),
+                order_column.is_not(None),
+            )
+        return and_(order_column.is_(None), source.id > last_id)
+    if order_dir == "desc":
+        return tuple_(order_column, source.id) < (value, last_id)
+    return or_(
+        tuple_(order_column, source.id) > (value, last_id), order_column.is_(None)
+    )
+
+
+def get_tasks_version(
+    db: Session, user_id: int, include_archive: bool = False
+) -> Tuple[int, Optional[datetime], Optional[int]]:
+    """Summarize a user's tasks cheaply; the result changes with any write.
+
+    Creates raise max(id), updates raise max(updated_at), deletes lower the count.
+    include_archive covers archived tasks too, for lists that show them.
+    """
+    source = task_source(include_archive)
+    return tuple(
+        db.query(
+            func.count(source.id), func.max(source.updated_at), func.max(source.id)
+        )
+        .filter(source.owner_id == user_id)
+        .one()
+    )
+
+
+def task_filters(
+    user_id: int,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    deadline_before: Optional[datetime] = None,
+    deadline_after: Optional[datetime] = None,
+    show_completed: bool = True,
+    source=Task,
+) -> list:
+    """Build the WHERE criteria shared by task listing and export."""
+    criteria = [source.owner_id == user_id]
+    if not show_completed:
+        criteria.append(source.status != TaskStatus.DONE)
+    if status is not None:
+        criteria.append(source.status == status)
+    if priority is not None:
+        criteria.append(source.priority == priority)
+    if deadline_before is not None:
+        criteria.append(source.deadline <= deadline_before)
+    if deadline_after is not None:
+        criteria.append(source.deadline >= deadline_after)
+    return criteria
+
+
+def task_ordering(order_by: str, order_dir: str, source=Task) -> list:
+    """Build the ORDER BY, with id as a tie-breaker so the order is total."""
+    order_by, order_dir = _normalize_order(order_by, order_dir)
+    order_column = getattr(source, order_by)
+    if order_dir == "desc":
+        return [order_column.desc(), source.id.desc()]
+    return [order_column.asc(), source.id.asc()]
+
+
 def get_tasks_by_user(
     db: Session,
     user_id: int,
@@ -29,32 +202,46 @@ def get_tasks_by_user(
     order_by: str = "created_at",
     order_dir: str = "desc",
     show_completed: bool = True,
+    cursor: Optional[str] = None,
+    columns: Optional[Sequence] = None,
 ) -> List[Task]:
-    """Return all tasks for a specific user, with optional filters and sorting."""
+    """Return all tasks for a specific user, with optional filters and sorting.
 
-    # filters
-    query = db.query(Task).filter(Task.owner_id == user_id)
-    if not show_completed:
-        query = query.filter(Task.status != TaskStatus.DONE)
-    if status is not None:
-        query = query.filter(Task.status == status)
-    if priority is not None:
-        query = query.filter(Task.priority == priority)
-    if deadline_before is not None:
-        query = query.filter(Task.deadline <= deadline_before)
-    if deadline_after is not None:
-        query = query.filter(Task.deadline >= deadline_after)
-
-    # sort
-    if order_by not in {"created_at", "deadline"}:
-        order_by = "created_at"
-    order_column = getattr(Task, order_by)
-    if order_dir == "desc":
-        query = query.order_by(order_column.desc())
+    When a cursor is given the page starts right after the position it
+    encodes and offset is ignored. Passing columns returns plain rows of
+    those columns instead of Task objects. Lists that can contain completed
+    tasks also read the archive.
+    """
+    source = task_source(reads_archive(status, show_completed))
+    if columns:
+        query = db.query(*(getattr(source, column.key) for column in columns))
     else:
-        query = query.order_by(order_column.asc())
+        query = db.query(source)
+    query = query.filter(
+        *task_filters(
+            user_id,
+            status,
+            priority,
+            deadline_before,
+            deadline_after,
+            show_completed,
+            source=source,
+        )
+    )
+    order_by, order_dir = _normalize_order(order_by, order_dir)
+    order_column = getattr(source, order_by)
+    query = query.order_by(*task_ordering(order_by, order_dir, source))
+
+    # page
+    if cursor is not None:
+        value, last_id = _decode_task_cursor(cursor, order_by, order_dir)
+        query = query.filter(
+            _keyset_filter(order_column, order_dir, value, last_id, source)
+        )
+    elif offset:
+        query = query.offset(offset)
 
-    tasks = query.offset(offset).limit(limit).all()
+    tasks = query.limit(limit).all()
     return tasks
 
 
@@ -62,38 +249,94 @@ def create_task(db: Session, task_data: TaskCreate, owner_id: int) -> Task:
     """Create a new task for a user."""
     new_task = Task(**task_data.model_dump(exclude_unset=True), owner_id=owner_id)
     db.add(new_task)
+    db.flush()
+    record_task_changes(
+        db, owner_id, added=[(new_task.status, new_task.priority, new_task.deadline)]
+    )
+    record_task_event(db, owner_id, "created", new_task)
     db.commit()
+    bump_task_lists(owner_id)
     db.refresh(new_task)
     return new_task
 
 
-def update_task(db: Session, task_id: int, task_data: TaskUpdate) -> Task:
-    """Update fields of an existing task."""
-    old_task = get_task_by_id(db, task_id)
-    update_data = task_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(old_task, key, value)
-    db.commit()
-    db.refresh(old_task)
-    return old_task
+def _raise_missing_task(db: Session, task_id: int, action: str):
+    """Explain a lookup that matched no row: 404 if absent, 403 if not owned.
 
+    Only this error path looks a task up without its owner, which probes
+    every partition of tasks.
+    """
+    source = task_source(True)
+    if db.query(source.id).filter(source.id == task_id).first() is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    raise HTTPException(status_code=403, detail=f"Not allowed to {action} this task")
 
-def delete_task(db: Session, task_id: int):
-    """Delete a task by its ID."""
-    task = get_task_by_id(db, task_id)
-    db.delete(task)
-    db.commit()
 
+def update_task(
+    db: Session, task_id: int, task_data: TaskUpdate, owner_id: int
+) -> Task:
+    """Update fields of a task owned by the user in a single statement.
 
-def search_tasks(
-    db: Session, owner_id: int, title: str = None, description: str = None
-) -> List[Task]:
-    """Search for tasks by title and/or description."""
-    query = db.query(Task).filter(Task.owner_id == owner_id)
+    When the change moves the task between stats counters, the old values
+    are read from a locked subquery of the same UPDATE. An archived task is
+    moved back into tasks first.
+    """
+    update_data = task_data.model_dump(exclude_unset=True)
+    owned = (Task.id == task_id, Task.owner_id == owner_id)
+    tracked = bool(update_data.keys() & STATS_COLUMNS)
+    if tracked:
+        old = (
+            select(Task.id, Task.status, Task.priority, Task.deadline)
+            .where(*owned)
+            .with_for_update()
+            .subquery("old")
+        )
+        statement = (
+            update(Task)
+            .where(Task.id == old.c.id, Task.owner_id == owner_id)
+            .values(**update_data)
+            .returning(Task, old.c.status, old.c.priority, old.c.deadline)
+        )
+    elif update_data:
+        statement = update(Task).where(*owned).values(**update_data).returning(Task)
+    else:
+        statement = select(Task).where(*owned)
+    row = db.execute(statement).one_or_none()
+    if row is None and restore_archived_tasks(db, owner_id, [task_id]):
+        row = db.execute(statement).one_or_none()
+    if row is None:
+        _raise_missing_task(db, task_id, "update")
+    task = row[0]
+    if tracked:
+        record_task_changes(
+            db,
+            owner_id,
+            removed=[tuple(row[1:])],
+            added=[(task.status, task.priority, task.deadline)],
+        )
+    if update_data:
+        record_task_event(db, owner_id, "updated", task)
+    # Detach so the commit does not expire the values RETURNING just loaded
+    db.expunge(task)
+    db.commit()
+    bump_task_lists(owner_id)
+    return task
 
-    if title:
-        query = query.filter(Task.title.ilike(f"%{title}%"))
-    if description:
-        query = query.filter(Task.description.ilike(f"%{description}%"))
 
-    return query.all()
+def delete_task(db: Session, task_id: int, owner_id: int):
+    """Delete a task owned by the user in a single statement."""
+    deleted = db.execute(
+        delete(Task)
+        .where(Task.id == task_id, Task.owner_id == owner_id)
+        .returning(Task.status, Task.priority, Task.deadline)
+    ).one_or_none()
+    if deleted is None:
+        archived = delete_archived_tasks(db, owner_id, [task_id])
+        if not archived:
+            _raise_missing_task(db, task_id, "delete")
+        deleted = archived[0][1:]
+    record_task_changes(db, owner_id, removed=[tuple(deleted)])
+    record_task_deletions(db, owner_id, [task_id])
+    record_task_event(db, owner_id, "deleted", id=task_id)
+    db.commit()
+    bump_task_lists(owner_id)
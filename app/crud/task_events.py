@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import asyncpg
+import orjson
+from sqlalchemy import Text, bindparam, event, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.schemas.task import TaskResponse
+from app.utils.env import env_flag
+from app.utils.pubsub import OVERFLOW, EventBroker
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per /tasks/stream connection before it is told to resync
+TASK_STREAM_BUFFER = int(os.getenv("TASK_STREAM_BUFFER", "100"))
+TASK_STREAM_HEARTBEAT_SECONDS = float(os.getenv("TASK_STREAM_HEARTBEAT_SECONDS", "15"))
+# Connections are closed after this long; clients reconnect, which spreads
+# them over the current workers
+TASK_STREAM_MAX_SECONDS = float(os.getenv("TASK_STREAM_MAX_SECONDS", "3600"))
+# Fan events out through Postgres LISTEN/NOTIFY so every worker sees them
+TASK_STREAM_NOTIFY = env_flag("TASK_STREAM_NOTIFY", "false")
+TASK_EVENTS_CHANNEL = "task_events"
+
+task_events = EventBroker(TASK_STREAM_BUFFER)
+
+_PENDING = "task_events"
+_PENDING_NOTIFY = "task_event_notifications"
+
+# Sends all of a transaction's notifications in one statement, in order
+_NOTIFY_MANY = text(
+    "SELECT pg_notify(:channel, message) FROM unnest(:messages) AS message"
+).bindparams(bindparam("messages", type_=ARRAY(Text)))
+
+
+def _task_payload(task) -> Dict[str, Any]:
+    return TaskResponse.model_validate(task).model_dump(mode="json")
+
+
+def record_task_event(db: Session, owner_id: int, type: str, task=None, **payload):
+    """Queue a stream event that is published once db's transaction commits.
+
+    task (a Task or result row) is sent as TaskResponse; otherwise the
+    keyword arguments are the payload. With TASK_STREAM_NOTIFY the events
+    go through pg_notify, in one statement sent when the transaction commits.
+    """
+    if not TASK_STREAM_NOTIFY and not task_events.has_subscribers(owner_id):
+        return
+    event_data = {
+        "type": type,
+        "data": _task_payload(task) if task is not None else payload,
+    }
+    if TASK_STREAM_NOTIFY:
+        message = orjson.dumps({"owner_id": owner_id, **event_data}).decode()
+        db.info.setdefault(_PENDING_NOTIFY, []).append(message)
+    else:
+        db.info.setdefault(_PENDING, []).append((owner_id, event_data))
+
+
+def publish_task_event(bind, owner_id: int, type: str, **payload):
+    """Publish an event outside a session, after the change committed."""
+    event_data = {"type": type, "data": payload}
+    if TASK_STREAM_NOTIFY:
+        message = orjson.dumps({"owner_id": owner_id, **event_data}).decode()
+        with bind.begin() as connection:
+            connection.execute(select(func.pg_notify(TASK_EVENTS_CHANNEL, message)))
+    else:
+        task_events.publish(owner_id, event_data)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_pending_events(session: Session):
+    messages = session.info.pop(_PENDING_NOTIFY, None)
+    if messages:
+        session.execute(
+            _NOTIFY_MANY, {"channel": TASK_EVENTS_CHANNEL, "messages": messages}
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_events(session: Session):
+    for owner_id, event_data in session.info.pop(_PENDING, ()):
+        task_events.publish(owner_id, event_data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back_events(session: Session):
+    session.info.pop(_PENDING, None)
+    session.info.pop(_PENDING_NOTIFY, None)
+
+
+def _format_event(event_data: Dict[str, Any]) -> str:
+    data = orjson.dumps(event_data["data"]).decode()
+    return f"event: {event_data['type']}\ndata: {data}\n\n"
+
+
+async def stream_task_events(
+    owner_id: int,
+    heartbeat: Optional[float] = None,
+    max_seconds: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """Yield a user's task events as Server-Sent Events.
+
+    A comment line is sent when nothing happened for a heartbeat interval
+    so proxies keep the connection open. If the client falls more than
+    TASK_STREAM_BUFFER events behind, an "overflow" event is sent and the
+    stream ends; the client should reload its tasks and reconnect.
+    """
+    heartbeat = heartbeat or TASK_STREAM_HEARTBEAT_SECONDS
+    deadline = time.monotonic() + (max_seconds or TASK_STREAM_MAX_SECONDS)
+    subscription = task_events.subscribe(owner_id)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                event_data = await asyncio.wait_for(
+                    subscription.get(), min(heartbeat, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event_data is OVERFLOW:
+                yield "event: overflow\ndata: {}\n\n"
+                return
+            yield _format_event(event_data)
+    finally:
+        task_events.unsubscribe(owner_id, subscription)
+
+
+async def listen_for_task_events(database_url, retry_seconds: float = 5.0):
+    """Relay task events from Postgres NOTIFY to this process's subscribers."""
+    dsn = make_url(database_url).set(drivername="postgresql")
+    dsn = dsn.render_as_string(hide_password=False)
+
+    def on_notify(connection, pid, channel, message):
+        event_data = orjson.loads(message)
+        task_events.publish(event_data.pop("owner_id"), event_data)
+
+    while True:
+        try:
+            connection = await asyncpg.connect(dsn)
+        except (OSError, asyncpg.PostgresError):
+            logger.exception("Cannot listen for task events, retrying")
+            await asyncio.sleep(retry_seconds)
+            continue
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(TASK_EVENTS_CHANNEL, on_notify)
+            await closed.wait()
+            logger.warning("Task event listener connection lost, reconnecting")
+        finally:
+            await connection.close()
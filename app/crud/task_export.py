@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Iterator, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.crud.task_archive import reads_archive, task_source
+from app.crud.task_crud import task_filters, task_ordering
+from app.models.models import Task
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = int(os.getenv("TASK_EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+EXPORT_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.deadline,
+    Task.status,
+    Task.priority,
+    Task.owner_id,
+    Task.created_at,
+    Task.updated_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def _export_value(value):
+    """Render a column value the way the JSON API does."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    return value
+
+
+def _format_ndjson(rows: Sequence) -> bytes:
+    lines = (
+        json.dumps(
+            dict(zip(EXPORT_FIELDS, map(_export_value, row))), ensure_ascii=False
+        )
+        for row in rows
+    )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _format_csv(rows: Sequence) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue().encode()
+
+
+_FORMATTERS = {"ndjson": _format_ndjson, "csv": _format_csv}
+
+
+def export_statement(user_id: int, order_by: str, order_dir: str, **filters):
+    """Select the exported columns with the task list filters, streamed in batches."""
+    source = task_source(
+        reads_archive(filters.get("status"), filters.get("show_completed", True))
+    )
+    return (
+        select(*(getattr(source, column.key) for column in EXPORT_COLUMNS))
+        .where(*task_filters(user_id, source=source, **filters))
+        .order_by(*task_ordering(order_by, order_dir, source))
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def iter_tasks_export(
+    bind: Engine,
+    user_id: int,
+    format: str = "ndjson",
+    order_by: str = "created_at",
+    order_dir: str = "asc",
+    **filters,
+) -> Iterator[bytes]:
+    """Yield a user's tasks as NDJSON or CSV, one chunk per fetched batch.
+
+    The rows come from a server-side cursor on a session of its own, since
+    the response body is produced after the request's session is closed.
+    """
+    formatter = _FORMATTERS[format]
+    if format == "csv":
+        yield _csv_header()
+    with Session(bind=bind) as db:
+        result = db.execute(export_statement(user_id, order_by, order_dir, **filters))
+        for rows in result.partitions():
+            yield formatter(rows)
+
+
+async def stream_tasks_export(
+    bind: AsyncEngine,
+    user_id: int,
+    format: str = "ndjson",
+    order_by: str = "created_at",
+    order_dir: str = "asc",
+    **filters,
+) -> AsyncIterator[bytes]:
+    """Async counterpart of iter_tasks_export."""
+    formatter = _FORMATTERS[format]
+    if format == "csv":
+        yield _csv_header()
+    async with AsyncSession(bind=bind) as db:
+        result = await db.stream(
+            export_statement(user_id, order_by, order_dir, **filters)
+        )
+        async for rows in result.partitions():
+            yield formatter(rows)
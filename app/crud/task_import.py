@@ -0,0 +1,182 @@
+import csv
+import io
+import json
+import os
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.engine import Engine
+
+from app.crud.task_events import publish_task_event
+from app.crud.task_list_cache import bump_task_lists
+from app.models.enums import TaskPriority, TaskStatus
+from app.schemas.task import TaskCreate
+
+# Rows validated and sent per COPY round trip
+IMPORT_BATCH_SIZE = int(os.getenv("TASK_IMPORT_BATCH_SIZE", "5000"))
+# Rejected rows described in the report; the rest are only counted
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("TASK_IMPORT_MAX_REPORTED_ERRORS", "100"))
+
+IMPORT_FIELDS = ("title", "description", "deadline", "status", "priority")
+
+# ON COMMIT DROP: the staging table disappears with the transaction either way
+_CREATE_STAGING = """
+CREATE TEMP TABLE task_import_staging (
+    title text NOT NULL,
+    description text,
+    deadline timestamptz,
+    status text NOT NULL,
+    priority text NOT NULL
+) ON COMMIT DROP
+"""
+_COPY_STAGING = f"COPY task_import_staging ({', '.join(IMPORT_FIELDS)}) FROM STDIN"
+# updated_at is taken right before the commit, not when a long import
+# started, so /tasks/changes sync tokens issued meanwhile still cover the rows
+_PUBLISH_STAGING = """
+INSERT INTO tasks
+    (title, description, deadline, status, priority, owner_id, created_at, updated_at)
+SELECT title, description, deadline, status::taskstatus, priority::taskpriority,
+       %(owner_id)s, now(), clock_timestamp()
+FROM task_import_staging
+"""
+# Same counters as app.crud.task_stats.record_task_changes, from the staged rows
+_COUNT_STAGING = """
+INSERT INTO task_stats (owner_id, status, priority, count)
+SELECT %(owner_id)s, status::taskstatus, priority::taskpriority, count(*)
+FROM task_import_staging
+GROUP BY status, priority
+ORDER BY status, priority
+ON CONFLICT (owner_id, status, priority)
+DO UPDATE SET count = task_stats.count + EXCLUDED.count;
+
+INSERT INTO task_due_days (owner_id, due_date, count)
+SELECT %(owner_id)s, (deadline AT TIME ZONE 'UTC')::date, count(*)
+FROM task_import_staging
+WHERE deadline IS NOT NULL AND status <> 'DONE'
+GROUP BY 2
+ORDER BY 2
+ON CONFLICT (owner_id, due_date)
+DO UPDATE SET count = task_due_days.count + EXCLUDED.count
+"""
+
+
+_INVALID_JSON = object()
+
+
+def _read_ndjson(stream: TextIO) -> Iterator[Tuple[int, Any]]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, _INVALID_JSON
+
+
+def _read_csv(stream: TextIO) -> Iterator[Tuple[int, Any]]:
+    reader = csv.DictReader(stream)
+    for row in reader:
+        # Empty cells mean "not given", so the TaskCreate defaults apply
+        yield reader.line_num, {
+            key: value for key, value in row.items() if value not in ("", None)
+        }
+
+
+def _copy_value(value) -> str:
+    """Render a value for COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, Enum):
+        # Postgres enums store member names, see app.models.enums
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_batch(cursor, batch: List[TaskCreate]):
+    buffer = io.StringIO()
+    for task in batch:
+        row = task.model_dump()
+        row["status"] = row["status"] or TaskStatus.TODO
+        row["priority"] = row["priority"] or TaskPriority.NONE
+        buffer.write("\t".join(_copy_value(row[field]) for field in IMPORT_FIELDS))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(_COPY_STAGING, buffer)
+
+
+def import_tasks(
+    bind: Engine, owner_id: int, stream: TextIO, format: str = "ndjson"
+) -> Dict[str, Any]:
+    """Load tasks from an NDJSON or CSV stream with COPY, all or nothing.
+
+    Rows are validated against TaskCreate a batch at a time and copied into
+    a temporary staging table, which is published into tasks in the same
+    transaction. Invalid rows are skipped and reported by line number.
+    Only one batch is held in memory, whatever the size of the input.
+    """
+    rows = _read_csv(stream) if format == "csv" else _read_ndjson(stream)
+    started = time.perf_counter()
+    rejected = 0
+    errors: List[Dict[str, Any]] = []
+
+    def reject(line: int, detail: Any):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+            errors.append({"line": line, "detail": detail})
+
+    with bind.begin() as connection:
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(_CREATE_STAGING)
+            batch: List[TaskCreate] = []
+            for line, data in rows:
+                if data is _INVALID_JSON:
+                    reject(line, "Invalid JSON")
+                    continue
+                try:
+                    batch.append(TaskCreate.model_validate(data))
+                except ValidationError as e:
+                    reject(line, e.errors(include_url=False, include_context=False))
+                    continue
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    _copy_batch(cursor, batch)
+                    batch = []
+            if batch:
+                _copy_batch(cursor, batch)
+            cursor.execute(_PUBLISH_STAGING, {"owner_id": owner_id})
+            imported = cursor.rowcount
+            cursor.execute(_COUNT_STAGING, {"owner_id": owner_id})
+        finally:
+            cursor.close()
+    bump_task_lists(owner_id)
+    if imported:
+        # One event instead of one per row: clients reload their list
+        publish_task_event(bind, owner_id, "refresh", imported=imported)
+
+    seconds = time.perf_counter() - started
+    return {
+        "imported": imported,
+        "rejected": rejected,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(imported / seconds) if seconds else imported,
+    }
+
+
+def detect_format(filename: Optional[str], default: str = "ndjson") -> str:
+    """Guess the import format from a file name."""
+    if filename and filename.lower().endswith(".csv"):
+        return "csv"
+    return default
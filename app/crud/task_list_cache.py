@@ -0,0 +1,79 @@
+import os
+from typing import NamedTuple, Optional
+
+import orjson
+from fastapi import Response
+
+from app.utils.etag import etag_matches, not_modified
+from app.utils.response_cache import MemoryCacheBackend, VersionedCache
+
+# Serialized GET /tasks/ pages, keyed by user, list version and query;
+# 0 disables the cache. Replace task_list_cache.backend to share it.
+TASK_LIST_CACHE_BYTES = int(os.getenv("TASK_LIST_CACHE_BYTES", str(16 * 2**20)))
+# Bounds how long other worker processes may serve a page after a write
+TASK_LIST_CACHE_TTL = float(os.getenv("TASK_LIST_CACHE_TTL_SECONDS", "30"))
+# Users whose list version is remembered; the least recently written go first
+TASK_LIST_CACHE_VERSIONS = int(os.getenv("TASK_LIST_CACHE_VERSIONS", "100000"))
+
+task_list_cache = VersionedCache(
+    MemoryCacheBackend(
+        TASK_LIST_CACHE_BYTES,
+        ttl=TASK_LIST_CACHE_TTL,
+        max_versions=TASK_LIST_CACHE_VERSIONS,
+    ),
+    prefix="tasks",
+)
+
+# Response headers stored with a cached page
+_CACHED_HEADERS = ("ETag", "X-Next-Cursor")
+
+
+class TaskListSlot(NamedTuple):
+    owner_id: int
+    version: int
+    key: str
+
+
+def bump_task_lists(owner_id: int):
+    """Invalidate every cached task list of a user, once their write commits."""
+    task_list_cache.bump(owner_id)
+
+
+def task_list_slot(owner_id: int, **params) -> Optional[TaskListSlot]:
+    """Cache slot for a user's list query, or None when caching is off.
+
+    The version is read before the query runs, so a page loaded while a
+    write commits is stored under the version that write retires.
+    """
+    if TASK_LIST_CACHE_BYTES <= 0:
+        return None
+    key = orjson.dumps(params, option=orjson.OPT_SORT_KEYS).decode()
+    return TaskListSlot(owner_id, task_list_cache.version(owner_id), key)
+
+
+def cached_task_list(
+    slot: Optional[TaskListSlot], if_none_match: Optional[str]
+) -> Optional[Response]:
+    """Serve a cached page, or a 304 when its ETag matches."""
+    if slot is None:
+        return None
+    entry = task_list_cache.get(*slot)
+    if entry is None:
+        return None
+    meta, body = entry.split(b"\n", 1)
+    headers = orjson.loads(meta)
+    if etag_matches(if_none_match, headers.get("ETag")):
+        return not_modified(headers["ETag"])
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def store_task_list(slot: Optional[TaskListSlot], response: Response):
+    """Keep a rendered page for the next identical request."""
+    if slot is None:
+        return
+    headers = {
+        name: response.headers[name]
+        for name in _CACHED_HEADERS
+        if name in response.headers
+    }
+    task_list_cache.set(*slot, orjson.dumps(headers) + b"\n" + response.body)
@@ -0,0 +1,140 @@
+import asyncio
+import importlib
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.utils.env import env_flag
+
+logger = logging.getLogger(__name__)
+
+# Run the reminder worker inside the app process (see app.main)
+REMINDER_WORKER_ENABLED = env_flag("TASK_REMINDER_WORKER", "false")
+REMINDER_INTERVAL_SECONDS = float(os.getenv("TASK_REMINDER_INTERVAL_SECONDS", "60"))
+# Open tasks due within this window get a "due_soon" reminder
+REMINDER_LEAD_MINUTES = int(os.getenv("TASK_REMINDER_LEAD_MINUTES", "60"))
+# Tasks that went overdue longer ago than this are not reminded about
+REMINDER_OVERDUE_LOOKBACK_HOURS = int(
+    os.getenv("TASK_REMINDER_OVERDUE_LOOKBACK_HOURS", "24")
+)
+# Tasks claimed per transaction
+REMINDER_BATCH_SIZE = int(os.getenv("TASK_REMINDER_BATCH_SIZE", "500"))
+# "module:callable" that receives each claimed batch
+REMINDER_SINK = os.getenv("TASK_REMINDER_SINK", "app.crud.task_reminders:log_reminders")
+
+ReminderSink = Callable[[List[Dict[str, Any]]], None]
+
+# One keyset batch over ix_tasks_deadline_not_done. Rows another scanner has
+# locked are skipped, and ON CONFLICT drops tasks already reminded about.
+_CLAIM_BATCH = text("""
+WITH due AS (
+    SELECT id, owner_id, title, deadline
+    FROM tasks
+    WHERE status <> 'DONE'
+      AND deadline >= :start AND deadline < :end
+      AND (deadline, id) > (:after_deadline, :after_id)
+    ORDER BY deadline, id
+    LIMIT :batch_size
+    FOR NO KEY UPDATE SKIP LOCKED
+), claimed AS (
+    INSERT INTO task_reminders (task_id, kind, deadline, owner_id, created_at)
+    SELECT id, :kind, deadline, owner_id, now() FROM due
+    ON CONFLICT DO NOTHING
+    RETURNING task_id
+)
+SELECT due.id, due.owner_id, due.title, due.deadline,
+       claimed.task_id IS NOT NULL AS claimed
+FROM due LEFT JOIN claimed ON claimed.task_id = due.id
+ORDER BY due.deadline, due.id
+""")
+
+
+def log_reminders(reminders: List[Dict[str, Any]]):
+    """Default sink: write each reminder to the application log."""
+    for reminder in reminders:
+        logger.info(
+            "Task %(task_id)s of user %(owner_id)s is %(kind)s (deadline %(deadline)s)",
+            reminder,
+        )
+
+
+def load_sink(path: str = REMINDER_SINK) -> ReminderSink:
+    """Import the sink named by a "module:callable" path."""
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def scan_due_tasks(
+    bind: Engine,
+    sink: ReminderSink,
+    now: Optional[datetime] = None,
+    batch_size: int = REMINDER_BATCH_SIZE,
+) -> int:
+    """Claim and send reminders for open tasks that are overdue or due soon.
+
+    Each window is walked in (deadline, id) keyset batches, one transaction
+    per batch. Task rows are locked with SKIP LOCKED and claims are unique,
+    so several replicas can scan at once and each reminder is sent once.
+    The sink runs before the batch commits: if it raises, the claims roll
+    back and are sent by a later scan.
+    """
+    now = now or datetime.now(timezone.utc)
+    windows = (
+        ("overdue", now - timedelta(hours=REMINDER_OVERDUE_LOOKBACK_HOURS), now),
+        ("due_soon", now, now + timedelta(minutes=REMINDER_LEAD_MINUTES)),
+    )
+    sent = 0
+    for kind, start, end in windows:
+        after_deadline, after_id = start, 0
+        while True:
+            with bind.begin() as connection:
+                rows = connection.execute(
+                    _CLAIM_BATCH,
+                    {
+                        "kind": kind,
+                        "start": start,
+                        "end": end,
+                        "after_deadline": after_deadline,
+                        "after_id": after_id,
+                        "batch_size": batch_size,
+                    },
+                ).all()
+                reminders = [
+                    {
+                        "task_id": row.id,
+                        "owner_id": row.owner_id,
+                        "title": row.title,
+                        "deadline": row.deadline,
+                        "kind": kind,
+                    }
+                    for row in rows
+                    if row.claimed
+                ]
+                if reminders:
+                    sink(reminders)
+            sent += len(reminders)
+            if len(rows) < batch_size:
+                break
+            after_deadline, after_id = rows[-1].deadline, rows[-1].id
+    return sent
+
+
+async def run_reminder_worker(
+    bind: Engine,
+    sink: Optional[ReminderSink] = None,
+    interval: float = REMINDER_INTERVAL_SECONDS,
+):
+    """Scan for due tasks every interval seconds until cancelled."""
+    sink = sink or load_sink()
+    while True:
+        try:
+            sent = await asyncio.to_thread(scan_due_tasks, bind, sink)
+            if sent:
+                logger.info("Sent %d task reminders", sent)
+        except Exception:
+            logger.exception("Task reminder scan failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,123 @@
+import re
+from typing import List, Optional, Sequence, Tuple
+from weakref import WeakKeyDictionary
+
+from fastapi import HTTPException
+from sqlalchemy import Float, cast, func, literal, literal_column, or_, text, tuple_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from app.crud.task_archive import ALL_TASKS, task_source
+from app.models.models import Task
+from app.utils.cursor import decode_cursor, encode_cursor
+
+# Generated column added by the DDL in app.models.models (Postgres only),
+# read through the union of tasks and tasks_archive
+search_vector = literal_column(f"{ALL_TASKS}.search_vector", type_=TSVECTOR)
+
+_trgm_installed = WeakKeyDictionary()
+
+
+def _uses_postgres(db: Session) -> bool:
+    """Whether the session talks to Postgres and can use the indexed search."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _has_trgm(db: Session) -> bool:
+    """Whether pg_trgm is installed, cached per engine."""
+    engine = db.get_bind().engine
+    if engine not in _trgm_installed:
+        _trgm_installed[engine] = db.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+        ).scalar()
+    return _trgm_installed[engine]
+
+
+def _prefix_tsquery(term: str, weight: str) -> Optional[str]:
+    """Turn free text into a prefix tsquery restricted to one weight class."""
+    words = re.findall(r"\w+", term.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*{weight}" for word in words)
+
+
+def _field_match(column, term: str, weight: str, use_trgm: bool):
+    """Match and rank expressions for one searched field."""
+    conditions = [column.ilike(f"%{term}%")]
+    rank = literal(0.0)
+    tsquery = _prefix_tsquery(term, weight)
+    if tsquery is not None:
+        query = func.to_tsquery("simple", tsquery)
+        conditions.append(search_vector.op("@@")(query))
+        rank = func.ts_rank_cd(search_vector, query)
+    if use_trgm:
+        # word_similarity tolerates typos; <% is served by the trigram index
+        conditions.append(literal(term).op("<%")(column))
+        rank = rank + func.word_similarity(term, column)
+    return or_(*conditions), rank
+
+
+def search_tasks(
+    db: Session,
+    owner_id: int,
+    title: str = None,
+    description: str = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    columns: Optional[Sequence] = None,
+) -> Tuple[List[Task], Optional[str]]:
+    """Search for tasks by title and/or description, best matches first.
+
+    Returns the page of tasks and the cursor for the next page, if any.
+    Passing columns (which must include Task.id) returns plain rows of
+    those columns followed by the rank instead of Task objects. Archived
+    tasks are searched too.
+    """
+    uses_postgres = _uses_postgres(db)
+    source = task_source(True, search_vector=uses_postgres)
+    if columns:
+        query = db.query(*(getattr(source, column.key) for column in columns))
+    else:
+        query = db.query(source)
+    query = query.filter(source.owner_id == owner_id)
+    rank = literal(0.0)
+
+    if uses_postgres:
+        use_trgm = _has_trgm(db)
+        for column, term, weight in (
+            (source.title, title, "A"),
+            (source.description, description, "B"),
+        ):
+            if term:
+                condition, field_rank = _field_match(column, term, weight, use_trgm)
+                query = query.filter(condition)
+                rank = rank + field_rank
+    else:
+        if title:
+            query = query.filter(source.title.ilike(f"%{title}%"))
+        if description:
+            query = query.filter(source.description.ilike(f"%{description}%"))
+
+    rank = cast(rank, Float)
+    if cursor is not None:
+        payload = decode_cursor(cursor)
+        try:
+            last_rank, last_id = float(payload["r"]), int(payload["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(rank, source.id) < (last_rank, last_id))
+
+    rows = (
+        query.add_columns(rank)
+        .order_by(rank.desc(), source.id.desc())
+        .limit(limit)
+        .all()
+    )
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        last_id = last.id if columns else last[0].id
+        next_cursor = encode_cursor({"r": last[-1], "id": last_id})
+    if columns:
+        return rows, next_cursor
+    return [task for task, _ in rows], next_cursor
@@ -0,0 +1,139 @@
+from collections import Counter
+from datetime import date, datetime, time, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.enums import TaskPriority, TaskStatus
+from app.models.models import Task, TaskDueDay, TaskStat
+
+# Columns whose changes move a task between counters
+STATS_COLUMNS = frozenset({"status", "priority", "deadline"})
+
+# (status, priority, deadline) of one task
+TaskKey = Tuple[TaskStatus, TaskPriority, Optional[datetime]]
+
+
+def _due_date(deadline: datetime) -> date:
+    """Day of a deadline in UTC; naive values are taken as UTC."""
+    if deadline.tzinfo is None:
+        return deadline.date()
+    return deadline.astimezone(timezone.utc).date()
+
+
+def _upsert_counts(db: Session, table, keys: Tuple[str, ...], deltas: Counter):
+    """Add deltas to counters, creating missing rows."""
+    # Sorted so concurrent writers lock the counter rows in the same order
+    rows = [
+        {**dict(zip(keys, key)), "count": delta}
+        for key, delta in sorted(deltas.items(), key=lambda item: str(item[0]))
+        if delta
+    ]
+    if not rows:
+        return
+    statement = insert(table).values(rows)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={"count": table.c.count + statement.excluded.count},
+        )
+    )
+
+
+def record_task_changes(
+    db: Session,
+    owner_id: int,
+    removed: Iterable[TaskKey] = (),
+    added: Iterable[TaskKey] = (),
+):
+    """Move tasks between the stats counters in the caller's transaction."""
+    counts, due = Counter(), Counter()
+    for sign, tasks in ((-1, removed), (1, added)):
+        for status, priority, deadline in tasks:
+            counts[(owner_id, status, priority)] += sign
+            if deadline is not None and status != TaskStatus.DONE:
+                due[(owner_id, _due_date(deadline))] += sign
+    _upsert_counts(db, TaskStat.__table__, ("owner_id", "status", "priority"), counts)
+    _upsert_counts(db, TaskDueDay.__table__, ("owner_id", "due_date"), due)
+
+
+def get_task_stats(db: Session, owner_id: int, now: Optional[datetime] = None) -> Dict:
+    """Read a user's task counts from the summary tables.
+
+    Overdue tasks are summed per past deadline day; only tasks due earlier
+    today are counted from tasks, through the (owner_id, deadline) index.
+    """
+    now = now or datetime.now(timezone.utc)
+    today = datetime.combine(now.date(), time(), tzinfo=timezone.utc)
+
+    by_status = {status.value: 0 for status in TaskStatus}
+    by_priority = {priority.value: 0 for priority in TaskPriority}
+    for status, priority, count in db.execute(
+        select(TaskStat.status, TaskStat.priority, TaskStat.count).where(
+            TaskStat.owner_id == owner_id
+        )
+    ):
+        by_status[status.value] += count
+        by_priority[priority.value] += count
+
+    overdue_days = (
+        select(func.coalesce(func.sum(TaskDueDay.count), 0))
+        .where(TaskDueDay.owner_id == owner_id, TaskDueDay.due_date < today.date())
+        .scalar_subquery()
+    )
+    overdue_today = (
+        select(func.count())
+        .select_from(Task)
+        .where(
+            Task.owner_id == owner_id,
+            Task.deadline >= today,
+            Task.deadline < now,
+            Task.status != TaskStatus.DONE,
+        )
+        .scalar_subquery()
+    )
+    overdue = db.scalar(select(overdue_days + overdue_today))
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "overdue": overdue,
+    }
+
+
+def rebuild_task_stats(db: Session, owner_id: Optional[int] = None):
+    """Recompute the summary tables from tasks, for one user or everyone.
+
+    Archived tasks are counted too. Writes to either table wait until the
+    rebuild commits, so no change is lost.
+    """
+    db.execute(text("LOCK TABLE tasks, tasks_archive IN SHARE MODE"))
+    owner = {"owner_id": owner_id}
+    where = "WHERE owner_id = :owner_id" if owner_id is not None else ""
+    and_owner = "AND owner_id = :owner_id" if owner_id is not None else ""
+    db.execute(text(f"DELETE FROM task_stats {where}"), owner)
+    db.execute(text(f"DELETE FROM task_due_days {where}"), owner)
+    db.execute(
+        text(
+            "INSERT INTO task_stats (owner_id, status, priority, count) "
+            "SELECT owner_id, status, priority, count(*) FROM ("
+            "SELECT owner_id, status, priority FROM tasks UNION ALL "
+            "SELECT owner_id, status, priority FROM tasks_archive"
+            f") AS all_tasks {where} "
+            "GROUP BY owner_id, status, priority"
+        ),
+        owner,
+    )
+    db.execute(
+        text(
+            "INSERT INTO task_due_days (owner_id, due_date, count) "
+            "SELECT owner_id, (deadline AT TIME ZONE 'UTC')::date, count(*) "
+            f"FROM tasks WHERE deadline IS NOT NULL AND status <> 'DONE' {and_owner} "
+            "GROUP BY 1, 2"
+        ),
+        owner,
+    )
+    db.commit()
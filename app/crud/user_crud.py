@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models.models import User
-from app.auth.hash import get_password_hash, verify_password
+from app.auth.hash import get_password_hash
+from app.auth.user_cache import invalidate_user
 
 
 def get_user_by_email(db: Session, email: str) -> User:
@@ -16,13 +17,23 @@ def get_user_by_id(db: Session, id: int) -> User | None:
     return db.query(User).filter(User.id == id).first()
 
 
-def create_user(db: Session, email: str, plain_password: str) -> User:
-    """Create a new user with a hashed password."""
+def ensure_email_available(db: Session, email: str):
+    """Raise 409 when an account already uses the email."""
     if get_user_by_email(db, email) is not None:
         raise HTTPException(
             status_code=409, detail="Account with this email already exists"
         )
-    new_user = User(email=email, hashed_password=get_password_hash(plain_password))
+
+
+def create_user(db: Session, email: str, plain_password: str) -> User:
+    """Create a new user with a hashed password."""
+    ensure_email_available(db, email)
+    return insert_user(db, email, get_password_hash(plain_password))
+
+
+def insert_user(db: Session, email: str, hashed_password: str) -> User:
+    """Insert a user row from an already hashed password."""
+    new_user = User(email=email, hashed_password=hashed_password)
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
@@ -35,17 +46,15 @@ def update_user_email(db: Session, user: User, new_email: EmailStr) -> User:
         raise HTTPException(status_code=400, detail="Email already registered")
     user.email = new_email
     db.commit()
+    invalidate_user(user.id)
     db.refresh(user)
     return user
 
 
-def update_user_password(
-    db: Session, user: User, old_password: str, new_password: str
-) -> User:
-    """Update an existing user's password."""
-    if not verify_password(old_password, user.hashed_password):
-        raise HTTPException(status_code=400, detail="Incorrect password")
-    user.hashed_password = get_password_hash(new_password)
+def set_user_password_hash(db: Session, user: User, hashed_password: str) -> User:
+    """Store an already hashed password for an existing user."""
+    user.hashed_password = hashed_password
     db.commit()
+    invalidate_user(user.id)
     db.refresh(user)
     return user
@@ -1,22 +1,54 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv, find_dotenv
 import os
 
+from app.db.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
+from app.utils.env import env_flag
+from app.utils.metrics import instrument_engine
+
 load_dotenv(find_dotenv())
 
+
 ENV = os.getenv("ENV", "local")
 if ENV == "docker":
     DATABASE_URL = os.getenv("DATABASE_URL_DOCKER")
 else:
     DATABASE_URL = os.getenv("DATABASE_URL_LOCAL")
 
-engine = create_engine(
-    DATABASE_URL, echo=True  # Log SQL queries, set False in production
+# Serve requests through the asyncio stack (asyncpg) instead of the thread pool
+USE_ASYNC_DB = env_flag("ASYNC_DB", "false")
+ASYNC_DATABASE_URL = os.getenv("DATABASE_URL_ASYNC") or make_url(DATABASE_URL).set(
+    drivername="postgresql+asyncpg"
 )
+
+# Connection pool sizing, applied to each engine in every worker process
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": env_flag("DB_POOL_PRE_PING", "true"),
+    "echo": env_flag("DB_ECHO", "false"),  # Log SQL queries, keep off in production
+}
+
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, **POOL_OPTIONS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, poolclass=TimedAsyncAdaptedQueuePool, **POOL_OPTIONS
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Per-request SQL statement counts, rows and DB time for /metrics
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 
 def get_db():
     """Yield a database session and ensure it closes after use."""
@@ -25,3 +57,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Yield an async database session and ensure it closes after use."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,14 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 import uvicorn
 
-from app.routers import auth, users, tasks
+from app.crud.task_archive import TASK_ARCHIVE_WORKER, run_archive_worker
+from app.crud.task_events import TASK_STREAM_NOTIFY, listen_for_task_events
+from app.crud.task_reminders import REMINDER_WORKER_ENABLED, run_reminder_worker
+from app.db.database import ASYNC_DATABASE_URL, USE_ASYNC_DB, engine
+from app.utils.metrics import METRICS_ENABLED, MetricsMiddleware
+from app.routers import auth, users, tasks, monitoring
+from app.routers import async_auth, async_users, async_tasks
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the enabled background tasks alongside the app."""
+    workers = []
+    if REMINDER_WORKER_ENABLED:
+        workers.append(asyncio.create_task(run_reminder_worker(engine)))
+    if TASK_ARCHIVE_WORKER:
+        workers.append(asyncio.create_task(run_archive_worker(engine)))
+    if TASK_STREAM_NOTIFY:
+        workers.append(asyncio.create_task(listen_for_task_events(ASYNC_DATABASE_URL)))
+    yield
+    for worker in workers:
+        worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await worker
+
+
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
-# Register API routers
-app.include_router(auth.router)
-app.include_router(users.router)
-app.include_router(tasks.router)
+# Register API routers, on the asyncio stack when ASYNC_DB is enabled
+if USE_ASYNC_DB:
+    app.include_router(async_auth.router)
+    app.include_router(async_users.router)
+    app.include_router(async_tasks.router)
+else:
+    app.include_router(auth.router)
+    app.include_router(users.router)
+    app.include_router(tasks.router)
+app.include_router(monitoring.router)
+app.include_router(monitoring.metrics_router)
 
 
 if __name__ == "__main__":
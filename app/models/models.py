@@ -1,4 +1,20 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+import os
+
+from sqlalchemy import (
+    DDL,
+    Column,
+    Date,
+    Integer,
+    String,
+    ForeignKey,
+    ForeignKeyConstraint,
+    DateTime,
+    Enum,
+    Index,
+    Sequence,
+    event,
+    text,
+)
 from datetime import datetime, timezone
 
 from app.db.database import Base
@@ -21,17 +37,200 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), default=utc_now)
 
 
+# Hash partitions of tasks created by create_all and the partitioning
+# migration; an existing database keeps the count it was migrated with
+TASK_PARTITIONS = int(os.getenv("TASK_PARTITIONS", "8"))
+
+
 class Task(Base):
-    """Database model for user tasks."""
+    """Database model for user tasks.
+
+    On Postgres the table is partitioned by hash of owner_id, so the key
+    is (id, owner_id) and queries that filter on the owner read one
+    partition. Ids still come from one sequence.
+    """
 
     __tablename__ = "tasks"
 
-    id = Column(Integer, primary_key=True)
+    # A composite key is not SERIAL; the sequence is also the server default
+    # on Postgres, see the DDL below
+    id = Column(
+        Integer, Sequence("tasks_id_seq"), primary_key=True, insert_sentinel=True
+    )
     title = Column(String(100), nullable=False)
     description = Column(String(1000), nullable=True)
     deadline = Column(DateTime(timezone=True), nullable=True)
     status = Column(Enum(TaskStatus), nullable=False, default=TaskStatus.TODO)
     priority = Column(Enum(TaskPriority), nullable=False, default=TaskPriority.NONE)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
     created_at = Column(DateTime(timezone=True), default=utc_now)
     updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
+
+    # Indexes matching the filter/sort shapes used by the task list and search
+    __table_args__ = (
+        Index("ix_tasks_owner_id_created_at", "owner_id", "created_at"),
+        # Changed tasks since a sync token, see app.crud.task_sync
+        Index("ix_tasks_owner_id_updated_at", "owner_id", "updated_at"),
+        Index("ix_tasks_owner_id_deadline", "owner_id", "deadline"),
+        Index("ix_tasks_owner_id_status_priority", "owner_id", "status", "priority"),
+        Index(
+            "ix_tasks_owner_id_created_at_not_done",
+            "owner_id",
+            "created_at",
+            postgresql_where=text("status <> 'DONE'"),
+        ),
+        # Range scans of open tasks across all users by the reminder worker
+        Index(
+            "ix_tasks_deadline_not_done",
+            "deadline",
+            "id",
+            postgresql_where=text("status <> 'DONE'"),
+        ),
+        # Completed tasks in the order the archiver moves them
+        Index(
+            "ix_tasks_updated_at_done",
+            "updated_at",
+            "id",
+            postgresql_where=text("status = 'DONE'"),
+        ),
+        {"postgresql_partition_by": "HASH (owner_id)"},
+    )
+
+
+for statement in (
+    "ALTER TABLE tasks ALTER COLUMN id SET DEFAULT nextval('tasks_id_seq')",
+    "ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id",
+    *(
+        f"CREATE TABLE tasks_p{remainder} PARTITION OF tasks "
+        f"FOR VALUES WITH (MODULUS {TASK_PARTITIONS}, REMAINDER {remainder})"
+        for remainder in range(TASK_PARTITIONS)
+    ),
+):
+    event.listen(
+        Task.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+
+
+class TaskArchive(Base):
+    """Completed task moved out of tasks by app.crud.task_archive.
+
+    Rows keep their task id and are moved back into tasks when updated.
+    """
+
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(100), nullable=False)
+    description = Column(String(1000), nullable=True)
+    deadline = Column(DateTime(timezone=True), nullable=True)
+    status = Column(Enum(TaskStatus), nullable=False)
+    priority = Column(Enum(TaskPriority), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+    # The task list orderings and /tasks/changes, merged with tasks' own
+    __table_args__ = (
+        Index("ix_tasks_archive_owner_id_created_at", "owner_id", "created_at"),
+        Index("ix_tasks_archive_owner_id_deadline", "owner_id", "deadline"),
+        Index("ix_tasks_archive_owner_id_updated_at", "owner_id", "updated_at"),
+    )
+
+
+class TaskStat(Base):
+    """Number of tasks per owner, status and priority, kept in step with tasks."""
+
+    __tablename__ = "task_stats"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    priority = Column(Enum(TaskPriority), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class TaskDueDay(Base):
+    """Number of open tasks per owner and deadline day, used for overdue counts."""
+
+    __tablename__ = "task_due_days"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    due_date = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class TaskReminder(Base):
+    """A reminder sent for a task deadline; the key makes each one unique."""
+
+    __tablename__ = "task_reminders"
+
+    task_id = Column(Integer, primary_key=True)
+    kind = Column(String(20), primary_key=True)
+    # Part of the key so a moved deadline is reminded about again
+    deadline = Column(DateTime(timezone=True), primary_key=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utc_now)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["task_id", "owner_id"],
+            ["tasks.id", "tasks.owner_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+
+class TaskDeletion(Base):
+    """Tombstone of a deleted task, kept so clients can sync the deletion."""
+
+    __tablename__ = "task_deletions"
+
+    # Keyed for the (owner_id, deleted_at) range read by /tasks/changes
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), primary_key=True)
+    task_id = Column(Integer, primary_key=True)
+
+
+# Full-text search column and indexes of tasks and tasks_archive. They are
+# Postgres-only, so they are attached as DDL instead of mapped columns; other
+# databases fall back to ILIKE matching in app.crud.task_search.
+TASK_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def _pg_trgm_available(ddl, target, bind, **kw):
+    """Check whether the pg_trgm extension can be installed on this server."""
+    return bool(
+        bind.exec_driver_sql(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        ).scalar()
+    )
+
+
+for table in (Task.__table__, TaskArchive.__table__):
+    for statement in (
+        f"ALTER TABLE {table.name} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({TASK_SEARCH_VECTOR_SQL}) STORED",
+        f"CREATE INDEX ix_{table.name}_search_vector ON {table.name} "
+        "USING gin (search_vector)",
+    ):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+
+    for statement in (
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"CREATE INDEX ix_{table.name}_title_trgm ON {table.name} "
+        "USING gin (title gin_trgm_ops)",
+        f"CREATE INDEX ix_{table.name}_description_trgm ON {table.name} "
+        "USING gin (description gin_trgm_ops)",
+    ):
+        event.listen(
+            table,
+            "after_create",
+            DDL(statement).execute_if(
+                dialect="postgresql", callable_=_pg_trgm_available
+            ),
+        )
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.auth.hash import verify_password_async
+from app.crud.async_user_crud import get_user_by_email, create_user
+from app.db.database import get_async_db
+from app.routers.auth_common import access_token_response, require_user
+from app.schemas.user import UserCreate, UserResponse, Token
+
+router = APIRouter(prefix="/auth", tags=["authentication"])
+
+
+@router.post(
+    "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
+)
+async def register_user(
+    user: UserCreate, db: AsyncSession = Depends(get_async_db)
+) -> UserResponse:
+    """Register a new user with email and password."""
+    new_user = await create_user(db, email=user.email, plain_password=user.password)
+    return new_user
+
+
+@router.post("/token", response_model=Token)
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+) -> Token:
+    """Authenticate user and return a JWT access token."""
+    user = require_user(await get_user_by_email(db, form_data.username))
+    return access_token_response(
+        user, await verify_password_async(form_data.password, user.hashed_password)
+    )
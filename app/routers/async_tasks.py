@@ -0,0 +1,225 @@
+from fastapi import APIRouter, Body, Depends, Header, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Optional
+
+from app.auth.jwt_handler import get_current_user_async
+from app.db.database import engine, get_async_db
+from app.models.models import User
+from app.schemas.task import (
+    TaskBulkDelete,
+    TaskBulkDeleteResult,
+    TaskBulkResult,
+    TaskChanges,
+    TaskCreate,
+    TaskImportResult,
+    TaskUpdate,
+    TaskResponse,
+    TaskStatsResponse,
+)
+from app.crud.async_task_crud import (
+    create_task,
+    create_tasks_bulk,
+    delete_tasks_bulk,
+    update_tasks_bulk,
+    get_tasks_by_user,
+    get_tasks_version,
+    get_task_by_id,
+    update_task,
+    delete_task,
+    search_tasks,
+    get_task_stats,
+    get_task_changes,
+)
+from app.crud.task_export import stream_tasks_export
+from app.crud.task_import import import_tasks
+from app.routers.task_common import (
+    TaskExportRequest,
+    TaskImportRequest,
+    TaskListRequest,
+    TaskSearchRequest,
+    task_response,
+    task_stream_response,
+)
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+@router.post("/", response_model=TaskResponse)
+async def create_task_handler(
+    task: TaskCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Create a new task for the current user."""
+    return await create_task(db, task, owner_id=current_user.id)
+
+
+@router.get("/", response_model=List[TaskResponse])
+async def get_tasks_by_user_handler(
+    listing: TaskListRequest = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Retrieve all tasks belonging to the current user with filters and sorting.
+
+    A full page sets the X-Next-Cursor header to fetch the following one.
+    A matching If-None-Match gets a 304, and fields= selects and returns
+    only the listed columns.
+    """
+    cached = listing.cached_page(current_user.id)
+    if cached is not None:
+        return cached
+    version = await get_tasks_version(db, current_user.id, listing.include_archive)
+    unchanged = listing.not_modified(current_user.id, version)
+    if unchanged is not None:
+        return unchanged
+    tasks = await get_tasks_by_user(db, current_user.id, **listing.query())
+    return listing.respond(tasks)
+
+
+@router.get("/search", response_model=List[TaskResponse])
+async def search_tasks_handler(
+    search: TaskSearchRequest = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Search for tasks owned by the current user, best matches first."""
+    return search.respond(*await search_tasks(db, current_user.id, **search.query()))
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+async def get_task_stats_handler(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Count the current user's tasks by status and priority, plus overdue ones."""
+    return await get_task_stats(db, current_user.id)
+
+
+@router.get("/changes", response_model=TaskChanges)
+async def get_task_changes_handler(
+    since: Optional[str] = Query(
+        None, description="sync_token of the previous response; omit for all tasks"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Return the tasks changed and deleted since the previous sync.
+
+    Changes made within TASK_SYNC_LAG_SECONDS of a sync may be sent twice.
+    A token older than TASK_SYNC_RETENTION_DAYS is answered with 410.
+    """
+    return await get_task_changes(db, current_user.id, since)
+
+
+@router.get("/stream")
+async def stream_tasks_handler(current_user: User = Depends(get_current_user_async)):
+    """Push changes to the current user's tasks as Server-Sent Events.
+
+    Events are "created" and "updated" with the task, "deleted" with its
+    id, "refresh" after an import, and "overflow" when the client fell
+    behind and should reload its tasks.
+    """
+    return task_stream_response(current_user.id)
+
+
+@router.get("/export")
+async def export_tasks_handler(
+    export: TaskExportRequest = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Stream every matching task of the current user as NDJSON or CSV."""
+    return export.respond(
+        stream_tasks_export(db.bind, current_user.id, **export.query())
+    )
+
+
+@router.post("/import", response_model=TaskImportResult)
+async def import_tasks_handler(
+    upload: TaskImportRequest = Depends(),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Load many tasks for the current user from an uploaded file.
+
+    Rows that fail validation are skipped and reported; the rest are
+    written in one transaction.
+    """
+    # COPY needs the psycopg2 driver, so the load runs on the sync engine
+    return await run_in_threadpool(
+        import_tasks, engine, current_user.id, upload.stream, upload.format
+    )
+
+
+@router.post("/bulk", response_model=TaskBulkResult)
+async def create_tasks_bulk_handler(
+    tasks: List[Any] = Body(..., description="TaskCreate payloads"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Create many tasks for the current user in one transaction.
+
+    Invalid items are reported in `errors` by index; the others are still created.
+    """
+    items, errors = await create_tasks_bulk(db, tasks, owner_id=current_user.id)
+    return {"items": items, "errors": errors}
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def update_tasks_bulk_handler(
+    tasks: List[Any] = Body(..., description="TaskUpdate payloads with an 'id'"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Update many tasks owned by the current user in one transaction."""
+    items, errors = await update_tasks_bulk(db, tasks, owner_id=current_user.id)
+    return {"items": items, "errors": errors}
+
+
+@router.delete("/bulk", response_model=TaskBulkDeleteResult)
+async def delete_tasks_bulk_handler(
+    payload: TaskBulkDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Delete many tasks owned by the current user in one transaction."""
+    deleted, errors = await delete_tasks_bulk(db, payload.ids, owner_id=current_user.id)
+    return {"deleted": deleted, "errors": errors}
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task_by_id_handler(
+    task_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Fetch a specific task if owned by the current user.
+
+    Answers 304 when If-None-Match holds the task's current ETag.
+    """
+    task = await get_task_by_id(db, task_id, current_user.id)
+    return task_response(task, response, if_none_match)
+
+
+@router.put("/{task_id}", response_model=TaskResponse)
+async def update_task_handler(
+    task: TaskUpdate,
+    task_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Update a task if owned by the current user."""
+    return await update_task(db, task_id, task, owner_id=current_user.id)
+
+
+@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task_handler(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """Delete a task if owned by the current user."""
+    await delete_task(db, task_id, owner_id=current_user.id)
@@ -1,45 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from starlette import status
 
-from app.auth.hash import verify_password
-from app.auth.jwt_handler import create_access_token
-from app.crud.user_crud import get_user_by_email, create_user
+from app.auth.hash import get_password_hash_async, verify_password_async
+from app.crud.user_crud import ensure_email_available, get_user_by_email, insert_user
 from app.db.database import get_db
+from app.routers.auth_common import access_token_response, require_user
 from app.schemas.user import UserCreate, UserResponse, Token
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# These handlers are async so that bcrypt is awaited on its executor instead
+# of holding a threadpool thread; their queries still run in the threadpool.
+
 
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
-def register_user(user: UserCreate, db: Session = Depends(get_db)) -> UserResponse:
+async def register_user(
+    user: UserCreate, db: Session = Depends(get_db)
+) -> UserResponse:
     """Register a new user with email and password."""
-    new_user = create_user(db, email=user.email, plain_password=user.password)
-    return new_user
+    await run_in_threadpool(ensure_email_available, db, user.email)
+    hashed_password = await get_password_hash_async(user.password)
+    return await run_in_threadpool(insert_user, db, user.email, hashed_password)
 
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ) -> Token:
     """Authenticate user and return a JWT access token."""
-    user = get_user_by_email(db, form_data.username)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User does not exist",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    if not verify_password(form_data.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    payload = {"sub": str(user.id)}
-    access_token = create_access_token(data=payload)
-    return {"access_token": access_token, "token_type": "bearer"}
+    user = require_user(
+        await run_in_threadpool(get_user_by_email, db, form_data.username)
+    )
+    return access_token_response(
+        user, await verify_password_async(form_data.password, user.hashed_password)
+    )
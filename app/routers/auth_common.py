@@ -0,0 +1,36 @@
+"""Login checks and token responses shared by the auth routers.
+
+app.routers.auth and app.routers.async_auth differ only in how they look
+users up and verify passwords.
+"""
+
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette import status
+
+from app.auth.jwt_handler import create_access_token
+from app.models.models import User
+
+
+def require_user(user: Optional[User]) -> User:
+    """The user a login names, or 404 when there is none."""
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User does not exist",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+def access_token_response(user: User, password_matches: bool) -> dict:
+    """Issue a bearer token for the user, or 401 for a wrong password."""
+    if not password_matches:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    access_token = create_access_token(data={"sub": str(user.id)})
+    return {"access_token": access_token, "token_type": "bearer"}
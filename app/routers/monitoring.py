@@ -0,0 +1,47 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.auth.jwt_handler import token_cache
+from app.auth.user_cache import user_cache
+from app.crud.task_events import task_events
+from app.crud.task_list_cache import task_list_cache
+from app.db.database import async_engine, engine
+from app.db.pool import pool_stats
+from app.utils.metrics import registry
+
+router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+# Served at the conventional scrape path rather than under /monitoring
+metrics_router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/pool")
+def read_pool_stats():
+    """Report connection pool saturation for the sync and async engines."""
+    return {
+        "sync": pool_stats(engine.pool),
+        "async": pool_stats(async_engine.sync_engine.pool),
+    }
+
+
+@router.get("/cache")
+def read_cache_stats():
+    """Report size and hit/miss counters of the in-process caches."""
+    return {
+        "users": user_cache.stats(),
+        "tokens": token_cache.stats(),
+        "task_lists": task_list_cache.backend.stats(),
+    }
+
+
+@router.get("/streams")
+def read_stream_stats():
+    """Report how many task event streams are open in this process."""
+    return task_events.stats()
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """Expose per-route latency and SQL metrics in Prometheus text format."""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,293 @@
+"""Request parsing and response building shared by the task routers.
+
+app.routers.tasks and app.routers.async_tasks differ only in how they
+reach the database; the query parameters, caching, ETags, sparse
+fieldsets and response bodies around those calls are defined here once.
+"""
+
+import io
+from datetime import datetime
+from typing import Any, Dict, List, Literal, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import Depends, File, Header, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+
+from app.crud.task_archive import reads_archive
+from app.crud.task_crud import (
+    TASK_RESPONSE_COLUMNS,
+    encode_task_cursor,
+    parse_task_fields,
+    task_field_columns,
+)
+from app.crud.task_events import stream_task_events
+from app.crud.task_export import EXPORT_MEDIA_TYPES
+from app.crud.task_import import detect_format
+from app.crud.task_list_cache import (
+    cached_task_list,
+    store_task_list,
+    task_list_slot,
+)
+from app.models.enums import TaskPriority, TaskStatus
+from app.schemas.task import TaskResponse
+from app.utils.etag import etag_matches, make_etag, not_modified
+from app.utils.fast_json import (
+    FAST_JSON,
+    FastJSONResponse,
+    rows_to_dicts,
+    task_fields_response,
+)
+
+TaskFields = Optional[Tuple[str, ...]]
+
+_TASK_LIST = TypeAdapter(List[TaskResponse])
+
+
+class TaskFilters(NamedTuple):
+    status: Optional[TaskStatus]
+    priority: Optional[TaskPriority]
+    deadline_before: Optional[datetime]
+    deadline_after: Optional[datetime]
+    order_by: str
+    order_dir: str
+    show_completed: bool
+
+
+def task_filters(
+    status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
+    priority: Optional[TaskPriority] = Query(
+        None, description="Filter by task priority"
+    ),
+    deadline_before: Optional[datetime] = Query(
+        None, description="Tasks with deadline before this date"
+    ),
+    deadline_after: Optional[datetime] = Query(
+        None, description="Tasks with deadline after this date"
+    ),
+    order_by: str = Query(
+        "created_at", description="Sort by 'created_at' or 'deadline'"
+    ),
+    order_dir: str = Query("asc", description="Sort direction: 'asc' or 'desc'"),
+    show_completed: bool = Query(
+        True, description="Whether to include completed tasks"
+    ),
+) -> TaskFilters:
+    """Filter and sort parameters of the task list and export."""
+    return TaskFilters(
+        status,
+        priority,
+        deadline_before,
+        deadline_after,
+        order_by,
+        order_dir,
+        show_completed,
+    )
+
+
+def task_fields(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. id,title,status"
+    ),
+) -> TaskFields:
+    """The validated fields= parameter; None selects every field."""
+    return parse_task_fields(fields)
+
+
+def _fields_response(rows: Sequence, fields: Tuple[str, ...], response: Response):
+    return task_fields_response(rows, fields, headers=response.headers, fast=FAST_JSON)
+
+
+class TaskListRequest:
+    """GET /tasks/ around its two database reads.
+
+    With FAST_JSON the rows are selected as plain columns and encoded by
+    orjson. Either way the rendered page is cached until the user's next
+    task write, unless TASK_LIST_CACHE_BYTES is 0. The ETag covers the user's tasks and the query, so a matching If-None-Match
+    gets a 304 without loading the page. A full page sets X-Next-Cursor.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        if_none_match: Optional[str] = Header(None),
+        filters: TaskFilters = Depends(task_filters),
+        limit: int = Query(100, description="Maximum number of tasks to return"),
+        offset: int = Query(0, description="Number of tasks to skip"),
+        cursor: Optional[str] = Query(
+            None, description="Opaque cursor from X-Next-Cursor; replaces offset"
+        ),
+        fields: TaskFields = Depends(task_fields),
+    ):
+        self.request = request
+        self.response = response
+        self.if_none_match = if_none_match
+        self.filters = filters
+        self.limit = limit
+        self.offset = offset
+        self.cursor = cursor
+        self.fields = fields
+        self.slot = None
+
+    @property
+    def include_archive(self) -> bool:
+        return reads_archive(self.filters.status, self.filters.show_completed)
+
+    def cached_page(self, user_id: int) -> Optional[Response]:
+        """A cached copy of the page, or a 304 for it, before any query runs."""
+        self.slot = task_list_slot(
+            user_id,
+            **self.filters._asdict(),
+            limit=self.limit,
+            offset=self.offset,
+            cursor=self.cursor,
+            fields=self.fields,
+        )
+        return cached_task_list(self.slot, self.if_none_match)
+
+    def not_modified(self, user_id: int, version: Tuple) -> Optional[Response]:
+        """A 304 when the client has the page for this list version."""
+        etag = make_etag(
+            user_id, *version, sorted(self.request.query_params.multi_items())
+        )
+        if etag_matches(self.if_none_match, etag):
+            return not_modified(etag)
+        self.response.headers["ETag"] = etag
+        return None
+
+    def query(self) -> Dict[str, Any]:
+        """Keyword arguments of get_tasks_by_user for this page."""
+        columns = TASK_RESPONSE_COLUMNS if FAST_JSON else None
+        if self.fields is not None:
+            columns = task_field_columns(self.fields, self.filters.order_by)
+        return {
+            **self.filters._asdict(),
+            "limit": self.limit,
+            "offset": self.offset,
+            "cursor": self.cursor,
+            "columns": columns,
+        }
+
+    def respond(self, tasks: List[Any]):
+        """Render the page and keep it for the next identical request."""
+        if tasks and len(tasks) == self.limit:
+            self.response.headers["X-Next-Cursor"] = encode_task_cursor(
+                tasks[-1], self.filters.order_by, self.filters.order_dir
+            )
+        if self.fields is not None:
+            page = _fields_response(tasks, self.fields, self.response)
+        elif FAST_JSON:
+            # Rows already match TaskResponse, so skip validating them again
+            page = FastJSONResponse(rows_to_dicts(tasks), headers=self.response.headers)
+        elif self.slot is not None:
+            # Rendered here instead of by FastAPI so the body can be cached
+            items = _TASK_LIST.validate_python(tasks, from_attributes=True)
+            page = Response(
+                _TASK_LIST.dump_json(items),
+                media_type="application/json",
+                headers=self.response.headers,
+            )
+        else:
+            return tasks
+        store_task_list(self.slot, page)
+        return page
+
+
+class TaskSearchRequest:
+    """GET /tasks/search parameters and response."""
+
+    def __init__(
+        self,
+        response: Response,
+        title: str = None,
+        description: str = None,
+        limit: int = Query(100, description="Maximum number of tasks to return"),
+        cursor: Optional[str] = Query(
+            None, description="Opaque cursor from X-Next-Cursor"
+        ),
+        fields: TaskFields = Depends(task_fields),
+    ):
+        self.response = response
+        self.title = title
+        self.description = description
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+
+    def query(self) -> Dict[str, Any]:
+        """Keyword arguments of search_tasks for this request."""
+        return {
+            "title": self.title,
+            "description": self.description,
+            "limit": self.limit,
+            "cursor": self.cursor,
+            "columns": (
+                task_field_columns(self.fields) if self.fields is not None else None
+            ),
+        }
+
+    def respond(self, tasks: List[Any], next_cursor: Optional[str]):
+        if next_cursor is not None:
+            self.response.headers["X-Next-Cursor"] = next_cursor
+        if self.fields is not None:
+            return _fields_response(tasks, self.fields, self.response)
+        return tasks
+
+
+class TaskExportRequest:
+    """GET /tasks/export parameters and streamed response."""
+
+    def __init__(
+        self,
+        format: Literal["ndjson", "csv"] = Query(
+            "ndjson", description="'ndjson' or 'csv'"
+        ),
+        filters: TaskFilters = Depends(task_filters),
+    ):
+        self.format = format
+        self.filters = filters
+
+    def query(self) -> Dict[str, Any]:
+        """Keyword arguments of iter_tasks_export for this request."""
+        return {"format": self.format, **self.filters._asdict()}
+
+    def respond(self, rows) -> StreamingResponse:
+        return StreamingResponse(
+            rows,
+            media_type=EXPORT_MEDIA_TYPES[self.format],
+            headers={
+                "Content-Disposition": f'attachment; filename="tasks.{self.format}"'
+            },
+        )
+
+
+class TaskImportRequest:
+    """POST /tasks/import upload, read as text in the detected format."""
+
+    def __init__(
+        self,
+        file: UploadFile = File(..., description="NDJSON or CSV file of tasks"),
+        format: Optional[Literal["ndjson", "csv"]] = Query(
+            None, description="'ndjson' or 'csv'; defaults to the file extension"
+        ),
+    ):
+        self.stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        self.format = format or detect_format(file.filename)
+
+
+def task_response(task, response: Response, if_none_match: Optional[str]):
+    """Return a task with its ETag, or a 304 when If-None-Match holds it."""
+    etag = make_etag(task.id, task.updated_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return task
+
+
+def task_stream_response(user_id: int) -> StreamingResponse:
+    """Server-Sent Events of the user's task changes."""
+    return StreamingResponse(
+        stream_task_events(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
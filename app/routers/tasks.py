@@ -1,21 +1,46 @@
-from datetime import datetime
-
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Body, Depends, Header, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from app.auth.jwt_handler import get_current_user
 from app.db.database import get_db
-from app.models.enums import TaskPriority, TaskStatus
 from app.models.models import User
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.task import (
+    TaskBulkDelete,
+    TaskBulkDeleteResult,
+    TaskBulkResult,
+    TaskChanges,
+    TaskCreate,
+    TaskImportResult,
+    TaskUpdate,
+    TaskResponse,
+    TaskStatsResponse,
+)
 from app.crud.task_crud import (
     create_task,
     get_tasks_by_user,
+    get_tasks_version,
     get_task_by_id,
     update_task,
     delete_task,
-    search_tasks,
+)
+from app.crud.task_bulk import (
+    create_tasks_bulk,
+    delete_tasks_bulk,
+    update_tasks_bulk,
+)
+from app.crud.task_search import search_tasks
+from app.crud.task_stats import get_task_stats
+from app.crud.task_sync import get_task_changes
+from app.crud.task_export import iter_tasks_export
+from app.crud.task_import import import_tasks
+from app.routers.task_common import (
+    TaskExportRequest,
+    TaskImportRequest,
+    TaskListRequest,
+    TaskSearchRequest,
+    task_response,
+    task_stream_response,
 )
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -33,70 +58,148 @@ def create_task_handler(
 
 @router.get("/", response_model=List[TaskResponse])
 def get_tasks_by_user_handler(
+    listing: TaskListRequest = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
-    priority: Optional[TaskPriority] = Query(
-        None, description="Filter by task priority"
-    ),
-    deadline_before: Optional[datetime] = Query(
-        None, description="Tasks with deadline before this date"
-    ),
-    deadline_after: Optional[datetime] = Query(
-        None, description="Tasks with deadline after this date"
-    ),
-    limit: int = Query(100, description="Maximum number of tasks to return"),
-    offset: int = Query(0, description="Number of tasks to skip"),
-    order_by: str = Query(
-        "created_at", description="Sort by 'created_at' or 'deadline'"
-    ),
-    order_dir: str = Query("asc", description="Sort direction: 'asc' or 'desc'"),
-    show_completed: bool = Query(
-        True, description="Whether to include completed tasks"
-    ),
 ):
-    """Retrieve all tasks belonging to the current user with filters and sorting."""
-    tasks = get_tasks_by_user(
-        db=db,
-        user_id=current_user.id,
-        status=status,
-        priority=priority,
-        deadline_before=deadline_before,
-        deadline_after=deadline_after,
-        limit=limit,
-        offset=offset,
-        order_by=order_by,
-        order_dir=order_dir,
-        show_completed=show_completed,
-    )
-    return tasks
+    """Retrieve all tasks belonging to the current user with filters and sorting.
+
+    A full page sets the X-Next-Cursor header to fetch the following one.
+    A matching If-None-Match gets a 304, and fields= selects and returns
+    only the listed columns.
+    """
+    cached = listing.cached_page(current_user.id)
+    if cached is not None:
+        return cached
+    version = get_tasks_version(db, current_user.id, listing.include_archive)
+    unchanged = listing.not_modified(current_user.id, version)
+    if unchanged is not None:
+        return unchanged
+    return listing.respond(get_tasks_by_user(db, current_user.id, **listing.query()))
 
 
 @router.get("/search", response_model=List[TaskResponse])
 def search_tasks_handler(
-    title: str = None,
-    description: str = None,
+    search: TaskSearchRequest = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Search for tasks owned by the current user, best matches first."""
+    return search.respond(*search_tasks(db, current_user.id, **search.query()))
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+def get_task_stats_handler(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Count the current user's tasks by status and priority, plus overdue ones."""
+    return get_task_stats(db, current_user.id)
+
+
+@router.get("/changes", response_model=TaskChanges)
+def get_task_changes_handler(
+    since: Optional[str] = Query(
+        None, description="sync_token of the previous response; omit for all tasks"
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Search for tasks owned by the current user."""
-    tasks = search_tasks(
-        db=db, owner_id=current_user.id, title=title, description=description
+    """Return the tasks changed and deleted since the previous sync.
+
+    Changes made within TASK_SYNC_LAG_SECONDS of a sync may be sent twice.
+    A token older than TASK_SYNC_RETENTION_DAYS is answered with 410.
+    """
+    return get_task_changes(db, current_user.id, since)
+
+
+@router.get("/stream")
+async def stream_tasks_handler(current_user: User = Depends(get_current_user)):
+    """Push changes to the current user's tasks as Server-Sent Events.
+
+    Events are "created" and "updated" with the task, "deleted" with its
+    id, "refresh" after an import, and "overflow" when the client fell
+    behind and should reload its tasks.
+    """
+    return task_stream_response(current_user.id)
+
+
+@router.get("/export")
+def export_tasks_handler(
+    export: TaskExportRequest = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream every matching task of the current user as NDJSON or CSV."""
+    return export.respond(
+        iter_tasks_export(db.get_bind(), current_user.id, **export.query())
     )
-    return tasks
+
+
+@router.post("/import", response_model=TaskImportResult)
+def import_tasks_handler(
+    upload: TaskImportRequest = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Load many tasks for the current user from an uploaded file.
+
+    Rows that fail validation are skipped and reported; the rest are
+    written in one transaction.
+    """
+    return import_tasks(db.get_bind(), current_user.id, upload.stream, upload.format)
+
+
+@router.post("/bulk", response_model=TaskBulkResult)
+def create_tasks_bulk_handler(
+    tasks: List[Any] = Body(..., description="TaskCreate payloads"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Create many tasks for the current user in one transaction.
+
+    Invalid items are reported in `errors` by index; the others are still created.
+    """
+    items, errors = create_tasks_bulk(db, tasks, owner_id=current_user.id)
+    return {"items": items, "errors": errors}
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+def update_tasks_bulk_handler(
+    tasks: List[Any] = Body(..., description="TaskUpdate payloads with an 'id'"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Update many tasks owned by the current user in one transaction."""
+    items, errors = update_tasks_bulk(db, tasks, owner_id=current_user.id)
+    return {"items": items, "errors": errors}
+
+
+@router.delete("/bulk", response_model=TaskBulkDeleteResult)
+def delete_tasks_bulk_handler(
+    payload: TaskBulkDelete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Delete many tasks owned by the current user in one transaction."""
+    deleted, errors = delete_tasks_bulk(db, payload.ids, owner_id=current_user.id)
+    return {"deleted": deleted, "errors": errors}
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 def get_task_by_id_handler(
     task_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Fetch a specific task if owned by the current user."""
-    task = get_task_by_id(db, task_id)
-    if task.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not allowed to access this task")
-    return task
+    """Fetch a specific task if owned by the current user.
+
+    Answers 304 when If-None-Match holds the task's current ETag.
+    """
+    task = get_task_by_id(db, task_id, current_user.id)
+    return task_response(task, response, if_none_match)
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
@@ -107,11 +210,7 @@ def update_task_handler(
     current_user: User = Depends(get_current_user),
 ):
     """Update a task if owned by the current user."""
-    existing_task = get_task_by_id(db, task_id)
-    if existing_task.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not allowed to update this task")
-
-    return update_task(db, task_id, task)
+    return update_task(db, task_id, task, owner_id=current_user.id)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -121,8 +220,4 @@ def delete_task_handler(
     current_user: User = Depends(get_current_user),
 ):
     """Delete a task if owned by the current user."""
-    task = get_task_by_id(db, task_id)
-    if task.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not allowed to delete this task")
-
-    delete_task(db, task_id)
+    delete_task(db, task_id, owner_id=current_user.id)
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from app.auth.hash import get_password_hash_async, verify_password_async
 from app.auth.jwt_handler import get_current_user
-from app.crud.user_crud import update_user_email, update_user_password
+from app.crud.user_crud import set_user_password_hash, update_user_email
 from app.db.database import get_db
 from app.models.models import User
 from app.schemas.user import UserResponse, UpdateEmailRequest, UpdatePasswordRequest
@@ -28,16 +30,20 @@ def update_email(
 
 
 @router.patch("/password")
-def update_password(
+async def update_password(
     request: UpdatePasswordRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Update the current user's password."""
-    update_user_password(
-        db=db,
-        user=current_user,
-        old_password=request.old_password,
-        new_password=request.new_password,
-    )
+    """Update the current user's password.
+
+    Async like the auth handlers, so bcrypt is awaited on its executor
+    while the write still runs in the threadpool.
+    """
+    if not await verify_password_async(
+        request.old_password, current_user.hashed_password
+    ):
+        raise HTTPException(status_code=400, detail="Incorrect password")
+    hashed_password = await get_password_hash_async(request.new_password)
+    await run_in_threadpool(set_user_password_hash, db, current_user, hashed_password)
     return {"detail": "Password updated successfully"}
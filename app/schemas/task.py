@@ -1,6 +1,7 @@
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, Field, ConfigDict, create_model, field_validator
+from datetime import datetime, timezone
 
 from app.models.enums import TaskStatus, TaskPriority
 
@@ -15,10 +16,20 @@ class TaskBase(BaseModel):
     priority: Optional[TaskPriority] = TaskPriority.NONE
 
 
+def _deadline_in_utc(deadline: Optional[datetime]) -> Optional[datetime]:
+    """Take a naive deadline as UTC, as the stats due days do.
+
+    Postgres would otherwise read it in the session time zone.
+    """
+    if deadline is not None and deadline.tzinfo is None:
+        return deadline.replace(tzinfo=timezone.utc)
+    return deadline
+
+
 class TaskCreate(TaskBase):
     """Fields required to create a new task."""
 
-    pass
+    _deadline_in_utc = field_validator("deadline")(_deadline_in_utc)
 
 
 class TaskUpdate(TaskBase):
@@ -30,6 +41,8 @@ class TaskUpdate(TaskBase):
     status: Optional[TaskStatus] = None
     priority: Optional[TaskPriority] = None
 
+    _deadline_in_utc = field_validator("deadline")(_deadline_in_utc)
+
 
 class TaskResponse(TaskBase):
     """Response model for tasks, including IDs and timestamps."""
@@ -40,3 +53,81 @@ class TaskResponse(TaskBase):
     updated_at: Optional[datetime]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+@lru_cache(maxsize=512)
+def task_fields_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Response model with only the given TaskResponse fields, for fields=."""
+    return create_model(
+        "TaskFields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (TaskResponse.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+class TaskBulkUpdate(TaskUpdate):
+    """One item of a bulk update, identifying the task to change."""
+
+    id: int
+
+
+class TaskBulkDelete(BaseModel):
+    """IDs of the tasks to delete in one request."""
+
+    ids: List[int]
+
+
+class BulkItemError(BaseModel):
+    """Why one item of a bulk request was not applied."""
+
+    index: int
+    status_code: int
+    detail: Any
+
+
+class TaskBulkResult(BaseModel):
+    """Tasks written by a bulk request and the items that were rejected."""
+
+    items: List[TaskResponse]
+    errors: List[BulkItemError]
+
+
+class TaskBulkDeleteResult(BaseModel):
+    """Task IDs deleted by a bulk request and the items that were rejected."""
+
+    deleted: List[int]
+    errors: List[BulkItemError]
+
+
+class TaskChanges(BaseModel):
+    """Tasks changed and deleted since a sync token, and the token to send next."""
+
+    tasks: List[TaskResponse]
+    deleted: List[int]
+    sync_token: str
+
+
+class ImportRowError(BaseModel):
+    """A rejected row of an import, by line number in the uploaded file."""
+
+    line: int
+    detail: Any
+
+
+class TaskImportResult(BaseModel):
+    """Outcome of a bulk import."""
+
+    imported: int
+    rejected: int
+    errors: List[ImportRowError]
+    seconds: float
+    rows_per_second: int
+
+
+class TaskStatsResponse(BaseModel):
+    """Task counts of a user by status and priority, plus overdue open tasks."""
+
+    total: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    overdue: int
@@ -0,0 +1,6 @@
+import os
+
+
+def env_flag(name: str, default: str) -> bool:
+    """Read a boolean setting from the environment."""
+    return os.getenv(name, default).lower() in {"1", "true", "yes"}
@@ -0,0 +1,252 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.utils.env import env_flag
+
+# Record per-route latency and SQL counters, served at /metrics and in
+# Server-Timing response headers
+METRICS_ENABLED = env_flag("METRICS_ENABLED", "true")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestMetrics:
+    """SQL and phase timings collected while one request is served."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.phases: Dict[str, float] = {}
+
+    def add_phase(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """Render the Server-Timing header value, durations in milliseconds."""
+        total = (time.perf_counter() - self.started) * 1000
+        entries = [f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries"']
+        entries += [
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()
+        ]
+        entries.append(f"total;dur={total:.2f}")
+        return ", ".join(entries)
+
+
+# Metrics of the request being served; copied into threadpool workers, so
+# sync endpoints and engine events update the same object
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the duration of the block to a named phase of the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_phase(phase, time.perf_counter() - start)
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+def _labels(**labels) -> str:
+    """Render a Prometheus label set, escaping backslashes and quotes."""
+    pairs = []
+    for name, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe per-route request metrics in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency: Dict[Tuple[str, str, str], _Histogram] = {}
+        self._queries: Dict[Tuple[str, str], _Histogram] = {}
+        self._db_seconds: Dict[Tuple[str, str], float] = {}
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._phases: Dict[Tuple[str, str, str], float] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        request: RequestMetrics,
+    ):
+        """Record one finished request."""
+        key = (method, route)
+        with self._lock:
+            self._latency.setdefault(
+                (method, route, str(status)), _Histogram(LATENCY_BUCKETS)
+            ).observe(seconds)
+            self._queries.setdefault(key, _Histogram(QUERY_BUCKETS)).observe(
+                request.queries
+            )
+            self._db_seconds[key] = self._db_seconds.get(key, 0.0) + request.db_seconds
+            self._rows[key] = self._rows.get(key, 0) + request.rows
+            for phase, phase_seconds in request.phases.items():
+                phase_key = (method, route, phase)
+                self._phases[phase_key] = (
+                    self._phases.get(phase_key, 0.0) + phase_seconds
+                )
+
+    def reset(self):
+        with self._lock:
+            for series in (
+                self._latency,
+                self._queries,
+                self._db_seconds,
+                self._rows,
+                self._phases,
+            ):
+                series.clear()
+
+    @staticmethod
+    def _render_histogram(lines: list, name: str, series: dict, label_names):
+        for key, histogram in sorted(series.items()):
+            labels = dict(zip(label_names, key))
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+            lines.append(
+                f'{name}_bucket{_labels(**labels, le="+Inf")} {histogram.count}'
+            )
+            lines.append(f"{name}_sum{_labels(**labels)} {histogram.total}")
+            lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+
+    def render(self) -> str:
+        """Return all series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP http_request_duration_seconds Request latency per route.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            self._render_histogram(
+                lines,
+                "http_request_duration_seconds",
+                self._latency,
+                ("method", "route", "status"),
+            )
+            lines += [
+                "# HELP http_request_db_queries SQL statements executed per request.",
+                "# TYPE http_request_db_queries histogram",
+            ]
+            self._render_histogram(
+                lines, "http_request_db_queries", self._queries, ("method", "route")
+            )
+            for name, help_text, series in (
+                (
+                    "http_request_db_seconds_total",
+                    "Time spent executing SQL per route.",
+                    self._db_seconds,
+                ),
+                (
+                    "http_request_db_rows_total",
+                    "Rows returned or affected by SQL per route.",
+                    self._rows,
+                ),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, route), value in sorted(series.items()):
+                    lines.append(f"{name}{_labels(method=method, route=route)} {value}")
+            lines += [
+                "# HELP http_request_phase_seconds_total Time spent per request phase.",
+                "# TYPE http_request_phase_seconds_total counter",
+            ]
+            for (method, route, phase), value in sorted(self._phases.items()):
+                labels = _labels(method=method, route=route, phase=phase)
+                lines.append(f"http_request_phase_seconds_total{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def instrument_engine(engine):
+    """Count statements, rows and DB time of the current request on an engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if context is not None and _current.get() is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        metrics = _current.get()
+        started = getattr(context, "_metrics_started", None)
+        if metrics is None or started is None:
+            return
+        metrics.db_seconds += time.perf_counter() - started
+        metrics.queries += 1
+        metrics.rows += max(cursor.rowcount or 0, 0)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing each request and adding Server-Timing."""
+
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", metrics.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(metrics)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            # The route template keeps label cardinality bounded
+            route = scope.get("route")
+            self.registry.observe(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+                time.perf_counter() - metrics.started,
+                metrics,
+            )
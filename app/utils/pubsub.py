@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Hashable
+
+# Put in place of the buffered events when a subscriber falls too far behind
+OVERFLOW = object()
+
+
+class Subscription:
+    """Bounded queue of events for one consumer on an event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def offer(self, event: Any):
+        """Queue an event on the subscriber's loop; overflow drops the backlog."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+    async def get(self) -> Any:
+        return await self.queue.get()
+
+
+class EventBroker:
+    """In-process fan-out of events to asyncio subscribers, per topic.
+
+    publish() may be called from any thread; each event is handed to the
+    subscriber's own loop.
+    """
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: Hashable) -> Subscription:
+        """Register a subscriber; must be called from its event loop."""
+        subscription = Subscription(asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, topic: Hashable, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def has_subscribers(self, topic: Hashable) -> bool:
+        with self._lock:
+            return topic in self._subscribers
+
+    def publish(self, topic: Hashable, event: Any):
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                self.unsubscribe(topic, subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "topics": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+            }
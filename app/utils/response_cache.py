@@ -0,0 +1,149 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+
+class CacheBackend(ABC):
+    """Storage for versioned response caches.
+
+    Values are opaque bytes and versions are integer counters, so a shared
+    store such as Redis (GET/SET with expiry, INCR) can implement it.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes): ...
+
+    @abstractmethod
+    def get_version(self, namespace: str) -> int: ...
+
+    @abstractmethod
+    def bump_version(self, namespace: str) -> int: ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU bounded by the total size of the stored values.
+
+    Entries expire after ``ttl`` seconds, which bounds how long another
+    worker process may serve a response its own writes did not invalidate.
+
+    At most ``max_versions`` namespace versions are kept. Versions come from
+    one counter shared by all namespaces, and a namespace whose version was
+    evicted reads the counter's value at that time, so it never returns to
+    a version it had before its last bump.
+    """
+
+    def __init__(
+        self, max_bytes: int, ttl: Optional[float] = None, max_versions: int = 100_000
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_versions = max_versions
+        self._entries = OrderedDict()
+        self._versions = OrderedDict()
+        self._last_version = 0
+        self._evicted_version = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, expires_at)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: str):
+        value, _ = self._entries.pop(key)
+        self._size -= len(value)
+
+    def get_version(self, namespace: str) -> int:
+        with self._lock:
+            return self._versions.get(namespace, self._evicted_version)
+
+    def bump_version(self, namespace: str) -> int:
+        with self._lock:
+            self._last_version += 1
+            self._versions[namespace] = self._last_version
+            self._versions.move_to_end(namespace)
+            while len(self._versions) > self.max_versions:
+                self._versions.popitem(last=False)
+                self._evicted_version = self._last_version
+            return self._last_version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "versions": len(self._versions),
+            }
+
+
+class VersionedCache:
+    """Cache whose entries are keyed by a namespace version.
+
+    Bumping a namespace's version makes all of its entries unreachable in
+    O(1); the stale ones are evicted by the backend in time.
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str):
+        self.backend = backend
+        self.prefix = prefix
+
+    def _namespace(self, namespace) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    def version(self, namespace) -> int:
+        return self.backend.get_version(self._namespace(namespace))
+
+    def bump(self, namespace):
+        self.backend.bump_version(self._namespace(namespace))
+
+    def _key(self, namespace, version: int, key: str) -> str:
+        return f"{self._namespace(namespace)}:{version}:{key}"
+
+    def get(self, namespace, version: int, key: str) -> Optional[bytes]:
+        return self.backend.get(self._key(namespace, version, key))
+
+    def set(self, namespace, version: int, key: str, value: bytes):
+        self.backend.set(self._key(namespace, version, key), value)
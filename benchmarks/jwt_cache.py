@@ -0,0 +1,44 @@
+"""Compare per-request token verification cost with and without the cache.
+
+python -m benchmarks.jwt_cache --iterations 20000
+"""
+
+import argparse
+import timeit
+
+from app.auth import jwt_handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    if jwt_handler.SECRET_KEY is None:
+        jwt_handler.SECRET_KEY = "benchmark-secret"
+    token = jwt_handler.create_access_token({"sub": "1"})
+
+    def uncached():
+        jwt_handler.token_cache.clear()
+        jwt_handler.decode_access_token(token)
+
+    def cached():
+        jwt_handler.decode_access_token(token)
+
+    def clear_only():
+        jwt_handler.token_cache.clear()
+
+    overhead = timeit.timeit(clear_only, number=args.iterations)
+    results = {
+        "uncached": timeit.timeit(uncached, number=args.iterations) - overhead,
+        "cached": timeit.timeit(cached, number=args.iterations),
+    }
+
+    print(f"{'mode':<10}{'us/request':>12}")
+    for mode, seconds in results.items():
+        print(f"{mode:<10}{seconds / args.iterations * 1e6:>12.2f}")
+    print(f"speedup: {results['uncached'] / results['cached']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Measure GET /tasks/ latency while a burst of logins hits /auth/token.
+
+The app is started with uvicorn once per PASSWORD_HASH_EXECUTOR mode,
+against the database configured in .env. For each mode the script prints
+task latency percentiles when idle and during the login burst:
+
+    python -m benchmarks.login_burst --logins 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+EMAIL = "bench-login@example.com"
+PASSWORD = "BenchPass1!"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, executor: str) -> subprocess.Popen:
+    env = dict(os.environ, PASSWORD_HASH_EXECUTOR=executor, DB_ECHO="false")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index] * 1000
+
+
+async def prepare(client: httpx.AsyncClient) -> dict:
+    """Register the benchmark user, log in and make sure it owns some tasks."""
+    await client.post("/auth/register", json={"email": EMAIL, "password": PASSWORD})
+    resp = await client.post(
+        "/auth/token", data={"username": EMAIL, "password": PASSWORD}
+    )
+    resp.raise_for_status()
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    existing = await client.get("/tasks/", headers=headers, params={"limit": 20})
+    for i in range(20 - len(existing.json())):
+        await client.post("/tasks/", headers=headers, json={"title": f"Bench {i}"})
+    return headers
+
+
+async def task_latencies(client, headers, stop: asyncio.Event, workers: int = 4):
+    """Poll GET /tasks/ until stopped and return the request latencies."""
+    latencies = []
+
+    async def poll():
+        while not stop.is_set():
+            start = time.perf_counter()
+            resp = await client.get("/tasks/", headers=headers)
+            resp.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(poll() for _ in range(workers)))
+    return latencies
+
+
+async def login_burst(client, total: int, concurrency: int) -> dict:
+    """Send ``total`` logins, ``concurrency`` at a time, and count outcomes."""
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses = []
+
+    async def login():
+        async with semaphore:
+            resp = await client.post(
+                "/auth/token", data={"username": EMAIL, "password": PASSWORD}
+            )
+            statuses.append(resp.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "ok": statuses.count(200),
+        "rejected": statuses.count(503),
+        "logins_per_sec": statuses.count(200) / elapsed,
+    }
+
+
+async def run_scenario(base_url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + 8)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=120
+    ) as client:
+        headers = await prepare(client)
+
+        stop = asyncio.Event()
+        idle = asyncio.create_task(task_latencies(client, headers, stop))
+        await asyncio.sleep(args.idle_seconds)
+        stop.set()
+        idle_latencies = await idle
+
+        stop = asyncio.Event()
+        busy = asyncio.create_task(task_latencies(client, headers, stop))
+        burst = await login_burst(client, args.logins, args.concurrency)
+        stop.set()
+        busy_latencies = await busy
+
+    return {"idle": idle_latencies, "burst": busy_latencies, **burst}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    parser.add_argument(
+        "--executors",
+        nargs="+",
+        default=["inline", "process"],
+        help="PASSWORD_HASH_EXECUTOR modes to compare",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'executor':<10}{'phase':<8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        f"{'logins/s':>10}{'503s':>6}"
+    )
+    for executor in args.executors:
+        port = free_port()
+        server = start_server(port, executor)
+        try:
+            result = asyncio.run(run_scenario(f"http://127.0.0.1:{port}", args))
+        finally:
+            server.terminate()
+            server.wait()
+        for phase in ("idle", "burst"):
+            latencies = result[phase]
+            extra = (
+                f"{result['logins_per_sec']:>10.1f}{result['rejected']:>6}"
+                if phase == "burst"
+                else ""
+            )
+            print(
+                f"{executor:<10}{phase:<8}{percentile(latencies, 50):>10.1f}"
+                f"{percentile(latencies, 95):>10.1f}{percentile(latencies, 99):>10.1f}"
+                + extra
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare GET /tasks/ with and without the FAST_JSON response path.
+
+The app runs in-process against the database configured in .env. A
+benchmark user gets 1000 tasks, then pages of 10, 100 and 1000 tasks are
+fetched in both modes. The task list cache is turned off, so every request
+loads and serializes its page:
+
+    python -m benchmarks.task_list_json --requests 200
+"""
+
+import argparse
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+
+from app.auth import jwt_handler
+from app.crud import task_list_cache
+from app.db.database import SessionLocal
+from app.main import app
+from app.models.models import Task, User
+from app.routers import task_common
+
+EMAIL = "bench-json@example.com"
+SIZES = (10, 100, 1000)
+
+
+def prepare() -> dict:
+    """Create the benchmark user with enough tasks for the largest page."""
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == EMAIL).first()
+        if user is None:
+            user = User(email=EMAIL, hashed_password="not-used")
+            db.add(user)
+            db.commit()
+        existing = db.query(Task).filter(Task.owner_id == user.id).count()
+        db.add_all(
+            Task(
+                title=f"Bench task {i}",
+                description="Serialized by the task list benchmark " * 3,
+                owner_id=user.id,
+            )
+            for i in range(existing, max(SIZES))
+        )
+        db.commit()
+        token = jwt_handler.create_access_token({"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def measure(client: TestClient, headers: dict, size: int, requests: int) -> list:
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        resp = client.get("/tasks/", headers=headers, params={"limit": size})
+        latencies.append(time.perf_counter() - start)
+        resp.raise_for_status()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    headers = prepare()
+    task_list_cache.TASK_LIST_CACHE_BYTES = 0
+    print(f"{'size':>6}{'mode':>10}{'p50 ms':>10}{'mean ms':>10}")
+    with TestClient(app) as client:
+        for size in SIZES:
+            means = {}
+            for mode, fast in (("default", False), ("fast", True)):
+                task_common.FAST_JSON = fast
+                measure(client, headers, size, 10)  # warm up
+                latencies = measure(client, headers, size, args.requests)
+                means[mode] = statistics.mean(latencies)
+                p50 = statistics.median(latencies) * 1000
+                print(f"{size:>6}{mode:>10}{p50:>10.2f}{means[mode] * 1000:>10.2f}")
+            print(f"{'':>6}{'speedup':>10}{means['default'] / means['fast']:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
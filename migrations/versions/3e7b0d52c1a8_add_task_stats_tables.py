@@ -0,0 +1,60 @@
+"""add task stats tables
+
+Revision ID: 3e7b0d52c1a8
+Revises: 9a41d7c3e2f6
+Create Date: 2026-10-17 14:22:05.381774
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3e7b0d52c1a8"
+down_revision: Union[str, Sequence[str], None] = "9a41d7c3e2f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The enum types already exist, they belong to tasks
+taskstatus = postgresql.ENUM(name="taskstatus", create_type=False)
+taskpriority = postgresql.ENUM(name="taskpriority", create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_stats",
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("status", taskstatus, nullable=False),
+        sa.Column("priority", taskpriority, nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("owner_id", "status", "priority"),
+    )
+    op.create_table(
+        "task_due_days",
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("due_date", sa.Date(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("owner_id", "due_date"),
+    )
+    # Backfill from the existing tasks
+    op.execute(
+        "INSERT INTO task_stats (owner_id, status, priority, count) "
+        "SELECT owner_id, status, priority, count(*) FROM tasks "
+        "GROUP BY owner_id, status, priority"
+    )
+    op.execute(
+        "INSERT INTO task_due_days (owner_id, due_date, count) "
+        "SELECT owner_id, (deadline AT TIME ZONE 'UTC')::date, count(*) FROM tasks "
+        "WHERE deadline IS NOT NULL AND status <> 'DONE' "
+        "GROUP BY 1, 2"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_due_days")
+    op.drop_table("task_stats")
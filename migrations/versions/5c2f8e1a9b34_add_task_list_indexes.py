@@ -0,0 +1,45 @@
+"""add task list indexes
+
+Revision ID: 5c2f8e1a9b34
+Revises: aa0c0692e43c
+Create Date: 2026-10-17 09:12:41.118203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2f8e1a9b34"
+down_revision: Union[str, Sequence[str], None] = "aa0c0692e43c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_tasks_owner_id_created_at", "tasks", ["owner_id", "created_at"])
+    op.create_index("ix_tasks_owner_id_deadline", "tasks", ["owner_id", "deadline"])
+    op.create_index(
+        "ix_tasks_owner_id_status_priority",
+        "tasks",
+        ["owner_id", "status", "priority"],
+    )
+    # Serves show_completed=false, which excludes DONE tasks
+    op.create_index(
+        "ix_tasks_owner_id_created_at_not_done",
+        "tasks",
+        ["owner_id", "created_at"],
+        postgresql_where=sa.text("status <> 'DONE'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_owner_id_created_at_not_done", table_name="tasks")
+    op.drop_index("ix_tasks_owner_id_status_priority", table_name="tasks")
+    op.drop_index("ix_tasks_owner_id_deadline", table_name="tasks")
+    op.drop_index("ix_tasks_owner_id_created_at", table_name="tasks")
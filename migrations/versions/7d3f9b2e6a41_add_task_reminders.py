@@ -0,0 +1,48 @@
+"""add task reminders
+
+Revision ID: 7d3f9b2e6a41
+Revises: 3e7b0d52c1a8
+Create Date: 2026-10-17 16:05:12.402871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3f9b2e6a41"
+down_revision: Union[str, Sequence[str], None] = "3e7b0d52c1a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_deadline_not_done",
+        "tasks",
+        ["deadline", "id"],
+        postgresql_where=sa.text("status <> 'DONE'"),
+    )
+    op.create_table(
+        "task_reminders",
+        sa.Column(
+            "task_id",
+            sa.Integer(),
+            sa.ForeignKey("tasks.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("task_id", "kind", "deadline"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_reminders")
+    op.drop_index("ix_tasks_deadline_not_done", table_name="tasks")
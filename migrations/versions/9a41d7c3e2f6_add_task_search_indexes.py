@@ -0,0 +1,75 @@
+"""add task search indexes
+
+Revision ID: 9a41d7c3e2f6
+Revises: 5c2f8e1a9b34
+Create Date: 2026-10-17 11:03:27.540912
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a41d7c3e2f6"
+down_revision: Union[str, Sequence[str], None] = "5c2f8e1a9b34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def _pg_trgm_available() -> bool:
+    """Check whether the pg_trgm extension can be installed on this server.
+
+    Mirrors app.models.models; offline (--sql) runs assume it can.
+    """
+    if context.is_offline_mode():
+        return True
+    return bool(
+        op.get_bind()
+        .exec_driver_sql("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        .scalar()
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "ALTER TABLE tasks ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    op.create_index(
+        "ix_tasks_search_vector",
+        "tasks",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    if _pg_trgm_available():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_tasks_title_trgm",
+            "tasks",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        )
+        op.create_index(
+            "ix_tasks_description_trgm",
+            "tasks",
+            ["description"],
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_description_trgm", table_name="tasks", if_exists=True)
+    op.drop_index("ix_tasks_title_trgm", table_name="tasks", if_exists=True)
+    op.drop_index("ix_tasks_search_vector", table_name="tasks")
+    op.drop_column("tasks", "search_vector")
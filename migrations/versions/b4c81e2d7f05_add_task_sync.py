@@ -0,0 +1,36 @@
+"""add task sync
+
+Revision ID: b4c81e2d7f05
+Revises: 7d3f9b2e6a41
+Create Date: 2026-10-17 18:20:44.118302
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b4c81e2d7f05"
+down_revision: Union[str, Sequence[str], None] = "7d3f9b2e6a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_tasks_owner_id_updated_at", "tasks", ["owner_id", "updated_at"])
+    op.create_table(
+        "task_deletions",
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("owner_id", "deleted_at", "task_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_deletions")
+    op.drop_index("ix_tasks_owner_id_updated_at", table_name="tasks")
@@ -0,0 +1,104 @@
+"""add tasks archive
+
+Revision ID: e2a9c4f71b58
+Revises: b4c81e2d7f05
+Create Date: 2026-10-17 20:41:09.652310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a9c4f71b58"
+down_revision: Union[str, Sequence[str], None] = "b4c81e2d7f05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+# The enum types already exist; they belong to tasks
+taskstatus = postgresql.ENUM(name="taskstatus", create_type=False)
+taskpriority = postgresql.ENUM(name="taskpriority", create_type=False)
+
+
+def _pg_trgm_available() -> bool:
+    """Check whether the pg_trgm extension can be installed on this server.
+
+    Mirrors app.models.models; offline (--sql) runs assume it can.
+    """
+    if context.is_offline_mode():
+        return True
+    return bool(
+        op.get_bind()
+        .exec_driver_sql("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        .scalar()
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_updated_at_done",
+        "tasks",
+        ["updated_at", "id"],
+        postgresql_where=sa.text("status = 'DONE'"),
+    )
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.String(length=1000), nullable=True),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("status", taskstatus, nullable=False),
+        sa.Column("priority", taskpriority, nullable=False),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    for column in ("created_at", "deadline", "updated_at"):
+        op.create_index(
+            f"ix_tasks_archive_owner_id_{column}",
+            "tasks_archive",
+            ["owner_id", column],
+        )
+    op.execute(
+        "ALTER TABLE tasks_archive ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    op.create_index(
+        "ix_tasks_archive_search_vector",
+        "tasks_archive",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    if _pg_trgm_available():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_tasks_archive_title_trgm",
+            "tasks_archive",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        )
+        op.create_index(
+            "ix_tasks_archive_description_trgm",
+            "tasks_archive",
+            ["description"],
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tasks_archive")
+    op.drop_index("ix_tasks_updated_at_done", table_name="tasks")
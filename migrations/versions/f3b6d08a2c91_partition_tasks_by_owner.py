@@ -0,0 +1,189 @@
+"""partition tasks by owner
+
+Revision ID: f3b6d08a2c91
+Revises: e2a9c4f71b58
+Create Date: 2026-10-17 23:12:40.218934
+
+The number of partitions is read from `alembic -x partitions=N upgrade head`,
+then from TASK_PARTITIONS, and defaults to 8. Changing it later means
+running this migration's downgrade and upgrade again.
+"""
+
+import os
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b6d08a2c91"
+down_revision: Union[str, Sequence[str], None] = "e2a9c4f71b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+# The enum types already exist; they belong to tasks
+taskstatus = postgresql.ENUM(name="taskstatus", create_type=False)
+taskpriority = postgresql.ENUM(name="taskpriority", create_type=False)
+
+TASK_COLUMNS = (
+    "id, title, description, deadline, status, priority, owner_id, "
+    "created_at, updated_at"
+)
+
+
+def _partitions() -> int:
+    partitions = context.get_x_argument(as_dictionary=True).get(
+        "partitions", os.getenv("TASK_PARTITIONS", "8")
+    )
+    return int(partitions)
+
+
+def _pg_trgm_available() -> bool:
+    """Check whether the pg_trgm extension can be installed on this server.
+
+    Mirrors app.models.models; offline (--sql) runs assume it can.
+    """
+    if context.is_offline_mode():
+        return True
+    return bool(
+        op.get_bind()
+        .exec_driver_sql("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        .scalar()
+    )
+
+
+def _create_tasks_table(name: str, **kwargs):
+    """Create an unkeyed, unindexed copy of tasks; ids come from its sequence."""
+    op.create_table(
+        name,
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('tasks_id_seq')"),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.String(length=1000), nullable=True),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "status", taskstatus, server_default=sa.text("'TODO'"), nullable=False
+        ),
+        sa.Column(
+            "priority", taskpriority, server_default=sa.text("'NONE'"), nullable=False
+        ),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        **kwargs,
+    )
+    op.execute(
+        f"ALTER TABLE {name} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+
+
+def _replace_tasks_table(name: str):
+    """Copy tasks into the new table, then put it in place of tasks."""
+    op.execute(f"INSERT INTO {name} ({TASK_COLUMNS}) SELECT {TASK_COLUMNS} FROM tasks")
+    op.drop_constraint("task_reminders_task_id_fkey", "task_reminders")
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY NONE")
+    op.drop_table("tasks")
+    op.rename_table(name, "tasks")
+    op.execute("ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id")
+
+
+def _create_task_indexes():
+    """Recreate the indexes of tasks; on a partitioned table, one per partition."""
+    op.create_foreign_key("tasks_owner_id_fkey", "tasks", "users", ["owner_id"], ["id"])
+    for columns in (
+        ["owner_id", "created_at"],
+        ["owner_id", "updated_at"],
+        ["owner_id", "deadline"],
+        ["owner_id", "status", "priority"],
+    ):
+        op.create_index(f"ix_tasks_{'_'.join(columns)}", "tasks", columns)
+    op.create_index(
+        "ix_tasks_owner_id_created_at_not_done",
+        "tasks",
+        ["owner_id", "created_at"],
+        postgresql_where=sa.text("status <> 'DONE'"),
+    )
+    op.create_index(
+        "ix_tasks_deadline_not_done",
+        "tasks",
+        ["deadline", "id"],
+        postgresql_where=sa.text("status <> 'DONE'"),
+    )
+    op.create_index(
+        "ix_tasks_updated_at_done",
+        "tasks",
+        ["updated_at", "id"],
+        postgresql_where=sa.text("status = 'DONE'"),
+    )
+    op.create_index(
+        "ix_tasks_search_vector",
+        "tasks",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    if _pg_trgm_available():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_tasks_title_trgm",
+            "tasks",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        )
+        op.create_index(
+            "ix_tasks_description_trgm",
+            "tasks",
+            ["description"],
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    partitions = _partitions()
+    _create_tasks_table("tasks_partitioned", postgresql_partition_by="HASH (owner_id)")
+    for remainder in range(partitions):
+        op.execute(
+            f"CREATE TABLE tasks_p{remainder} PARTITION OF tasks_partitioned "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+    _replace_tasks_table("tasks_partitioned")
+    # A key of a partitioned table must include the partition column
+    op.create_primary_key("tasks_pkey", "tasks", ["id", "owner_id"])
+    _create_task_indexes()
+    op.create_foreign_key(
+        "task_reminders_task_id_fkey",
+        "task_reminders",
+        "tasks",
+        ["task_id", "owner_id"],
+        ["id", "owner_id"],
+        ondelete="CASCADE",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _create_tasks_table("tasks_unpartitioned")
+    _replace_tasks_table("tasks_unpartitioned")
+    op.create_primary_key("tasks_pkey", "tasks", ["id"])
+    _create_task_indexes()
+    op.create_foreign_key(
+        "task_reminders_task_id_fkey",
+        "task_reminders",
+        "tasks",
+        ["task_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
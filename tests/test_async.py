@@ -0,0 +1,158 @@
+import re
+
+from app.models.enums import TaskStatus
+
+
+def test_async_task_crud_flow(async_client, test_user):
+    create_resp = async_client.post("/tasks/", json={"title": "Async Task"})
+    assert create_resp.status_code == 200
+    task = create_resp.json()
+    assert task["owner_id"] == test_user.id
+
+    get_resp = async_client.get(f"/tasks/{task['id']}")
+    assert get_resp.status_code == 200
+    assert get_resp.json()["title"] == "Async Task"
+
+    update_resp = async_client.put(
+        f"/tasks/{task['id']}", json={"status": TaskStatus.DONE.value}
+    )
+    assert update_resp.status_code == 200
+    assert update_resp.json()["status"] == TaskStatus.DONE.value
+
+    delete_resp = async_client.delete(f"/tasks/{task['id']}")
+    assert delete_resp.status_code == 204
+    assert async_client.get(f"/tasks/{task['id']}").status_code == 404
+
+
+def test_async_list_and_search(async_client):
+    for i in range(3):
+        async_client.post("/tasks/", json={"title": f"Async {i}"})
+
+    resp = async_client.get("/tasks/", params={"limit": 2})
+    assert resp.status_code == 200
+    assert [t["title"] for t in resp.json()] == ["Async 0", "Async 1"]
+    next_page = async_client.get(
+        "/tasks/", params={"limit": 2, "cursor": resp.headers["X-Next-Cursor"]}
+    )
+    assert [t["title"] for t in next_page.json()] == ["Async 2"]
+
+    search_resp = async_client.get("/tasks/search", params={"title": "async"})
+    assert len(search_resp.json()) == 3
+
+
+def test_async_sparse_fieldsets(async_client):
+    async_client.post("/tasks/", json={"title": "Sparse", "description": "x" * 500})
+    resp = async_client.get("/tasks/?fields=id,title")
+    assert [list(task) for task in resp.json()] == [["title", "id"]]
+    search = async_client.get("/tasks/search?title=sparse&fields=status")
+    assert search.json() == [{"status": "to-do"}]
+
+
+def test_async_register_and_login(async_client):
+    email, password = "async@example.com", "Strong1!"
+    resp = async_client.post(
+        "/auth/register", json={"email": email, "password": password}
+    )
+    assert resp.status_code == 201
+
+    resp = async_client.post(
+        "/auth/register", json={"email": email, "password": password}
+    )
+    assert resp.status_code == 409
+
+    resp = async_client.post(
+        "/auth/token", data={"username": email, "password": password}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["token_type"] == "bearer"
+
+
+def test_async_current_user(async_client, test_user):
+    resp = async_client.get("/users/me")
+    assert resp.status_code == 200
+    assert resp.json()["email"] == test_user.email
+
+    resp = async_client.patch(
+        "/users/password",
+        json={"old_password": "WrongOld1!", "new_password": "NewStrong1@"},
+    )
+    assert resp.status_code == 400
+
+
+def test_async_invalid_token(async_client):
+    resp = async_client.get(
+        "/users/me", headers={"Authorization": "Bearer not-a-token"}
+    )
+    assert resp.status_code == 401
+
+
+def test_async_bulk_tasks(async_client):
+    resp = async_client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}, {}])
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert [t["title"] for t in data["items"]] == ["A", "B"]
+    assert [e["index"] for e in data["errors"]] == [2]
+    first, second = (t["id"] for t in data["items"])
+
+    resp = async_client.patch("/tasks/bulk", json=[{"id": first, "status": "done"}])
+    assert resp.json()["items"][0]["status"] == "done"
+
+    resp = async_client.request("DELETE", "/tasks/bulk", json={"ids": [first, second]})
+    assert resp.json() == {"deleted": [first, second], "errors": []}
+
+
+def test_async_task_changes(async_client, monkeypatch):
+    from app.crud import task_sync
+
+    monkeypatch.setattr(task_sync, "TASK_SYNC_LAG_SECONDS", 0)
+    task_id = async_client.post("/tasks/", json={"title": "Gone"}).json()["id"]
+    token = async_client.get("/tasks/changes").json()["sync_token"]
+    async_client.delete(f"/tasks/{task_id}")
+
+    resp = async_client.get("/tasks/changes", params={"since": token})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["tasks"] == []
+    assert resp.json()["deleted"] == [task_id]
+
+
+def test_async_archived_tasks(async_client, db_session):
+    from datetime import datetime, timedelta, timezone
+    from sqlalchemy import update
+    from app.crud.task_archive import archive_done_tasks
+    from app.models.models import Task
+
+    task = async_client.post("/tasks/", json={"title": "Old", "status": "done"}).json()
+    db_session.execute(
+        update(Task).values(updated_at=datetime.now(timezone.utc) - timedelta(days=365))
+    )
+    db_session.commit()
+    assert archive_done_tasks(db_session.get_bind()) == 1
+
+    assert [t["id"] for t in async_client.get("/tasks/").json()] == [task["id"]]
+    assert async_client.get(f"/tasks/{task['id']}").json()["title"] == "Old"
+    resp = async_client.put(f"/tasks/{task['id']}", json={"title": "Restored"})
+    assert resp.status_code == 200, resp.text
+    assert db_session.get(Task, (task["id"], task["owner_id"])).title == "Restored"
+
+
+def test_async_export(async_client):
+    async_client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}])
+    resp = async_client.get("/tasks/export?format=csv")
+    assert resp.status_code == 200
+    assert resp.text.splitlines()[0].startswith("id,title,")
+    assert len(resp.text.splitlines()) == 3
+
+
+def test_async_import(async_client):
+    body = b'{"title": "A"}\n{"title": "B"}\n{}\n'
+    resp = async_client.post("/tasks/import", files={"file": ("t.ndjson", body)})
+    assert resp.status_code == 200, resp.text
+    assert (resp.json()["imported"], resp.json()["rejected"]) == (2, 1)
+    assert len(async_client.get("/tasks/").json()) == 2
+
+
+def test_async_server_timing_reports_sql(async_client):
+    async_client.post("/tasks/", json={"title": "Timed"})
+    resp = async_client.get("/tasks/")
+    assert resp.status_code == 200
+    assert re.search(r'desc="[1-9]\d* queries"', resp.headers["server-timing"])
@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
     "email,password",
     [("user1@example.com", "StrongPass1!"), ("user2@example.com", "Another1@Pwd")],
 )
+@pytest.mark.query_budget(3)
 def test_register_user_success(client: TestClient, email, password):
     # Successful registration
     response = client.post(
@@ -17,6 +18,7 @@ def test_register_user_success(client: TestClient, email, password):
     assert "id" in data
 
 
+@pytest.mark.query_budget(3)
 def test_register_user_duplicate_email(client: TestClient):
     # Create first user
     client.post(
@@ -41,6 +43,7 @@ def test_register_user_duplicate_email(client: TestClient):
         "NoSpecial123",  # no special char
     ],
 )
+@pytest.mark.query_budget(0)
 def test_register_user_invalid_password(client: TestClient, password):
     response = client.post(
         "/auth/register", json={"email": "testpass@example.com", "password": password}
@@ -48,6 +51,7 @@ def test_register_user_invalid_password(client: TestClient, password):
     assert response.status_code == 422
 
 
+@pytest.mark.query_budget(3)
 def test_login_success(client: TestClient):
     email = "loginuser@example.com"
     password = "Strong1!"
@@ -65,6 +69,7 @@ def test_login_success(client: TestClient):
     assert data["token_type"] == "bearer"
 
 
+@pytest.mark.query_budget(3)
 def test_login_wrong_password(client: TestClient):
     email = "wrongpass@example.com"
     password = "Strong1!"
@@ -79,6 +84,7 @@ def test_login_wrong_password(client: TestClient):
     assert response.json()["detail"] == "Incorrect password"
 
 
+@pytest.mark.query_budget(1)
 def test_login_nonexistent_user(client: TestClient):
     response = client.post(
         "/auth/token",
@@ -87,3 +93,193 @@ def test_login_nonexistent_user(client: TestClient):
     )
     assert response.status_code == 404
     assert response.json()["detail"] == "User does not exist"
+
+
+@pytest.mark.query_budget(1)
+def test_password_hashing_overloaded(client, monkeypatch):
+    import threading
+    from app.auth import hash as password_hash
+
+    monkeypatch.setattr(password_hash, "_pending", threading.BoundedSemaphore(1))
+    password_hash._pending.acquire()  # every slot is busy
+
+    response = client.post(
+        "/auth/register", json={"email": "busy@example.com", "password": "Strong1!"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.query_budget(0)
+def test_password_change_hashing_overloaded(client, monkeypatch):
+    import threading
+    from app.auth import hash as password_hash
+
+    monkeypatch.setattr(password_hash, "_pending", threading.BoundedSemaphore(1))
+    password_hash._pending.acquire()  # every slot is busy
+
+    response = client.patch(
+        "/users/password",
+        json={"old_password": "Strong1!", "new_password": "NewStrong1@"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_sync_auth_handlers_await_bcrypt():
+    import inspect
+    from app.routers import auth, users
+
+    # A sync handler would hold a threadpool thread for the whole hash
+    assert inspect.iscoroutinefunction(auth.register_user)
+    assert inspect.iscoroutinefunction(auth.login_for_access_token)
+    assert inspect.iscoroutinefunction(users.update_password)
+
+
+# ---------- USER CACHE ----------
+
+
+def test_current_user_served_from_cache(db_session, test_user, count_queries):
+    from app.auth.jwt_handler import create_access_token, get_current_user
+    from app.auth.user_cache import user_cache
+
+    user_cache.clear()
+    token = create_access_token({"sub": str(test_user.id)})
+    hits = user_cache.hits
+
+    assert get_current_user(db=db_session, token=token).id == test_user.id
+    count_queries.clear()
+    user = get_current_user(db=db_session, token=token)
+
+    assert user.email == test_user.email
+    assert count_queries == []
+    assert user_cache.hits == hits + 1
+
+
+@pytest.mark.parametrize("stack", ["token_client", "async_client"])
+def test_token_requests_within_budget(request, stack, test_user, query_budget):
+    from app.auth.user_cache import user_cache
+
+    client = request.getfixturevalue(stack)
+    user_cache.clear()
+    # The first request loads the user, later ones are served from the cache
+    with query_budget(1):
+        assert client.get("/users/me").json()["id"] == test_user.id
+    with query_budget(0):
+        assert client.get("/users/me").status_code == 200
+    with query_budget(2):
+        assert client.get("/tasks/").status_code == 200
+
+    # A changed user is loaded again once
+    with query_budget(4):
+        client.patch("/users/email", json={"email": "budget@example.com"})
+    with query_budget(1):
+        assert client.get("/users/me").json()["email"] == "budget@example.com"
+    with query_budget(0):
+        client.get("/users/me")
+
+
+def test_user_cache_invalidated_on_update(db_session, test_user):
+    from app.auth.jwt_handler import create_access_token, get_current_user
+    from app.auth.user_cache import user_cache
+    from app.crud.user_crud import update_user_email
+
+    token = create_access_token({"sub": str(test_user.id)})
+    user = get_current_user(db=db_session, token=token)
+    update_user_email(db_session, user, "renamed@example.com")
+
+    assert user_cache.get(test_user.id) is None
+    assert get_current_user(db=db_session, token=token).email == ("renamed@example.com")
+
+
+def test_user_cache_skips_snapshot_read_before_update(db_session, test_user):
+    from sqlalchemy.orm import Session
+    from app.auth.user_cache import cache_user, user_cache, user_generation
+    from app.crud.user_crud import get_user_by_id, update_user_email
+
+    user_cache.clear()
+    # A request loads the user, then another changes them before it caches them
+    generation = user_generation(test_user.id)
+    stale = get_user_by_id(db_session, test_user.id)
+    with Session(db_session.get_bind()) as other:
+        user = get_user_by_id(other, test_user.id)
+        update_user_email(other, user, "raced@example.com")
+
+    cache_user(stale, generation)
+    assert stale.email != "raced@example.com"
+    assert user_cache.get(test_user.id) is None
+
+    fresh_generation = user_generation(test_user.id)
+    db_session.refresh(stale)
+    cache_user(stale, fresh_generation)
+    assert user_cache.get(test_user.id).email == "raced@example.com"
+
+
+def test_user_generations_bounded(monkeypatch):
+    from collections import OrderedDict
+    from app.auth import user_cache
+    from app.utils.cache import LRUCache
+
+    monkeypatch.setattr(user_cache, "user_cache", LRUCache(maxsize=2))
+    monkeypatch.setattr(user_cache, "_generations", OrderedDict())
+    monkeypatch.setattr(user_cache, "_last_generation", 0)
+    monkeypatch.setattr(user_cache, "_evicted_generation", 0)
+    before = user_cache.user_generation(1)
+    for user_id in (1, 2, 3):
+        user_cache.invalidate_user(user_id)
+    assert len(user_cache._generations) == 2
+    # User 1's generation was evicted, yet it still differs from the one read
+    assert user_cache.user_generation(1) != before
+
+
+def test_lru_cache_evicts_and_expires():
+    import time
+    from app.utils.cache import LRUCache
+
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("expired", 4, expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+    assert cache.stats()["evictions"] == 2
+
+
+# ---------- TOKEN CACHE ----------
+
+
+def test_decoded_token_cached_until_expiry(monkeypatch):
+    import time
+    from datetime import timedelta
+    from app.auth import jwt_handler
+
+    token = jwt_handler.create_access_token(
+        {"sub": "1"}, expires_delta=timedelta(minutes=5)
+    )
+    jwt_handler.decode_access_token(token)
+    hits = jwt_handler.token_cache.hits
+    assert jwt_handler.decode_access_token(token)["sub"] == "1"
+    assert jwt_handler.token_cache.hits == hits + 1
+
+    # Past "exp" the cached claims are dropped and the token is verified again
+    later = time.time() + 600
+    monkeypatch.setattr(time, "time", lambda: later)
+    key = jwt_handler._token_cache_key(token)
+    assert jwt_handler.token_cache.get(key) is None
+
+
+def test_token_cache_respects_key_rotation(monkeypatch):
+    from fastapi import HTTPException
+    from app.auth import jwt_handler
+
+    token = jwt_handler.create_access_token({"sub": "1"})
+    jwt_handler.decode_access_token(token)
+
+    monkeypatch.setattr(jwt_handler, "SECRET_KEY", "rotated-secret")
+    with pytest.raises(HTTPException) as exc_info:
+        jwt_handler.decode_access_token(token)
+    assert exc_info.value.detail == "Token is invalid"
@@ -0,0 +1,98 @@
+import re
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.db.pool import TimedQueuePool, pool_stats
+from app.utils.metrics import registry
+
+
+def test_pool_stats_track_saturation():
+    from conftest import TEST_DATABASE_URL
+
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    try:
+        conn = engine.connect()
+        stats = pool_stats(engine.pool)
+        assert stats["size"] == 1
+        assert stats["checked_out"] == 1
+        assert stats["checkouts"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        stats = pool_stats(engine.pool)
+        assert stats["timeouts"] == 1
+        assert stats["wait_seconds_max"] >= 0.1
+
+        conn.close()
+        assert pool_stats(engine.pool)["checked_out"] == 0
+    finally:
+        engine.dispose()
+
+
+def test_pool_stats_endpoint(client):
+    resp = client.get("/monitoring/pool")
+    assert resp.status_code == 200
+    data = resp.json()
+    for engine_stats in (data["sync"], data["async"]):
+        assert {"size", "checked_out", "overflow", "wait_seconds_total"} <= set(
+            engine_stats
+        )
+
+
+def test_server_timing_reports_sql(client):
+    client.post("/tasks/", json={"title": "Timed"})
+    resp = client.get("/tasks/")
+    assert resp.status_code == 200
+    timing = resp.headers["server-timing"]
+    assert re.search(r'db;dur=[\d.]+;desc="[1-9]\d* queries"', timing)
+    assert re.search(r"total;dur=[\d.]+", timing)
+
+
+def test_metrics_endpoint(client):
+    registry.reset()
+    client.post("/tasks/", json={"title": "Measured"})
+    client.get("/tasks/")
+    client.get("/tasks/")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/tasks/",status="200"} 2'
+        in body
+    )
+    assert 'http_request_db_queries_count{method="POST",route="/tasks/"} 1' in body
+    rows = re.search(
+        r'http_request_db_rows_total\{method="GET",route="/tasks/"\} (\d+)', body
+    )
+    assert rows and int(rows.group(1)) >= 2
+    assert re.search(
+        r'http_request_db_seconds_total\{method="GET",route="/tasks/"\} [\d.e-]+', body
+    )
+
+
+def test_metrics_label_unmatched_routes(client):
+    registry.reset()
+    client.get("/no-such-page")
+    assert 'route="unmatched",status="404"' in registry.render()
+
+
+def test_query_budget_reports_statements(db_session, query_budget):
+    with pytest.raises(pytest.fail.Exception, match="2 SQL statements, budget is 1"):
+        with query_budget(1):
+            db_session.execute(text("SELECT 1"))
+            db_session.execute(text("SELECT 2"))
+    db_session.rollback()
+
+    with query_budget(1) as statements:
+        db_session.execute(text("SELECT 1"))
+    assert statements == ["SELECT 1"]
+    db_session.rollback()
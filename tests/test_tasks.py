@@ -1,8 +1,9 @@
+import re
+
 import pytest
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from app.models.enums import TaskStatus, TaskPriority
 
-
 # ---------- COMMON FIXTURES ----------
 
 
@@ -43,6 +44,7 @@ def create_task(client):
 # ---------- CRUD TESTS ----------
 
 
+@pytest.mark.query_budget(4)
 def test_create_task(client, test_user, sample_task_data):
     response = client.post("/tasks/", json=sample_task_data)
     assert response.status_code == 200
@@ -51,6 +53,7 @@ def test_create_task(client, test_user, sample_task_data):
     assert data["owner_id"] == test_user.id
 
 
+@pytest.mark.query_budget(3)
 def test_get_task_by_id(client, create_task):
     created = create_task(title="Unique Task")
     task_id = created["id"]
@@ -62,6 +65,7 @@ def test_get_task_by_id(client, create_task):
     assert data["title"] == "Unique Task"
 
 
+@pytest.mark.query_budget(3)
 def test_update_task(client, create_task):
     created = create_task(title="To Update")
     task_id = created["id"]
@@ -78,6 +82,7 @@ def test_update_task(client, create_task):
     assert data["status"] == TaskStatus.IN_PROGRESS.value
 
 
+@pytest.mark.query_budget(4)
 def test_delete_task(client, create_task):
     created = create_task()
     task_id = created["id"]
@@ -89,9 +94,43 @@ def test_delete_task(client, create_task):
     assert get_resp.status_code == 404
 
 
+@pytest.mark.query_budget(3)
+def test_update_and_delete_missing_task(client):
+    resp = client.put("/tasks/999999", json={"title": "Ghost"})
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "Task not found"
+    assert client.delete("/tasks/999999").status_code == 404
+
+
+def test_update_and_delete_run_one_statement(db_session, test_user, count_queries):
+    from app.crud.task_crud import delete_task, update_task
+    from app.models.models import Task
+    from app.schemas.task import TaskUpdate
+
+    task = Task(title="Before", owner_id=test_user.id)
+    db_session.add(task)
+    db_session.commit()
+    task_id, owner_id, updated_at = task.id, test_user.id, task.updated_at
+    count_queries.clear()
+
+    updated = update_task(db_session, task_id, TaskUpdate(title="After"), owner_id)
+    assert updated.title == "After"
+    assert updated.updated_at > updated_at
+    assert len(count_queries) == 1
+    assert count_queries[0].startswith("UPDATE tasks")
+
+    count_queries.clear()
+    delete_task(db_session, task_id, owner_id)
+    assert len(count_queries) == 3
+    assert count_queries[0].startswith("DELETE FROM tasks")
+    assert count_queries[1].startswith("INSERT INTO task_stats")  # stats counter
+    assert count_queries[2].startswith("INSERT INTO task_deletions")  # tombstone
+
+
 # ---------- FILTERING / SEARCH ----------
 
 
+@pytest.mark.query_budget(3)
 def test_search_tasks(client, create_task):
     create_task(title="Find Me Task")
     resp = client.get("/tasks/search?title=Find")
@@ -101,6 +140,70 @@ def test_search_tasks(client, create_task):
     assert any(task["title"] == "Find Me Task" for task in results)
 
 
+@pytest.mark.query_budget(3)
+def test_search_tasks_substring(client, create_task):
+    create_task(title="Find Me Task")
+    resp = client.get("/tasks/search?title=ind")
+    assert resp.status_code == 200
+    assert [t["title"] for t in resp.json()] == ["Find Me Task"]
+
+
+@pytest.mark.query_budget(4)
+def test_search_tasks_ranked(client, create_task):
+    create_task(title="Quarterly report", description="report draft, final report")
+    create_task(title="Groceries", description="buy paper for the report")
+    create_task(title="Unrelated")
+
+    resp = client.get("/tasks/search", params={"title": "report"})
+    assert [t["title"] for t in resp.json()] == ["Quarterly report"]
+
+    resp = client.get("/tasks/search", params={"description": "report"})
+    assert [t["title"] for t in resp.json()] == ["Quarterly report", "Groceries"]
+
+
+@pytest.mark.query_budget(4)
+def test_search_tasks_pagination(client, create_task):
+    for i in range(5):
+        create_task(title=f"Search page {i}")
+
+    titles = []
+    params = {"title": "search page", "limit": 2}
+    while True:
+        resp = client.get("/tasks/search", params=params)
+        assert resp.status_code == 200
+        titles.extend(t["title"] for t in resp.json())
+        if "X-Next-Cursor" not in resp.headers:
+            break
+        params["cursor"] = resp.headers["X-Next-Cursor"]
+    assert sorted(titles) == [f"Search page {i}" for i in range(5)]
+
+
+def test_search_tasks_fallback_without_postgres():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.crud.task_search import search_tasks
+    from app.db.database import Base
+    from app.models.models import Task, User
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, email="lite@example.com", hashed_password="fake"))
+        session.add_all(
+            [
+                Task(id=1, title="Find Me Task", owner_id=1),
+                Task(id=2, title="Other", owner_id=1),
+            ]
+        )
+        session.commit()
+
+        tasks, next_cursor = search_tasks(session, owner_id=1, title="ind")
+    assert [t.title for t in tasks] == ["Find Me Task"]
+    assert next_cursor is None
+
+
+@pytest.mark.query_budget(3)
 def test_get_tasks_with_filters(client, create_task):
     create_task(priority=TaskPriority.HIGH.value, status=TaskStatus.TODO.value)
     resp = client.get(
@@ -113,6 +216,7 @@ def test_get_tasks_with_filters(client, create_task):
     assert all(task["status"] == "to-do" for task in tasks)
 
 
+@pytest.mark.query_budget(4)
 def test_filter_by_deadline_before(client, create_task):
     now = datetime.now(timezone.utc)
     create_task(
@@ -129,6 +233,7 @@ def test_filter_by_deadline_before(client, create_task):
     assert any(t["title"] == "Deadline Task" for t in tasks)
 
 
+@pytest.mark.query_budget(4)
 def test_filter_by_deadline_after(client, create_task):
     now = datetime.now(timezone.utc)
     create_task(
@@ -143,6 +248,7 @@ def test_filter_by_deadline_after(client, create_task):
     assert any(t["title"] == "Future Task" for t in tasks)
 
 
+@pytest.mark.query_budget(5)
 def test_order_by_deadline_desc(client, create_task):
     now = datetime.now(timezone.utc)
     create_task(title="Soon", deadline=(now + timedelta(days=1)).isoformat())
@@ -155,6 +261,7 @@ def test_order_by_deadline_desc(client, create_task):
     assert tasks[0]["title"] == "Later"
 
 
+@pytest.mark.query_budget(4)
 def test_pagination_limit_offset(client, create_task):
     for i in range(5):
         create_task(title=f"Task {i}")
@@ -166,6 +273,149 @@ def test_pagination_limit_offset(client, create_task):
     assert tasks[0]["title"] == "Task 2"
 
 
+def collect_pages(client, **params):
+    """Follow X-Next-Cursor until the last page and return all task titles."""
+    titles = []
+    params = {"limit": 2, **params}
+    while True:
+        resp = client.get("/tasks/", params=params)
+        assert resp.status_code == 200, resp.text
+        titles.extend(t["title"] for t in resp.json())
+        next_cursor = resp.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            return titles
+        params["cursor"] = next_cursor
+
+
+@pytest.mark.parametrize("order_dir", ["asc", "desc"])
+@pytest.mark.query_budget(4)
+def test_cursor_pagination_created_at(client, create_task, order_dir):
+    for i in range(5):
+        create_task(title=f"Task {i}")
+
+    titles = collect_pages(client, order_by="created_at", order_dir=order_dir)
+    expected = [f"Task {i}" for i in range(5)]
+    assert titles == (expected if order_dir == "asc" else expected[::-1])
+
+
+@pytest.mark.parametrize("order_dir", ["asc", "desc"])
+@pytest.mark.query_budget(5)
+def test_cursor_pagination_deadline_with_nulls(client, create_task, order_dir):
+    now = datetime.now(timezone.utc)
+    create_task(title="No deadline 1")
+    create_task(title="Day 2", deadline=(now + timedelta(days=2)).isoformat())
+    create_task(title="No deadline 2")
+    create_task(title="Day 1", deadline=(now + timedelta(days=1)).isoformat())
+    create_task(title="Day 3", deadline=(now + timedelta(days=3)).isoformat())
+
+    titles = collect_pages(client, order_by="deadline", order_dir=order_dir)
+    if order_dir == "asc":
+        assert titles == ["Day 1", "Day 2", "Day 3", "No deadline 1", "No deadline 2"]
+    else:
+        assert titles == ["No deadline 2", "No deadline 1", "Day 3", "Day 2", "Day 1"]
+
+
+@pytest.mark.query_budget(4)
+def test_cursor_pagination_stable_under_inserts(client, create_task):
+    for i in range(4):
+        create_task(title=f"Task {i}")
+
+    first = client.get("/tasks/", params={"limit": 2, "order_dir": "asc"})
+    create_task(title="Inserted later")
+    second = client.get(
+        "/tasks/",
+        params={
+            "limit": 2,
+            "order_dir": "asc",
+            "cursor": first.headers["X-Next-Cursor"],
+        },
+    )
+    assert [t["title"] for t in second.json()] == ["Task 2", "Task 3"]
+
+
+@pytest.mark.query_budget(1)
+def test_cursor_invalid(client):
+    resp = client.get("/tasks/", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.query_budget(4)
+def test_cursor_ordering_mismatch(client, create_task):
+    for i in range(3):
+        create_task(title=f"Task {i}")
+    first = client.get("/tasks/", params={"limit": 2, "order_by": "created_at"})
+    resp = client.get(
+        "/tasks/",
+        params={"order_by": "deadline", "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.query_budget(5)
+def test_fast_json_matches_response_model(client, create_task, monkeypatch):
+    from app.crud import task_list_cache
+    from app.crud.task_crud import TASK_RESPONSE_COLUMNS
+    from app.routers import task_common
+    from app.schemas.task import TaskResponse
+
+    # Each mode must render the page itself
+    monkeypatch.setattr(task_list_cache, "TASK_LIST_CACHE_BYTES", 0)
+
+    assert [c.key for c in TASK_RESPONSE_COLUMNS] == list(TaskResponse.model_fields)
+    create_task(title="Escapes </>", description='quotes " and \\ slashes')
+    create_task(title="Deadline", deadline="2030-01-01T12:30:00.123456+02:00")
+    create_task(title="Whole seconds", deadline="2030-01-01T00:00:00Z", status="done")
+
+    monkeypatch.setattr(task_common, "FAST_JSON", True)
+    fast = client.get("/tasks/?limit=2")
+    monkeypatch.setattr(task_common, "FAST_JSON", False)
+    slow = client.get("/tasks/?limit=2")
+
+    assert fast.content == slow.content
+    assert fast.headers["content-type"] == slow.headers["content-type"]
+    assert fast.headers["X-Next-Cursor"] == slow.headers["X-Next-Cursor"]
+    assert fast.headers["ETag"] == slow.headers["ETag"]
+
+
+@pytest.mark.query_budget(5)
+def test_sparse_fieldsets(client, create_task, count_queries, monkeypatch):
+    from app.crud import task_list_cache
+    from app.routers import task_common
+
+    create_task(title="First", description="Long text " * 50, priority="high")
+    create_task(title="Second", deadline="2030-01-01T00:00:00Z")
+
+    count_queries.clear()
+    page = client.get("/tasks/?fields=title,id,status&limit=1")
+    assert page.status_code == 200
+    assert list(page.json()[0]) == ["title", "status", "id"]
+    assert page.json()[0]["title"] == "First"
+    listing = next(q for q in count_queries if q.startswith("SELECT all_tasks.title"))
+    assert "all_tasks.description" not in listing
+
+    # The cursor still works although created_at is not returned
+    cursor = page.headers["X-Next-Cursor"]
+    rest = client.get(f"/tasks/?fields=title,id,status&limit=1&cursor={cursor}")
+    assert [t["title"] for t in rest.json()] == ["Second"]
+
+    monkeypatch.setattr(task_list_cache, "TASK_LIST_CACHE_BYTES", 0)
+    monkeypatch.setattr(task_common, "FAST_JSON", False)
+    slow = client.get("/tasks/?fields=title,id,status,deadline&limit=5")
+    monkeypatch.setattr(task_common, "FAST_JSON", True)
+    fast = client.get("/tasks/?fields=title,id,status,deadline&limit=5")
+    assert fast.content == slow.content
+    assert fast.json()[1]["deadline"] == "2030-01-01T00:00:00Z"
+
+    search = client.get("/tasks/search?title=second&fields=id,title")
+    assert search.json() == [{"title": "Second", "id": rest.json()[0]["id"]}]
+
+    resp = client.get("/tasks/?fields=title,secret")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Unknown task fields: secret"
+    assert client.get("/tasks/search?title=x&fields=,").status_code == 400
+
+
+@pytest.mark.query_budget(3)
 def test_show_completed_false(client, create_task):
     create_task(title="Completed Task", status=TaskStatus.DONE.value)
     resp = client.get("/tasks/?show_completed=false")
@@ -174,14 +424,503 @@ def test_show_completed_false(client, create_task):
     assert all(t["status"] != "done" for t in tasks)
 
 
+@pytest.mark.query_budget(0)
 def test_invalid_enum_filter(client):
     resp = client.get("/tasks/?priority=INVALID")
     assert resp.status_code == 422
 
 
+# ---------- CONDITIONAL GET ----------
+
+
+@pytest.mark.query_budget(3)
+def test_task_list_etag(client, create_task, count_queries):
+    task = create_task(title="Cached")
+    first = client.get("/tasks/?limit=10")
+    etag = first.headers["ETag"]
+    assert client.get("/tasks/?limit=10").headers["ETag"] == etag
+
+    count_queries.clear()
+    resp = client.get("/tasks/?limit=10", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+    assert resp.content == b""
+    assert not any(q.startswith("SELECT tasks.id") for q in count_queries)
+
+    # Another query, an update, a create and a delete all change the tag
+    assert client.get("/tasks/?limit=5").headers["ETag"] != etag
+    client.put(f"/tasks/{task['id']}", json={"title": "Changed"})
+    updated = client.get("/tasks/?limit=10", headers={"If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()[0]["title"] == "Changed"
+    etag = updated.headers["ETag"]
+
+    other = create_task(title="New")
+    created = client.get("/tasks/?limit=10", headers={"If-None-Match": etag})
+    assert created.status_code == 200
+    etag = created.headers["ETag"]
+
+    client.delete(f"/tasks/{other['id']}")
+    deleted = client.get("/tasks/?limit=10", headers={"If-None-Match": etag})
+    assert deleted.status_code == 200
+
+
+@pytest.mark.query_budget(3)
+def test_task_etag(client, create_task):
+    task = create_task(title="Single")
+    etag = client.get(f"/tasks/{task['id']}").headers["ETag"]
+
+    resp = client.get(f"/tasks/{task['id']}", headers={"If-None-Match": f"W/{etag}"})
+    assert resp.status_code == 304
+
+    client.put(f"/tasks/{task['id']}", json={"status": "done"})
+    resp = client.get(f"/tasks/{task['id']}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "done"
+    assert resp.headers["ETag"] != etag
+
+
+# ---------- LIST CACHE ----------
+
+
+@pytest.mark.parametrize("fast_json", [True, False])
+@pytest.mark.query_budget(4)
+def test_task_list_cache(client, create_task, query_budget, monkeypatch, fast_json):
+    from app.routers import task_common
+
+    # The cache keeps the page whichever serializer rendered it
+    monkeypatch.setattr(task_common, "FAST_JSON", fast_json)
+    task = create_task(title="Cached")
+    first = client.get("/tasks/?limit=10&status=to-do")
+    assert [t["title"] for t in first.json()] == ["Cached"]
+
+    # Same filters, spelled differently: served without touching the DB
+    with query_budget(0):
+        again = client.get("/tasks/?status=to-do&limit=10")
+        not_modified = client.get(
+            "/tasks/?limit=10&status=to-do",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+    assert again.content == first.content
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert not_modified.status_code == 304
+
+    # Every kind of write retires the cached pages of that user
+    client.put(f"/tasks/{task['id']}", json={"title": "Renamed"})
+    assert client.get("/tasks/?limit=10").json()[0]["title"] == "Renamed"
+    create_task(title="Second")
+    assert len(client.get("/tasks/?limit=10").json()) == 2
+    client.request("DELETE", "/tasks/bulk", json={"ids": [task["id"]]})
+    assert [t["title"] for t in client.get("/tasks/?limit=10").json()] == ["Second"]
+
+
+def test_memory_cache_backend_bounded_by_bytes():
+    from app.utils.response_cache import MemoryCacheBackend, VersionedCache
+
+    cache = VersionedCache(MemoryCacheBackend(max_bytes=10), prefix="t")
+    cache.set(1, cache.version(1), "a", b"12345")
+    cache.set(1, cache.version(1), "b", b"12345")
+    assert cache.get(1, 0, "a") == b"12345"
+    cache.set(1, 0, "c", b"123")  # evicts "b", the least recently used
+    assert cache.get(1, 0, "b") is None
+    assert cache.backend.stats()["bytes"] == 8
+    cache.set(1, 0, "big", b"x" * 11)  # larger than the whole cache
+    assert cache.get(1, 0, "big") is None
+
+    cache.bump(1)
+    assert cache.version(1) == 1
+    assert cache.get(1, cache.version(1), "a") is None
+    assert cache.version(2) == 0
+
+
+def test_memory_cache_backend_bounds_versions():
+    from app.utils.response_cache import (
+        CacheBackend,
+        MemoryCacheBackend,
+        VersionedCache,
+    )
+
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+    cache = VersionedCache(
+        MemoryCacheBackend(max_bytes=100, max_versions=2), prefix="t"
+    )
+    cache.bump(1)
+    cache.set(1, cache.version(1), "a", b"old")
+    cache.bump(1)
+    cache.bump(2)
+    cache.bump(3)  # evicts the version of user 1, the least recently bumped
+    assert cache.backend.stats()["versions"] == 2
+    # User 1 never returns to a version it already retired
+    assert cache.version(1) == 4
+    assert cache.get(1, cache.version(1), "a") is None
+    assert cache.version(2) == 3
+
+
+# ---------- EXPORT ----------
+
+
+@pytest.mark.query_budget(4)
+def test_export_ndjson_matches_list(client, create_task):
+    import json
+
+    create_task(title="One", deadline="2030-01-01T00:00:00Z", priority="high")
+    create_task(title="Two", description='Quotes " and, commas')
+    create_task(title="Done", status="done")
+
+    resp = client.get("/tasks/export?show_completed=false")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in resp.text.splitlines()]
+    listed = client.get("/tasks/?show_completed=false").json()
+    assert exported == listed
+
+
+@pytest.mark.query_budget(4)
+def test_export_csv(client, create_task):
+    import csv
+
+    create_task(title="One")
+    create_task(title="Two", description='Quotes " and, commas')
+
+    resp = client.get("/tasks/export?format=csv&order_dir=desc")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="tasks.csv"' in resp.headers["content-disposition"]
+    rows = list(csv.DictReader(resp.text.splitlines()))
+    assert [row["title"] for row in rows] == ["Two", "One"]
+    assert rows[0]["description"] == 'Quotes " and, commas'
+    assert rows[0]["status"] == "to-do"
+
+    assert client.get("/tasks/export?format=xml").status_code == 422
+
+
+def test_export_streams_in_batches(db_session, test_user, monkeypatch):
+    from app.crud import task_export
+    from app.models.models import Task
+
+    db_session.add_all(Task(title=f"Task {i}", owner_id=test_user.id) for i in range(5))
+    db_session.commit()
+    monkeypatch.setattr(task_export, "EXPORT_BATCH_SIZE", 2)
+
+    chunks = list(
+        task_export.iter_tasks_export(db_session.get_bind(), test_user.id, "ndjson")
+    )
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+
+
+# ---------- IMPORT ----------
+
+
+@pytest.mark.query_budget(2)
+def test_import_ndjson(client, test_user):
+    lines = [
+        '{"title": "First", "priority": "high"}',
+        "",
+        '{"title": "Tab\\tand\\nnewline", "description": "back\\\\slash"}',
+        "not json",
+        '{"title": "Done", "status": "done", "deadline": "2030-01-01T00:00:00Z"}',
+        '{"status": "done"}',
+    ]
+    resp = client.post(
+        "/tasks/import",
+        files={"file": ("tasks.ndjson", "\n".join(lines).encode())},
+    )
+    assert resp.status_code == 200, resp.text
+    report = resp.json()
+    assert report["imported"] == 3
+    assert report["rejected"] == 2
+    assert [e["line"] for e in report["errors"]] == [4, 6]
+    assert report["errors"][0]["detail"] == "Invalid JSON"
+
+    tasks = client.get("/tasks/?order_by=created_at").json()
+    by_title = {t["title"]: t for t in tasks}
+    assert set(by_title) == {"First", "Tab\tand\nnewline", "Done"}
+    assert by_title["First"]["priority"] == "high"
+    assert by_title["First"]["status"] == "to-do"
+    assert by_title["Tab\tand\nnewline"]["description"] == "back\\slash"
+    assert by_title["Done"]["deadline"].startswith("2030-01-01T00:00:00")
+    assert all(t["owner_id"] == test_user.id for t in tasks)
+
+
+@pytest.mark.query_budget(2)
+def test_import_csv_in_batches(client, monkeypatch):
+    from app.crud import task_import
+
+    monkeypatch.setattr(task_import, "IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(task_import, "IMPORT_MAX_REPORTED_ERRORS", 1)
+    body = "title,description,status,priority\n"
+    body += "".join(f"Task {i},,,low\n" for i in range(5))
+    body += ",missing title,,\nBad,,,urgent\n"
+
+    resp = client.post("/tasks/import", files={"file": ("tasks.csv", body.encode())})
+    report = resp.json()
+    assert report["imported"] == 5
+    assert report["rejected"] == 2
+    assert [e["line"] for e in report["errors"]] == [7]
+
+    tasks = client.get("/tasks/").json()
+    assert len(tasks) == 5
+    assert all(t["priority"] == "low" and t["description"] is None for t in tasks)
+
+
+def test_import_cli(db_session, test_user, tmp_path, capsys, monkeypatch):
+    import json
+    from sqlalchemy.orm import sessionmaker
+    from app import cli
+    from app.models.models import Task
+
+    monkeypatch.setattr(cli, "engine", db_session.get_bind())
+    monkeypatch.setattr(cli, "SessionLocal", sessionmaker(db_session.get_bind()))
+    path = tmp_path / "tasks.csv"
+    path.write_text("title,priority\nFrom CLI,medium\n")
+
+    assert cli.main(["import-tasks", str(path), "--user-id", str(test_user.id)]) == 0
+    assert json.loads(capsys.readouterr().out)["imported"] == 1
+    task = db_session.query(Task).one()
+    assert (task.title, task.priority.value) == ("From CLI", "medium")
+
+
+# ---------- STATS ----------
+
+
+def expected_stats(tasks):
+    """Compute /tasks/stats from a full task listing."""
+    now = datetime.now(timezone.utc)
+    by_status = {status.value: 0 for status in TaskStatus}
+    by_priority = {priority.value: 0 for priority in TaskPriority}
+    for task in tasks:
+        by_status[task["status"]] += 1
+        by_priority[task["priority"]] += 1
+    overdue = sum(
+        1
+        for task in tasks
+        if task["deadline"]
+        and task["status"] != "done"
+        and datetime.fromisoformat(task["deadline"]) < now
+    )
+    return {
+        "total": len(tasks),
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "overdue": overdue,
+    }
+
+
+@pytest.mark.query_budget(7)
+def test_task_stats_follow_every_write(client, create_task, count_queries):
+    now = datetime.now(timezone.utc)
+    last_week = (now - timedelta(days=7)).isoformat()
+    a_minute_ago = (now - timedelta(minutes=1)).isoformat()
+    tomorrow = (now + timedelta(days=1)).isoformat()
+
+    first = create_task(title="A", priority="high", deadline=last_week)
+    second = create_task(title="B", deadline=tomorrow)
+    third = create_task(title="C", status="done", deadline=last_week)
+    fourth = create_task(title="D", deadline=a_minute_ago)
+    client.put(
+        f"/tasks/{second['id']}", json={"deadline": last_week, "priority": "low"}
+    )
+    client.put(f"/tasks/{fourth['id']}", json={"title": "D2"})
+    created = client.post(
+        "/tasks/bulk",
+        json=[{"title": "E", "priority": "high"}, {"title": "F", "deadline": tomorrow}],
+    ).json()["items"]
+    client.patch(
+        "/tasks/bulk",
+        json=[
+            {"id": first["id"], "status": "done"},
+            {"id": created[1]["id"], "deadline": a_minute_ago, "priority": "medium"},
+        ],
+    )
+    client.request("DELETE", "/tasks/bulk", json={"ids": [third["id"]]})
+    client.delete(f"/tasks/{created[0]['id']}")
+    body = f'{{"title": "G", "status": "in_progress", "deadline": "{last_week}"}}\n'
+    client.post("/tasks/import", files={"file": ("tasks.ndjson", body.encode())})
+
+    count_queries.clear()
+    stats = client.get("/tasks/stats")
+    assert stats.status_code == 200
+    assert len(count_queries) == 2
+    assert stats.json() == expected_stats(client.get("/tasks/").json())
+    assert stats.json()["overdue"] == 4
+
+
+@pytest.mark.query_budget(4)
+def test_rebuild_task_stats(
+    client, create_task, archive_tasks, db_session, test_user, capsys, monkeypatch
+):
+    from sqlalchemy.orm import sessionmaker
+    from app import cli
+    from app.models.models import TaskStat
+
+    create_task(title="A", priority="high")
+    done = create_task(title="B", status="done")
+    before = client.get("/tasks/stats").json()
+
+    db_session.query(TaskStat).update({TaskStat.count: 42})
+    db_session.commit()
+    assert client.get("/tasks/stats").json() != before
+
+    monkeypatch.setattr(cli, "SessionLocal", sessionmaker(db_session.get_bind()))
+    assert cli.main(["rebuild-stats", "--user-id", str(test_user.id)]) == 0
+    assert "user" in capsys.readouterr().out
+    assert client.get("/tasks/stats").json() == before
+
+    # Archived tasks are still counted
+    archive_tasks(done["id"])
+    db_session.query(TaskStat).update({TaskStat.count: 42})
+    db_session.commit()
+    assert cli.main(["rebuild-stats", "--user-id", str(test_user.id)]) == 0
+    assert client.get("/tasks/stats").json() == before
+
+
+@pytest.mark.query_budget(4)
+def test_naive_deadlines_are_stored_as_utc(client, create_task, db_session, test_user):
+    from sqlalchemy import select, text
+    from app.crud.task_stats import rebuild_task_stats
+    from app.models.models import TaskDueDay
+
+    def due_days():
+        return db_session.execute(
+            select(TaskDueDay.due_date, TaskDueDay.count).where(
+                TaskDueDay.owner_id == test_user.id, TaskDueDay.count != 0
+            )
+        ).all()
+
+    db_session.execute(text("SET TIME ZONE 'Asia/Tokyo'"))
+    try:
+        task = create_task(title="A", deadline="2030-01-01T05:00:00")
+        client.put(f"/tasks/{task['id']}", json={"deadline": "2030-01-02T05:00:00"})
+        recorded = due_days()
+        rebuild_task_stats(db_session, test_user.id)
+        assert due_days() == recorded == [(date(2030, 1, 2), 1)]
+    finally:
+        db_session.execute(text("RESET TIME ZONE"))
+
+
+# ---------- BULK ----------
+
+
+@pytest.fixture
+def other_users_task(db_session):
+    """A task owned by someone other than the authenticated user."""
+    from app.models.models import Task, User
+
+    other_user = User(email="bulk-other@example.com", hashed_password="fake")
+    db_session.add(other_user)
+    db_session.commit()
+    task = Task(title="Not yours", owner_id=other_user.id)
+    db_session.add(task)
+    db_session.commit()
+    return task.id
+
+
+@pytest.mark.query_budget(2)
+def test_bulk_create_tasks(client, test_user, count_queries):
+    payload = [
+        {"title": "First", "priority": "high"},
+        {"title": "x" * 101},
+        {"title": "Third", "status": "done", "deadline": "2030-01-01T00:00:00Z"},
+        "not a task",
+    ]
+    resp = client.post("/tasks/bulk", json=payload)
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+
+    assert [t["title"] for t in data["items"]] == ["First", "Third"]
+    assert data["items"][0]["status"] == "to-do"
+    assert data["items"][0]["priority"] == "high"
+    assert data["items"][1]["status"] == "done"
+    assert all(t["owner_id"] == test_user.id for t in data["items"])
+    assert [(e["index"], e["status_code"]) for e in data["errors"]] == [
+        (1, 422),
+        (3, 422),
+    ]
+    inserts = [q for q in count_queries if q.startswith("INSERT INTO tasks")]
+    assert len(inserts) == 1
+    assert len(client.get("/tasks/").json()) == 2
+
+
+@pytest.mark.query_budget(8)
+def test_bulk_update_tasks(client, create_task, other_users_task, count_queries):
+    first = create_task(title="First")
+    second = create_task(title="Second")
+    third = create_task(title="Third")
+    fourth = create_task(title="Fourth")
+    count_queries.clear()
+
+    payload = [
+        {"id": third["id"], "status": "done"},
+        {"id": first["id"], "status": "in_progress"},
+        {"id": second["id"], "title": "Renamed", "priority": "critical"},
+        {"id": other_users_task, "title": "Stolen"},
+        {"id": 999999, "title": "Ghost"},
+        {"id": first["id"], "title": "Twice"},
+        {"id": fourth["id"], "title": None},
+        {"title": "No id"},
+    ]
+    resp = client.patch("/tasks/bulk", json=payload)
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+
+    assert [(t["id"], t["status"]) for t in data["items"]] == [
+        (third["id"], "done"),
+        (first["id"], "in_progress"),
+        (second["id"], "to-do"),
+    ]
+    assert data["items"][2]["title"] == "Renamed"
+    assert data["items"][2]["priority"] == "critical"
+    assert [(e["index"], e["status_code"]) for e in data["errors"]] == [
+        (3, 403),
+        (4, 404),
+        (5, 409),
+        (6, 422),
+        (7, 422),
+    ]
+    assert data["errors"][0]["detail"] == "Not allowed to update this task"
+    # One UPDATE per distinct set of changed columns
+    updates = [q for q in count_queries if q.startswith("UPDATE tasks")]
+    assert len(updates) == 3
+    assert client.get(f"/tasks/{first['id']}").json()["title"] == "First"
+
+
+@pytest.mark.query_budget(6)
+def test_bulk_delete_tasks(client, create_task, other_users_task):
+    first = create_task(title="First")
+    second = create_task(title="Second")
+
+    ids = [first["id"], other_users_task, second["id"], 999999, first["id"]]
+    resp = client.request("DELETE", "/tasks/bulk", json={"ids": ids})
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+
+    assert data["deleted"] == [first["id"], second["id"]]
+    assert [(e["index"], e["status_code"]) for e in data["errors"]] == [
+        (1, 403),
+        (3, 404),
+        (4, 409),
+    ]
+    assert client.get("/tasks/").json() == []
+    assert client.get(f"/tasks/{other_users_task}").status_code == 403
+
+
+@pytest.mark.query_budget(2)
+def test_bulk_request_too_large(client, monkeypatch):
+    from app.crud import task_bulk
+
+    monkeypatch.setattr(task_bulk, "TASK_BULK_MAX_ITEMS", 2)
+    resp = client.post("/tasks/bulk", json=[{"title": str(i)} for i in range(3)])
+    assert resp.status_code == 413
+    assert client.get("/tasks/").json() == []
+
+
 # ---------- PERMISSIONS ----------
 
 
+# The task is looked up for the user, then in the archive, then by id alone
+@pytest.mark.query_budget(4)
 def test_forbidden_get_other_users_task(client, db_session):
     from app.models.models import Task, User
 
@@ -209,6 +948,7 @@ def test_forbidden_get_other_users_task(client, db_session):
     assert response.json()["detail"] == "Not allowed to access this task"
 
 
+@pytest.mark.query_budget(4)
 def test_forbidden_update_other_users_task(client, db_session):
     from app.models.models import Task, User
 
@@ -238,6 +978,7 @@ def test_forbidden_update_other_users_task(client, db_session):
     assert response.json()["detail"] == "Not allowed to update this task"
 
 
+@pytest.mark.query_budget(4)
 def test_forbidden_delete_other_users_task(client, db_session):
     from app.models.models import Task, User
 
@@ -265,3 +1006,632 @@ def test_forbidden_delete_other_users_task(client, db_session):
     response = client.delete(f"/tasks/{task.id}")
     assert response.status_code == 403
     assert response.json()["detail"] == "Not allowed to delete this task"
+
+
+# ---------- REMINDERS ----------
+
+
+def add_task(db_session, owner_id, title, deadline, status=TaskStatus.TODO):
+    from app.models.models import Task
+
+    task = Task(title=title, deadline=deadline, status=status, owner_id=owner_id)
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def test_scan_due_tasks(db_session, test_user):
+    from app.crud.task_reminders import scan_due_tasks
+    from app.models.models import User
+
+    other_user = User(email="reminded@example.com", hashed_password="fake")
+    db_session.add(other_user)
+    db_session.commit()
+
+    now = datetime.now(timezone.utc)
+    owner = test_user.id
+    soon = add_task(db_session, owner, "Soon", now + timedelta(minutes=30))
+    add_task(db_session, owner, "Late", now - timedelta(hours=2))
+    add_task(db_session, owner, "Done", now - timedelta(hours=1), TaskStatus.DONE)
+    add_task(db_session, owner, "Later", now + timedelta(days=3))
+    add_task(db_session, owner, "Long ago", now - timedelta(days=30))
+    add_task(db_session, other_user.id, "Other", now + timedelta(minutes=1))
+
+    batches = []
+    bind = db_session.get_bind()
+    assert scan_due_tasks(bind, batches.append, now=now, batch_size=1) == 3
+    sent = [(r["kind"], r["title"]) for batch in batches for r in batch]
+    assert sent == [("overdue", "Late"), ("due_soon", "Other"), ("due_soon", "Soon")]
+    assert all(len(batch) == 1 for batch in batches)
+
+    # Claimed reminders are not sent again, until the deadline moves
+    assert scan_due_tasks(bind, batches.append, now=now) == 0
+    soon.deadline = now + timedelta(minutes=45)
+    db_session.commit()
+    batches.clear()
+    assert scan_due_tasks(bind, batches.append, now=now) == 1
+    assert batches[0][0]["task_id"] == soon.id
+
+
+def test_scan_due_tasks_retries_after_sink_failure(db_session, test_user):
+    from app.crud.task_reminders import scan_due_tasks
+
+    now = datetime.now(timezone.utc)
+    add_task(db_session, test_user.id, "Soon", now + timedelta(minutes=5))
+
+    def broken_sink(reminders):
+        raise RuntimeError("mail server down")
+
+    with pytest.raises(RuntimeError):
+        scan_due_tasks(db_session.get_bind(), broken_sink, now=now)
+    batches = []
+    assert scan_due_tasks(db_session.get_bind(), batches.append, now=now) == 1
+
+
+def test_scan_due_tasks_skips_locked_rows(db_session, test_user):
+    from sqlalchemy import text
+    from app.crud.task_reminders import scan_due_tasks
+
+    now = datetime.now(timezone.utc)
+    locked = add_task(db_session, test_user.id, "Locked", now + timedelta(minutes=5))
+    add_task(db_session, test_user.id, "Free", now + timedelta(minutes=10))
+    bind = db_session.get_bind()
+
+    # Another replica holds the row: this scan takes the rest without waiting
+    with bind.connect() as replica:
+        replica.execute(
+            text("SELECT id FROM tasks WHERE id = :id FOR UPDATE"), {"id": locked.id}
+        )
+        batches = []
+        assert scan_due_tasks(bind, batches.append, now=now) == 1
+        assert batches[0][0]["title"] == "Free"
+        replica.rollback()
+
+    assert scan_due_tasks(bind, batches.append, now=now) == 1
+    assert batches[-1][0]["title"] == "Locked"
+
+
+def test_scan_reminders_cli(db_session, test_user, capsys, monkeypatch):
+    from app import cli
+
+    monkeypatch.setattr(cli, "engine", db_session.get_bind())
+    now = datetime.now(timezone.utc)
+    add_task(db_session, test_user.id, "Soon", now + timedelta(minutes=5))
+
+    sink = "app.crud.task_reminders:log_reminders"
+    assert cli.main(["scan-reminders", "--once", "--sink", sink]) == 0
+    assert capsys.readouterr().out == "Sent 1 task reminders\n"
+
+
+# ---------- ARCHIVE ----------
+
+
+@pytest.fixture
+def archive_tasks(db_session):
+    """Age the given tasks and run the archiver; returns how many it moved."""
+    from sqlalchemy import update
+    from app.crud.task_archive import archive_done_tasks
+    from app.models.models import Task
+
+    def _archive(*task_ids, batch_size=1000):
+        long_ago = datetime.now(timezone.utc) - timedelta(days=365)
+        db_session.execute(
+            update(Task).where(Task.id.in_(task_ids)).values(updated_at=long_ago)
+        )
+        db_session.commit()
+        return archive_done_tasks(db_session.get_bind(), batch_size=batch_size)
+
+    return _archive
+
+
+@pytest.mark.query_budget(4)
+def test_archive_done_tasks(client, create_task, archive_tasks, db_session):
+    from app.models.models import Task, TaskArchive
+
+    old_done = create_task(title="Old done", status="done")
+    old_open = create_task(title="Old open")
+    other_done = create_task(title="Other done", status="done")
+    recent_done = create_task(title="Recent done", status="done")
+    listing = client.get("/tasks/?order_by=created_at&order_dir=asc").json()
+    stats = client.get("/tasks/stats").json()
+
+    assert (
+        archive_tasks(old_done["id"], old_open["id"], other_done["id"], batch_size=1)
+        == 2
+    )
+    assert {task.title for task in db_session.query(TaskArchive)} == {
+        "Old done",
+        "Other done",
+    }
+    assert [task.title for task in db_session.query(Task).order_by(Task.id)] == [
+        "Old open",
+        "Recent done",
+    ]
+
+    # Reads that can show completed tasks look in the archive too
+    response = client.get("/tasks/?order_by=created_at&order_dir=asc")
+    assert [t["id"] for t in response.json()] == [t["id"] for t in listing]
+    response = client.get("/tasks/?status=done&limit=1")
+    assert [t["title"] for t in response.json()] == ["Old done"]
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(f"/tasks/?status=done&limit=1&cursor={cursor}")
+    assert [t["title"] for t in response.json()] == ["Other done"]
+    response = client.get("/tasks/?show_completed=false")
+    assert [t["title"] for t in response.json()] == ["Old open"]
+    assert client.get(f"/tasks/{old_done['id']}").json()["title"] == "Old done"
+    assert [t["title"] for t in client.get("/tasks/search?title=Other").json()] == [
+        "Other done"
+    ]
+    assert len(client.get("/tasks/changes").json()["tasks"]) == 4
+    assert client.get("/tasks/stats").json() == stats
+
+
+@pytest.mark.query_budget(6)
+def test_archived_task_list_skips_archive_when_not_needed(
+    client, create_task, archive_tasks, count_queries
+):
+    archive_tasks(create_task(title="Done", status="done")["id"])
+    count_queries.clear()
+    client.get("/tasks/?status=to-do")
+    client.get("/tasks/?show_completed=false")
+    assert not any("tasks_archive" in query for query in count_queries)
+    client.get("/tasks/?status=done")
+    assert any("tasks_archive" in query for query in count_queries)
+
+
+@pytest.mark.query_budget(5)
+def test_update_restores_archived_task(client, create_task, archive_tasks, db_session):
+    from app.models.models import Task, TaskArchive
+
+    task = create_task(title="Finished", status="done")
+    archive_tasks(task["id"])
+
+    response = client.put(f"/tasks/{task['id']}", json={"status": "to-do"})
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "to-do"
+    assert db_session.query(TaskArchive).count() == 0
+    assert (
+        db_session.get(Task, (task["id"], task["owner_id"])).status == TaskStatus.TODO
+    )
+    stats = client.get("/tasks/stats").json()
+    assert (stats["by_status"]["done"], stats["by_status"]["to-do"]) == (0, 1)
+
+
+@pytest.mark.query_budget(6)
+def test_delete_archived_task(client, create_task, archive_tasks, db_session):
+    from app.models.models import TaskArchive
+
+    first = create_task(title="First", status="done")
+    second = create_task(title="Second", status="done")
+    third = create_task(title="Third", status="done")
+    archive_tasks(first["id"], second["id"], third["id"])
+
+    assert client.delete(f"/tasks/{first['id']}").status_code == 204
+    response = client.request(
+        "DELETE", "/tasks/bulk", json={"ids": [second["id"], 999999]}
+    )
+    assert response.json()["deleted"] == [second["id"]]
+    assert [e["status_code"] for e in response.json()["errors"]] == [404]
+    response = client.patch("/tasks/bulk", json=[{"id": third["id"], "title": "Back"}])
+    assert [t["title"] for t in response.json()["items"]] == ["Back"]
+
+    assert db_session.query(TaskArchive).count() == 0
+    assert client.get("/tasks/stats").json()["total"] == 1
+
+
+def test_archive_tasks_cli(client, create_task, db_session, capsys, monkeypatch):
+    from sqlalchemy import update
+    from app import cli
+    from app.models.models import Task
+
+    monkeypatch.setattr(cli, "engine", db_session.get_bind())
+    create_task(title="Done", status="done")
+    db_session.execute(
+        update(Task).values(updated_at=datetime.now(timezone.utc) - timedelta(days=365))
+    )
+    db_session.commit()
+
+    assert cli.main(["archive-tasks", "--once"]) == 0
+    assert capsys.readouterr().out == "Archived 1 completed tasks\n"
+
+
+# ---------- SYNC ----------
+
+
+@pytest.fixture
+def no_sync_lag(monkeypatch):
+    from app.crud import task_sync
+
+    monkeypatch.setattr(task_sync, "TASK_SYNC_LAG_SECONDS", 0)
+
+
+@pytest.mark.query_budget(4)
+def test_task_changes(client, create_task, no_sync_lag):
+    kept = create_task(title="Kept")
+    edited = create_task(title="Edited")
+    removed = create_task(title="Removed")
+
+    response = client.get("/tasks/changes")
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["id"] for task in data["tasks"]] == [
+        kept["id"],
+        edited["id"],
+        removed["id"],
+    ]
+    assert data["deleted"] == []
+
+    client.put(f"/tasks/{edited['id']}", json={"title": "Edited twice"})
+    client.delete(f"/tasks/{removed['id']}")
+    added = create_task(title="Added")
+
+    response = client.get("/tasks/changes", params={"since": data["sync_token"]})
+    assert response.status_code == 200
+    changes = response.json()
+    assert [task["title"] for task in changes["tasks"]] == ["Edited twice", "Added"]
+    assert changes["tasks"][1]["id"] == added["id"]
+    assert changes["deleted"] == [removed["id"]]
+
+    response = client.get("/tasks/changes", params={"since": changes["sync_token"]})
+    assert response.json()["tasks"] == []
+    assert response.json()["deleted"] == []
+
+
+@pytest.mark.query_budget(4)
+def test_task_changes_after_bulk_writes(client, create_task, no_sync_lag):
+    first = create_task(title="First")
+    second = create_task(title="Second")
+    token = client.get("/tasks/changes").json()["sync_token"]
+
+    client.patch("/tasks/bulk", json=[{"id": first["id"], "title": "Bulk edit"}])
+    client.request("DELETE", "/tasks/bulk", json={"ids": [second["id"]]})
+
+    changes = client.get("/tasks/changes", params={"since": token}).json()
+    assert [task["title"] for task in changes["tasks"]] == ["Bulk edit"]
+    assert changes["deleted"] == [second["id"]]
+
+
+@pytest.mark.query_budget(2)
+def test_task_changes_rejects_bad_tokens(client):
+    from app.utils.cursor import encode_cursor
+
+    for token in ("not-a-token", encode_cursor({"t": "2026-01-01T00:00:00"})):
+        response = client.get("/tasks/changes", params={"since": token})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid sync token"
+
+    expired = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
+    response = client.get(
+        "/tasks/changes", params={"since": encode_cursor({"t": expired})}
+    )
+    assert response.status_code == 410
+
+
+def test_prune_deletions_cli(db_session, test_user, capsys, monkeypatch):
+    from app import cli
+    from app.models.models import TaskDeletion
+
+    monkeypatch.setattr(cli, "engine", db_session.get_bind())
+    now = datetime.now(timezone.utc)
+    db_session.add_all(
+        [
+            TaskDeletion(owner_id=test_user.id, task_id=1, deleted_at=now),
+            TaskDeletion(
+                owner_id=test_user.id, task_id=2, deleted_at=now - timedelta(days=40)
+            ),
+        ]
+    )
+    db_session.commit()
+
+    assert cli.main(["prune-deletions"]) == 0
+    assert capsys.readouterr().out == "Pruned 1 task deletions\n"
+    db_session.expire_all()
+    assert [row.task_id for row in db_session.query(TaskDeletion)] == [1]
+
+
+# ---------- STREAM ----------
+
+
+def test_task_event_stream(db_session, test_user):
+    import asyncio
+    from app.crud import task_crud
+    from app.crud.task_events import record_task_event, stream_task_events
+    from app.schemas.task import TaskCreate, TaskUpdate
+
+    async def scenario():
+        stream = stream_task_events(test_user.id, heartbeat=0.05, max_seconds=5)
+        assert await anext(stream) == "retry: 3000\n\n"
+        assert await anext(stream) == ": heartbeat\n\n"
+
+        task = await asyncio.to_thread(
+            task_crud.create_task, db_session, TaskCreate(title="Live"), test_user.id
+        )
+        created = await anext(stream)
+        assert created.startswith("event: created\n")
+        assert f'"id":{task.id},' in created
+
+        # Rolled back changes are never sent
+        record_task_event(db_session, test_user.id, "deleted", id=task.id)
+        db_session.rollback()
+
+        await asyncio.to_thread(
+            task_crud.update_task,
+            db_session,
+            task.id,
+            TaskUpdate(title="Renamed"),
+            test_user.id,
+        )
+        updated = await anext(stream)
+        assert updated.startswith("event: updated\n")
+        assert '"title":"Renamed"' in updated
+
+        await asyncio.to_thread(
+            task_crud.delete_task, db_session, task.id, test_user.id
+        )
+        assert await anext(stream) == f'event: deleted\ndata: {{"id":{task.id}}}\n\n'
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_task_event_stream_overflow(monkeypatch, test_user):
+    import asyncio
+    from app.crud import task_events
+
+    monkeypatch.setattr(task_events, "task_events", task_events.EventBroker(2))
+
+    async def scenario():
+        stream = task_events.stream_task_events(test_user.id)
+        await anext(stream)
+        for n in range(3):
+            task_events.publish_task_event(None, test_user.id, "refresh", n=n)
+        await asyncio.sleep(0)
+        assert await anext(stream) == "event: overflow\ndata: {}\n\n"
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+        assert not task_events.task_events.has_subscribers(test_user.id)
+
+    asyncio.run(scenario())
+
+
+def test_task_event_stream_through_notify(db_session, test_user, monkeypatch):
+    import asyncio
+    from app.crud import task_crud, task_events
+    from app.schemas.task import TaskCreate
+    from tests.conftest import TEST_ASYNC_DATABASE_URL
+
+    monkeypatch.setattr(task_events, "TASK_STREAM_NOTIFY", True)
+
+    async def scenario():
+        listener = asyncio.create_task(
+            task_events.listen_for_task_events(TEST_ASYNC_DATABASE_URL)
+        )
+        stream = task_events.stream_task_events(test_user.id, heartbeat=0.05)
+        await anext(stream)
+        # Ping until the listener has connected
+        while True:
+            await asyncio.to_thread(
+                task_events.publish_task_event,
+                db_session.get_bind(),
+                test_user.id,
+                "refresh",
+            )
+            chunk = await anext(stream)
+            if chunk.startswith("event: refresh"):
+                break
+
+        await asyncio.to_thread(
+            task_crud.create_task,
+            db_session,
+            TaskCreate(title="Notified"),
+            test_user.id,
+        )
+        chunk = await anext(stream)
+        while chunk.startswith(("event: refresh", ":")):
+            chunk = await anext(stream)
+        assert chunk.startswith("event: created\n")
+        assert '"title":"Notified"' in chunk
+        await stream.aclose()
+        listener.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_task_event_notify_batched_per_transaction(client, monkeypatch, count_queries):
+    from app.crud import task_events
+
+    monkeypatch.setattr(task_events, "TASK_STREAM_NOTIFY", True)
+
+    def bulk_writes(size: int) -> list:
+        """Statements of each bulk write of size tasks, and their pg_notify calls."""
+        counts = []
+        for method, url, payload in (
+            ("POST", "/tasks/bulk", [{"title": str(n)} for n in range(size)]),
+            ("PATCH", "/tasks/bulk", None),
+            ("DELETE", "/tasks/bulk", None),
+        ):
+            if method == "PATCH":
+                payload = [{"id": i, "title": "Renamed"} for i in ids]
+            elif method == "DELETE":
+                payload = {"ids": ids}
+            count_queries.clear()
+            response = client.request(method, url, json=payload)
+            assert response.status_code == 200, response.text
+            if method == "POST":
+                ids = [task["id"] for task in response.json()["items"]]
+            notifies = [q for q in count_queries if "pg_notify" in q]
+            # The fixture's user is reloaded after each commit; that is not the write
+            writes = [q for q in count_queries if not q.startswith("SELECT users")]
+            counts.append((len(writes), len(notifies)))
+        return counts
+
+    # Events are sent in one statement, so a bulk write costs the same
+    # number of statements whatever its size
+    small = bulk_writes(2)
+    assert small == bulk_writes(50)
+    assert all(notifies == 1 for _, notifies in small)
+
+
+@pytest.mark.query_budget(1)
+def test_stream_tasks_endpoint(client, monkeypatch):
+    from app.crud import task_events
+
+    monkeypatch.setattr(task_events, "TASK_STREAM_HEARTBEAT_SECONDS", 0.05)
+    monkeypatch.setattr(task_events, "TASK_STREAM_MAX_SECONDS", 0.2)
+    response = client.get("/tasks/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.text.startswith("retry: 3000\n\n: heartbeat\n\n")
+
+
+# ---------- QUERY PLANS ----------
+
+
+def capture_statements(db_session, run_query):
+    """Run a CRUD call and return the (statement, parameters) it executed."""
+    from sqlalchemy import event
+
+    engine = db_session.get_bind()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        run_query()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return statements
+
+
+def explain_last_query(db_session, run_query, position=-1):
+    """Run a CRUD call and return the EXPLAIN output of its last SELECT.
+
+    position picks another of the call's statements instead.
+    """
+    from sqlalchemy import text
+
+    statement, parameters = capture_statements(db_session, run_query)[position]
+    # An empty test table is cheapest to scan, so force the planner to show
+    # whether an index can serve the query at all.
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = db_session.connection().exec_driver_sql("EXPLAIN " + statement, parameters)
+    lines = [row[0] for row in plan]
+    db_session.rollback()
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"order_by": "deadline", "order_dir": "asc"},
+        {"status": TaskStatus.TODO, "priority": TaskPriority.HIGH},
+        {"show_completed": False},
+    ],
+)
+def test_get_tasks_by_user_uses_index(db_session, test_user, filters):
+    from app.crud.task_crud import get_tasks_by_user
+
+    plan = explain_last_query(
+        db_session, lambda: get_tasks_by_user(db_session, test_user.id, **filters)
+    )
+    assert "Seq Scan" not in plan, plan
+
+
+def test_search_tasks_uses_index(db_session, test_user):
+    from app.crud.task_search import search_tasks
+
+    plan = explain_last_query(
+        db_session, lambda: search_tasks(db_session, test_user.id, title="Find")
+    )
+    assert "Seq Scan" not in plan, plan
+
+
+def test_reminder_scan_uses_index(db_session):
+    from app.crud.task_reminders import scan_due_tasks
+
+    plan = explain_last_query(
+        db_session, lambda: scan_due_tasks(db_session.get_bind(), print)
+    )
+    # Each partition is read through its copy of ix_tasks_deadline_not_done
+    assert re.search(r"tasks_p\d+_deadline_id_idx", plan), plan
+
+
+@pytest.mark.parametrize("order_by", ["created_at", "deadline"])
+def test_cursor_page_uses_index(db_session, test_user, order_by):
+    from app.crud.task_crud import encode_task_cursor, get_tasks_by_user
+    from app.models.models import Task
+
+    now = datetime.now(timezone.utc)
+    cursor = encode_task_cursor(
+        Task(id=10, created_at=now, deadline=now), order_by, "desc"
+    )
+    plan = explain_last_query(
+        db_session,
+        lambda: get_tasks_by_user(
+            db_session, test_user.id, order_by=order_by, cursor=cursor
+        ),
+    )
+    assert "Seq Scan" not in plan, plan
+    # The cursor position must be an index seek, not a filter over skipped rows
+    assert f"Index Cond: ((owner_id = {test_user.id}) AND ({order_by} <=" in plan, plan
+
+
+def test_task_changes_use_indexes(db_session, test_user):
+    from app.crud.task_sync import get_task_changes
+    from app.utils.cursor import encode_cursor
+
+    token = encode_cursor({"t": datetime.now(timezone.utc).isoformat()})
+    for position, index in (
+        (-2, r"tasks_p\d+_owner_id_updated_at_idx"),
+        (-1, r"task_deletions_pkey"),
+    ):
+        plan = explain_last_query(
+            db_session,
+            lambda: get_task_changes(db_session, test_user.id, token),
+            position,
+        )
+        assert re.search(index, plan), plan
+
+
+def test_archiver_uses_index(db_session):
+    from app.crud.task_archive import archive_done_tasks
+
+    plan = explain_last_query(
+        db_session, lambda: archive_done_tasks(db_session.get_bind())
+    )
+    assert re.search(r"tasks_p\d+_updated_at_id_idx", plan), plan
+
+
+def test_task_crud_prunes_to_one_partition(db_session, test_user):
+    from app.crud import task_crud
+    from app.schemas.task import TaskCreate, TaskUpdate
+
+    task = task_crud.create_task(db_session, TaskCreate(title="Pruned"), test_user.id)
+    calls = [
+        lambda: task_crud.get_task_by_id(db_session, task.id, test_user.id),
+        lambda: task_crud.get_tasks_by_user(db_session, test_user.id),
+        lambda: task_crud.get_tasks_by_user(
+            db_session, test_user.id, order_by="deadline", status=TaskStatus.TODO
+        ),
+        lambda: task_crud.get_tasks_version(db_session, test_user.id),
+        lambda: task_crud.update_task(
+            db_session, task.id, TaskUpdate(title="Renamed"), test_user.id
+        ),
+        lambda: task_crud.update_task(
+            db_session, task.id, TaskUpdate(status=TaskStatus.DONE), test_user.id
+        ),
+        lambda: task_crud.delete_task(db_session, task.id, test_user.id),
+    ]
+    for call in calls:
+        for statement, parameters in capture_statements(db_session, call):
+            if not re.search(r"\btasks\b", statement):
+                continue
+            plan = db_session.connection().exec_driver_sql(
+                "EXPLAIN " + statement, parameters
+            )
+            plan = "\n".join(row[0] for row in plan)
+            assert len(set(re.findall(r"\btasks_p\d+\b", plan))) <= 1, plan
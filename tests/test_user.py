@@ -3,6 +3,7 @@ from fastapi.testclient import TestClient
 
 
 # Get current user info
+@pytest.mark.query_budget(0)
 def test_get_current_user(client, test_user):
     response = client.get("/users/me")
     assert response.status_code == 200
@@ -12,6 +13,7 @@ def test_get_current_user(client, test_user):
 
 
 # Update email successfully
+@pytest.mark.query_budget(4)
 def test_update_email_success(client):
     new_email = "updated@example.com"
     response = client.patch("/users/email", json={"email": new_email})
@@ -21,6 +23,7 @@ def test_update_email_success(client):
 
 
 # Fail to update email to one that already exists
+@pytest.mark.query_budget(1)
 def test_update_email_duplicate(client, db_session):
     from app.models.models import User
     from datetime import datetime, timezone
@@ -39,6 +42,7 @@ def test_update_email_duplicate(client, db_session):
 
 
 # Update password successfully
+@pytest.mark.query_budget(3)
 def test_update_password_success(client):
     old_password = "Strong1!"
     new_password = "NewStrong1@"
@@ -52,6 +56,7 @@ def test_update_password_success(client):
 
 
 # Fail to update password with wrong old password
+@pytest.mark.query_budget(0)
 def test_update_password_wrong_old(client):
     response = client.patch(
         "/users/password",
@@ -65,6 +70,7 @@ def test_update_password_wrong_old(client):
 @pytest.mark.parametrize(
     "new_password", ["short", "nocaps123!", "NOLOWER123!", "NoNumber!", "NoSpecial123"]
 )
+@pytest.mark.query_budget(0)
 def test_update_password_invalid_new(client, new_password):
     response = client.patch(
         "/users/password",